@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+
+from monte_carlo_simulator import SimulationResult, run_monte_carlo_simulation
+from analyzer import analyze_simulation_results, _control_variate_betas, _point_estimates
+
+# Default precision targets: half-width of the confidence interval, in the metric's own units
+DEFAULT_TOLERANCES = {'VaR_95': 0.0025, 'VaR_99': 0.005, 'CVaR_99': 0.005}
+STOP_REASONS = ('converged', 'max_paths', 'max_seconds')
+# Metrics with a batch-means standard error, i.e. the ones a tolerance can be set on
+TOLERANCE_METRICS = ('mean_predicted_price', 'median_predicted_price', '5th_percentile', '95th_percentile',
+                     'expected_return', 'prob_loss', 'prob_increase_10', 'prob_increase_20', 'prob_increase_30',
+                     'VaR_95', 'VaR_99', 'CVaR_95', 'CVaR_99')
+
+
+class AdaptiveResult:
+    """
+    Outcome of an adaptive run.
+
+    Attributes:
+        result (SimulationResult): All simulated paths; every batch is one replicate block.
+        analysis (dict): analyze_simulation_results of the pooled paths.
+        report (dict): 'paths_used', 'batches', 'seconds', 'stopped_because' and 'precision'
+            (metric -> estimate, std_error, half_width, tolerance, converged).
+    """
+
+    def __init__(self, result, analysis, report):
+        self.result = result
+        self.analysis = analysis
+        self.report = report
+
+
+class _RunningEstimates:
+    """Welford mean and variance of every metric over the batch estimates."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = {}
+        self.m2 = {}
+
+    def update(self, estimates):
+        self.count += 1
+        for name, value in estimates.items():
+            delta = value - self.mean.get(name, 0.0)
+            self.mean[name] = self.mean.get(name, 0.0) + delta / self.count
+            self.m2[name] = self.m2.get(name, 0.0) + delta * (value - self.mean[name])
+
+    def std_error(self, name):
+        if self.count < 2:
+            return np.inf
+        return np.sqrt(self.m2[name] / (self.count - 1) / self.count)
+
+
+def _half_width(std_error, confidence, num_batches):
+    """Confidence half-width of a batch-means estimate (Student-t with num_batches - 1 dof)."""
+    from scipy.stats import t as student_t
+
+    if num_batches < 2:
+        return np.inf
+    return float(student_t.ppf(0.5 + confidence / 2, num_batches - 1) * std_error)
+
+
+def run_adaptive_simulation(start_price, drift, volatility, forecast_period=252, tolerances=None,
+                            confidence=0.95, batch_size=10000, min_batches=5, max_paths=2000000,
+                            max_seconds=60.0, seed=None, dtype=np.float64, checkpoints='terminal',
+                            variance_reduction=None, model=None, analysis_options=None):
+    """
+    Simulates in batches until every requested metric reaches its precision target.
+
+    Batch i draws from the i-th child of `np.random.SeedSequence(seed)`, so
+    batches are independent and a run is reproducible from its seed. After
+    each batch the batch's own estimate of every metric updates a running
+    mean and variance; the standard error of the pooled estimate is their
+    spread divided by sqrt(batches) (batch means). The run stops when
+    t * standard error <= tolerance for every metric in `tolerances`, where t
+    is the Student-t quantile of `confidence` with batches - 1 degrees of
+    freedom (only a handful of batch means exist early on, so the normal
+    quantile would be too narrow), or when the path or time budget is
+    exhausted. The final analysis pools all paths, with each batch as one
+    replicate block.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The daily drift of the log returns.
+        volatility (float): The daily volatility of the log returns.
+        forecast_period (int): The number of trading days to forecast (including day 0).
+        tolerances (dict or None): Metric name -> target half-width; None uses DEFAULT_TOLERANCES.
+            Names must be metrics with a batch-means standard error (see TOLERANCE_METRICS).
+        confidence (float): Confidence level of the half-widths.
+        batch_size (int): Paths per batch (rounded up to an even number).
+        min_batches (int): Batches before convergence is first checked.
+        max_paths (int): Path budget.
+        max_seconds (float): Wall-time budget.
+        seed (int or None): Root seed; None draws fresh entropy (reported in the result).
+        dtype (np.dtype): Floating point type of the paths.
+        checkpoints (str, sequence or None): Stored days (see run_monte_carlo_simulation);
+            'terminal' keeps memory small for large path counts.
+        variance_reduction (str, sequence or None): Applied within every batch.
+        model (StochasticModel or None): Simulate this model instead of GBM.
+        analysis_options (dict or None): Extra arguments of the final analyze_simulation_results
+            pass, e.g. {'bootstrap_samples': 1000, 'path_metrics': True}.
+
+    Returns:
+        AdaptiveResult: The pooled paths, their analysis and the precision report.
+
+    Raises:
+        ValueError: If a tolerance names a metric without a standard error.
+    """
+
+    tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+    unknown = sorted(set(tolerances) - set(TOLERANCE_METRICS))
+    if unknown:
+        raise ValueError(f"No standard error for {unknown}; tolerances can be set on {list(TOLERANCE_METRICS)}.")
+    batch_size += batch_size % 2
+    seed_sequence = np.random.SeedSequence(seed)
+    estimates = _RunningEstimates()
+    batches = []
+    started = time.perf_counter()
+    stopped_because = None
+
+    while stopped_because is None:
+        batch = run_monte_carlo_simulation(start_price, drift, volatility, forecast_period, batch_size,
+                                           dtype=dtype, rng=np.random.default_rng(seed_sequence.spawn(1)[0]),
+                                           as_dataframe=False, variance_reduction=variance_reduction,
+                                           checkpoints=checkpoints, model=model)
+        batches.append(batch)
+        prices = np.asarray(batch.final_prices, dtype=np.float64)
+        betas = _control_variate_betas(prices, start_price) if batch.control_mean is not None else None
+        estimates.update(_point_estimates(prices, start_price, batch.control_mean, betas))
+
+        converged = estimates.count >= min_batches and all(
+            _half_width(estimates.std_error(name), confidence, estimates.count) <= tolerance
+            for name, tolerance in tolerances.items())
+        if converged:
+            stopped_because = 'converged'
+        elif (estimates.count + 1) * batch_size > max_paths:
+            stopped_because = 'max_paths'
+        elif time.perf_counter() - started >= max_seconds:
+            stopped_because = 'max_seconds'
+
+    paths = np.concatenate([batch.paths for batch in batches], axis=1)
+    del batches[1:]
+    result = SimulationResult(paths, start_price, num_replicates=estimates.count,
+                              control_mean=batches[0].control_mean, checkpoints=batches[0].checkpoints)
+    analysis = analyze_simulation_results(result, start_price, **(analysis_options or {}))
+
+    pooled = dict(analysis['price_predictions'], **analysis['risk_metrics'], **analysis['statistical_summary'])
+    precision = {}
+    for name, tolerance in tolerances.items():
+        std_error = analysis['standard_errors'][name]
+        half_width = _half_width(std_error, confidence, estimates.count)
+        precision[name] = {
+            'estimate': pooled[name],
+            'std_error': std_error,
+            'half_width': half_width,
+            'tolerance': tolerance,
+            'converged': bool(half_width <= tolerance),
+        }
+    report = {
+        'paths_used': paths.shape[1],
+        'batches': estimates.count,
+        'batch_size': batch_size,
+        'seconds': time.perf_counter() - started,
+        'stopped_because': stopped_because,
+        'confidence': confidence,
+        'seed': seed_sequence.entropy,
+        'precision': precision,
+    }
+    return AdaptiveResult(result, analysis, report)
+
+
+if __name__ == '__main__':
+    # A calm and a volatile calibration reach the same VaR/CVaR precision with very different path counts
+    for label, volatility in (('low volatility', 0.005), ('high volatility', 0.025)):
+        adaptive = run_adaptive_simulation(80.0, 0.0002, volatility, seed=1, max_seconds=30)
+        report = adaptive.report
+        print(f"{label}: {report['paths_used']} paths in {report['batches']} batches, "
+              f"{report['seconds']:.2f}s ({report['stopped_because']})")
+        for name, p in report['precision'].items():
+            print(f"  {name:<8} {p['estimate']:+.4f} +/- {p['half_width']:.4f} (target {p['tolerance']})")
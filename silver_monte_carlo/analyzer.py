@@ -1,63 +1,441 @@
 import numpy as np
-from scipy.stats import skew, kurtosis
+import pandas as pd
 
-def analyze_simulation_results(simulations, start_price):
+
+def _final_prices(simulations):
+    """Returns the last simulated day as a Series for a DataFrame or a SimulationResult."""
+    if isinstance(simulations, pd.DataFrame):
+        return simulations.iloc[-1]
+    return pd.Series(simulations.final_prices)
+
+
+# Number of contiguous batches used to estimate standard errors of i.i.d. runs
+STANDARD_ERROR_BATCHES = 20
+
+
+def _mean_metric_samples(final_prices, start_price):
+    """Returns the per-path samples whose means are the mean-type metrics."""
+    return {
+        'mean_predicted_price': final_prices,
+        'prob_loss': (final_prices < start_price).astype(np.float64),
+        'prob_increase_10': (final_prices > start_price * 1.1).astype(np.float64),
+        'prob_increase_20': (final_prices > start_price * 1.2).astype(np.float64),
+        'prob_increase_30': (final_prices > start_price * 1.3).astype(np.float64),
+    }
+
+
+def _control_variate_betas(final_prices, start_price):
+    """Returns the optimal control-variate coefficient of every mean-type metric (control: S_T)."""
+    centered_control = final_prices - final_prices.mean()
+    control_variance = centered_control @ centered_control
+    return {name: ((samples - samples.mean()) @ centered_control) / control_variance
+            for name, samples in _mean_metric_samples(final_prices, start_price).items()}
+
+
+def _point_estimates(final_prices, start_price, control_mean=None, betas=None):
+    """Computes the metrics that get standard errors for one sample of terminal prices."""
+    estimates = {}
+    for name, samples in _mean_metric_samples(final_prices, start_price).items():
+        estimate = samples.mean()
+        if control_mean is not None:
+            estimate -= betas[name] * (final_prices.mean() - control_mean)
+        estimates[name] = estimate
+    estimates['expected_return'] = estimates['mean_predicted_price'] / start_price - 1
+
+    p05, p50, p95 = np.quantile(final_prices, [0.05, 0.5, 0.95])
+    returns = final_prices / start_price - 1
+    var_95, var_99 = np.quantile(returns, [0.05, 0.01])
+    estimates.update({
+        'median_predicted_price': p50,
+        '5th_percentile': p05,
+        '95th_percentile': p95,
+        'VaR_95': var_95,
+        'VaR_99': var_99,
+        'CVaR_95': returns[returns <= var_95].mean(),
+        'CVaR_99': returns[returns <= var_99].mean(),
+    })
+    return estimates
+
+
+def _standard_errors(final_prices, start_price, num_batches, control_mean=None, betas=None):
     """
-    Analyzes the results of a Monte Carlo simulation.
+    Estimates standard errors by batch means over contiguous blocks of paths.
 
-    Args:
-        simulations (pd.DataFrame): A DataFrame of simulated price paths.
-        start_price (float): The starting price of the asset for comparison.
+    Each block yields its own estimate of every metric; the standard error of
+    the full-sample estimate is the spread of the block estimates divided by
+    sqrt(num_batches). Blocks are independent for i.i.d. and antithetic runs
+    (pairs never straddle a block) and for the replicate blocks of
+    moment-matched and Sobol runs. Every block needs at least two paths, so
+    small runs use fewer blocks; with fewer than two blocks the standard
+    errors are NaN.
+    """
+    from monte_carlo_simulator import replicate_boundaries
 
-    Returns:
-        dict: A dictionary containing the analysis results.
+    num_batches = min(num_batches, final_prices.size // 2)
+    if num_batches < 2:
+        return {name: np.nan for name in _point_estimates(final_prices, start_price, control_mean, betas)}
+    bounds = replicate_boundaries(final_prices.size, num_batches)
+    batch_estimates = [_point_estimates(final_prices[first:last], start_price, control_mean, betas)
+                       for first, last in zip(bounds[:-1], bounds[1:])]
+    return {name: float(np.std([batch[name] for batch in batch_estimates], ddof=1) / np.sqrt(num_batches))
+            for name in batch_estimates[0]}
+
+
+def _analyze_streaming_results(summary, start_price):
+    """Builds the analysis dictionary from a streaming_simulator.StreamingSummary."""
+    terminal = summary.terminal
+    var_95_price = terminal.quantile(0.05)
+    var_99_price = terminal.quantile(0.01)
+
+    price_predictions = {
+        'mean_predicted_price': terminal.mean(),
+        'median_predicted_price': terminal.quantile(0.5),
+        '5th_percentile': var_95_price,
+        '25th_percentile': terminal.quantile(0.25),
+        '75th_percentile': terminal.quantile(0.75),
+        '95th_percentile': terminal.quantile(0.95),
+    }
+
+    risk_metrics = {
+        'VaR_95': var_95_price / start_price - 1,
+        'VaR_99': var_99_price / start_price - 1,
+        'CVaR_95': terminal.tail_mean(0.05) / start_price - 1,
+        'CVaR_99': terminal.tail_mean(0.01) / start_price - 1,
+        'prob_loss': terminal.prob_loss(),
+        'prob_increase_10': terminal.prob_above(0.1),
+        'prob_increase_20': terminal.prob_above(0.2),
+        'prob_increase_30': terminal.prob_above(0.3),
+    }
+
+    statistical_summary = {
+        'expected_return': terminal.mean() / start_price - 1,
+        'std_dev_forecast': terminal.std(),
+        'skewness': terminal.skewness(),
+        'kurtosis': terminal.kurtosis(),
+    }
+
+    # Only the mean-type metrics have closed-form standard errors without the raw prices
+    n = terminal.count
+    standard_errors = {'mean_predicted_price': terminal.std() / np.sqrt(n)}
+    standard_errors['expected_return'] = standard_errors['mean_predicted_price'] / start_price
+    for name in ('prob_loss', 'prob_increase_10', 'prob_increase_20', 'prob_increase_30'):
+        p = risk_metrics[name]
+        standard_errors[name] = float(np.sqrt(p * (1 - p) / n))
+
+    return {
+        "price_predictions": price_predictions,
+        "risk_metrics": risk_metrics,
+        "statistical_summary": statistical_summary,
+        "standard_errors": standard_errors,
+        "final_prices": pd.Series(terminal.sample) # Bounded sample, for plotting
+    }
+
+
+def _path_matrix(simulations):
+    """Returns (paths, days) of a DataFrame, SimulationResult or SimulationStore without copying."""
+    if isinstance(simulations, pd.DataFrame):
+        return simulations.to_numpy(), simulations.index.to_numpy()
+    return simulations.paths, simulations.days
+
+
+def _sorted_quantile(sorted_values, q):
+    """Linear-interpolation quantile (like pandas) of an already sorted 1-D array."""
+    position = np.asarray(q, dtype=np.float64) * (sorted_values.size - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, sorted_values.size - 1)
+    return sorted_values[lower] + (position - lower) * (sorted_values[upper] - sorted_values[lower])
+
+
+def _terminal_metrics(sorted_prices, start_price):
+    """
+    Computes every terminal-price metric from one sorted array.
+
+    Quantiles are read off the sorted prices, the CVaR tails are prefixes of
+    them and the threshold probabilities are binary searches, so no further
+    sort, partition or mask over all paths is needed.
     """
-    final_prices = simulations.iloc[-1]
-    
-    # Price Predictions
+    n = sorted_prices.size
+    p05, p25, p50, p75, p95, p01 = _sorted_quantile(sorted_prices, [0.05, 0.25, 0.5, 0.75, 0.95, 0.01])
+    var_95, var_99 = p05 / start_price - 1, p01 / start_price - 1
+    returns = sorted_prices / start_price - 1
+    tail_95 = np.searchsorted(returns, var_95, side='right')
+    tail_99 = np.searchsorted(returns, var_99, side='right')
+
+    mean = sorted_prices.mean()
+    deviations = sorted_prices - mean
+    squared = deviations * deviations
+    m2 = squared.mean()
+    m3 = (squared * deviations).mean()
+    m4 = (squared * squared).mean()
+
+    def prob_above(level):
+        return (n - np.searchsorted(sorted_prices, level, side='right')) / n
+
     price_predictions = {
-        'mean_predicted_price': final_prices.mean(),
-        'median_predicted_price': final_prices.median(),
-        '5th_percentile': final_prices.quantile(0.05),
-        '25th_percentile': final_prices.quantile(0.25),
-        '75th_percentile': final_prices.quantile(0.75),
-        '95th_percentile': final_prices.quantile(0.95),
+        'mean_predicted_price': mean,
+        'median_predicted_price': p50,
+        '5th_percentile': p05,
+        '25th_percentile': p25,
+        '75th_percentile': p75,
+        '95th_percentile': p95,
     }
-    
-    # Risk Metrics
-    returns = final_prices / start_price - 1
-    
-    var_95 = returns.quantile(0.05)
-    var_99 = returns.quantile(0.01)
-    
-    cvar_95 = returns[returns <= var_95].mean()
-    cvar_99 = returns[returns <= var_99].mean()
-    
     risk_metrics = {
         'VaR_95': var_95,
         'VaR_99': var_99,
-        'CVaR_95': cvar_95,
-        'CVaR_99': cvar_99,
-        'prob_loss': (final_prices < start_price).mean(),
-        'prob_increase_10': (final_prices > start_price * 1.1).mean(),
-        'prob_increase_20': (final_prices > start_price * 1.2).mean(),
-        'prob_increase_30': (final_prices > start_price * 1.3).mean(),
+        'CVaR_95': returns[:tail_95].mean(),
+        'CVaR_99': returns[:tail_99].mean(),
+        'prob_loss': np.searchsorted(sorted_prices, start_price, side='left') / n,
+        'prob_increase_10': prob_above(start_price * 1.1),
+        'prob_increase_20': prob_above(start_price * 1.2),
+        'prob_increase_30': prob_above(start_price * 1.3),
     }
-    
-    # Statistical Summary
     statistical_summary = {
-        'expected_return': returns.mean(),
-        'std_dev_forecast': final_prices.std(),
-        'skewness': skew(final_prices),
-        'kurtosis': kurtosis(final_prices),
+        'expected_return': mean / start_price - 1,
+        'std_dev_forecast': np.sqrt(m2 * n / (n - 1)),
+        'skewness': m3 / m2 ** 1.5,
+        'kurtosis': m4 / m2 ** 2 - 3,
+    }
+    return price_predictions, risk_metrics, statistical_summary
+
+
+# Confidence levels of the VaR/CVaR bootstrap intervals
+BOOTSTRAP_LEVELS = (0.95, 0.99)
+
+
+def _poisson_bootstrap_tail(tail, n, alphas, num_samples, rng, max_chunk_elements):
+    """Returns (VaR samples, CVaR samples) per alpha, or None if `tail` was too short for a resample."""
+    window = tail.size
+    var_samples = np.empty((len(alphas), num_samples))
+    cvar_samples = np.empty((len(alphas), num_samples))
+    # Two (count, window) arrays are alive at once (the cumulative weights and the weights,
+    # turned into the cumulative weighted tail in place), so each gets half the element budget
+    samples_per_chunk = max(1, max_chunk_elements // (2 * window))
+    for first in range(0, num_samples, samples_per_chunk):
+        count = min(samples_per_chunk, num_samples - first)
+        weighted = rng.poisson(1.0, size=(count, window)).astype(np.float64)
+        cumulative = np.cumsum(weighted, axis=1)
+        np.multiply(weighted, tail, out=weighted)
+        np.cumsum(weighted, axis=1, out=weighted)
+        total = cumulative[:, -1] + rng.poisson(n - window, size=count)
+        rows = np.arange(count)
+        for k, alpha in enumerate(alphas):
+            needed = np.maximum(alpha * total, 1)
+            if window < n and np.any(cumulative[:, -1] < needed):
+                return None
+            index = np.minimum((cumulative < needed[:, None]).sum(axis=1), window - 1)
+            var_samples[k, first:first + count] = tail[index]
+            cvar_samples[k, first:first + count] = weighted[rows, index] / cumulative[rows, index]
+        del weighted, cumulative  # Free the chunk before the next one is drawn
+    return var_samples, cvar_samples
+
+
+def bootstrap_var_cvar(sorted_prices, start_price, num_samples=1000, confidence=0.95, levels=BOOTSTRAP_LEVELS,
+                       rng=None, max_chunk_elements=2 ** 24):
+    """
+    Bootstrap confidence intervals for VaR and CVaR, vectorized over resamples.
+
+    Uses the Poisson bootstrap: every path gets an independent Poisson(1)
+    weight in every resample, which approximates multinomial resampling and
+    needs no per-resample sort. Since the prices are already sorted, the
+    resampled VaR is the price where the cumulative weight reaches
+    alpha * total weight and the resampled CVaR is the weighted mean below it.
+    Only a window of the lowest prices that is certain to contain the tail is
+    weighted individually; the rest only contributes its total weight. The
+    resampled VaR is an order statistic, so it may differ from the
+    interpolated point estimate by up to one order statistic.
+
+    Args:
+        sorted_prices (np.ndarray): Terminal prices, sorted ascending.
+        start_price (float): The starting price of the asset.
+        num_samples (int): Number of bootstrap resamples.
+        confidence (float): Coverage of the intervals.
+        levels (sequence): VaR/CVaR confidence levels, e.g. (0.95, 0.99).
+        rng (np.random.Generator, int or None): Random generator or seed.
+        max_chunk_elements (int): Upper bound on the elements of all per-chunk arrays together.
+
+    Returns:
+        dict: 'VaR_95', 'CVaR_95', ... -> {'low', 'high', 'std_error'} of the returns.
+    """
+    rng = np.random.default_rng(rng)
+    n = sorted_prices.size
+    alphas = 1 - np.asarray(levels, dtype=np.float64)
+    # The tail weight fluctuates by about sqrt(alpha * n); the window is widened if ever too short
+    window = int(min(n, np.ceil(alphas.max() * n + 8 * np.sqrt(n) + 10)))
+    while True:
+        samples = _poisson_bootstrap_tail(sorted_prices[:window] / start_price - 1, n, alphas, num_samples,
+                                          rng, max_chunk_elements)
+        if samples is not None or window == n:
+            break
+        window = min(n, 2 * window)
+    var_samples, cvar_samples = samples
+
+    bounds = [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+    intervals = {}
+    for k, level in enumerate(levels):
+        suffix = f"{round(level * 100)}"
+        for name, samples in (('VaR_', var_samples[k]), ('CVaR_', cvar_samples[k])):
+            low, high = np.percentile(samples, bounds)
+            intervals[name + suffix] = {'low': low, 'high': high, 'std_error': samples.std(ddof=1)}
+    return intervals
+
+
+# Relative price levels whose first passage is tracked; below 1 means a fall, above 1 a rise
+DEFAULT_BARRIERS = (0.85, 0.9, 1.1, 1.2)
+DEFAULT_DRAWDOWN_LEVELS = (0.1, 0.2, 0.3)
+
+
+def compute_path_metrics(simulations, start_price, barriers=DEFAULT_BARRIERS, max_chunk_elements=2 ** 24):
+    """
+    Computes path-dependent quantities in one chunked sweep over the path matrix.
+
+    Rows (days) are processed a few at a time while per-path state (the
+    running maximum, the maximum drawdown so far and the first day every
+    barrier was touched) is carried over, so only one chunk of the matrix is
+    ever copied and a memory-mapped SimulationStore is read once. For sparse
+    (checkpoint) runs the metrics only see the stored days.
+
+    Args:
+        simulations (pd.DataFrame, SimulationResult or SimulationStore): The simulated paths.
+        start_price (float): The starting price of the asset.
+        barriers (sequence): Price levels relative to start_price. A level below 1 is touched
+            when the price falls to or below it, a level above 1 when it rises to or above it.
+        max_chunk_elements (int): Upper bound on the elements processed per chunk.
+
+    Returns:
+        dict: 'max_drawdown' (per path, as a fraction of the running peak),
+        'first_passage_days' (barrier -> per-path trading day of the first touch, NaN if never)
+        and 'days' (the trading day of every row).
+    """
+    paths, days = _path_matrix(simulations)
+    num_rows, num_paths = paths.shape
+    levels = start_price * np.asarray(barriers, dtype=np.float64)
+    falling = np.asarray(barriers) < 1
+
+    running_max = np.full(num_paths, -np.inf)
+    max_drawdown = np.zeros(num_paths)
+    first_hit = np.full((len(levels), num_paths), -1, dtype=np.int64)
+    rows_per_chunk = max(1, max_chunk_elements // max(num_paths, 1))
+    for first in range(0, num_rows, rows_per_chunk):
+        chunk = np.asarray(paths[first:first + rows_per_chunk], dtype=np.float64)
+        peak = np.maximum.accumulate(chunk, axis=0)
+        np.maximum(peak, running_max, out=peak)
+        running_max = peak[-1].copy()
+        np.divide(chunk, peak, out=peak)
+        np.maximum(max_drawdown, 1 - peak.min(axis=0), out=max_drawdown)
+
+        for k, level in enumerate(levels):
+            crossed = chunk <= level if falling[k] else chunk >= level
+            newly_hit = (first_hit[k] < 0) & crossed.any(axis=0)
+            first_hit[k, newly_hit] = first + crossed.argmax(axis=0)[newly_hit]
+
+    days = np.asarray(days)
+    first_passage_days = {}
+    for k, barrier in enumerate(barriers):
+        hit_days = np.full(num_paths, np.nan)
+        touched = first_hit[k] >= 0
+        hit_days[touched] = days[first_hit[k, touched]]
+        first_passage_days[barrier] = hit_days
+    return {'max_drawdown': max_drawdown, 'first_passage_days': first_passage_days, 'days': days}
+
+
+def _barrier_name(barrier):
+    """'down_15' for 0.85, 'up_20' for 1.2."""
+    move = round(abs(barrier - 1) * 100)
+    return f"down_{move}" if barrier < 1 else f"up_{move}"
+
+
+def summarize_path_metrics(path_metrics, drawdown_levels=DEFAULT_DRAWDOWN_LEVELS):
+    """
+    Reduces the per-path output of compute_path_metrics to summary statistics.
+
+    Args:
+        path_metrics (dict): Output of compute_path_metrics.
+        drawdown_levels (sequence): Drawdown fractions whose exceedance probability is reported.
+
+    Returns:
+        dict: Drawdown distribution, barrier-touch probabilities ('prob_touch_down_15', ...)
+        and time-to-target statistics ('median_days_to_up_20', ...; NaN if never touched).
+    """
+    drawdown = np.sort(path_metrics['max_drawdown'])
+    summary = {
+        'max_drawdown_mean': drawdown.mean(),
+        'max_drawdown_median': _sorted_quantile(drawdown, 0.5),
+        'max_drawdown_95th': _sorted_quantile(drawdown, 0.95),
+        'max_drawdown_99th': _sorted_quantile(drawdown, 0.99),
     }
-    
+    for level in drawdown_levels:
+        exceeding = drawdown.size - np.searchsorted(drawdown, level, side='left')
+        summary[f"prob_drawdown_{round(level * 100)}"] = exceeding / drawdown.size
+    for barrier, hit_days in path_metrics['first_passage_days'].items():
+        name = _barrier_name(barrier)
+        touched = np.sort(hit_days[~np.isnan(hit_days)])
+        summary[f"prob_touch_{name}"] = touched.size / hit_days.size
+        summary[f"median_days_to_{name}"] = _sorted_quantile(touched, 0.5) if touched.size else np.nan
+        summary[f"90th_percentile_days_to_{name}"] = _sorted_quantile(touched, 0.9) if touched.size else np.nan
+    return summary
+
+
+def analyze_simulation_results(simulations, start_price, bootstrap_samples=0, path_metrics=False):
+    """
+    Analyzes the results of a Monte Carlo simulation.
+
+    Args:
+        simulations (pd.DataFrame, SimulationResult or StreamingSummary): The simulated price
+            paths, or the online accumulators of a streaming run. For a streaming run the
+            quantile and CVaR metrics are accurate to within one histogram bin (see
+            streaming_simulator.TerminalAccumulator) and 'final_prices' is a bounded sample.
+        start_price (float): The starting price of the asset for comparison.
+        bootstrap_samples (int): Resamples for the VaR/CVaR confidence intervals; 0 (the
+            default) skips them, e.g. 1000 adds 'confidence_intervals'.
+        path_metrics (bool): Also compute the path-dependent metrics (drawdowns, barrier
+            touches, time to target) when intermediate days were simulated. Off by default,
+            since the sweep reads the whole path matrix.
+
+    All terminal metrics are derived from a single sort of the final prices.
+    If `simulations` is a SimulationResult that carries a `control_mean`, the
+    mean price, expected return and probability metrics use the terminal
+    price as a control variate with that known mean. The 'standard_errors'
+    section holds the Monte Carlo standard error of the headline estimates,
+    computed by batch means (over the result's replicate blocks when present).
+    'confidence_intervals' holds bootstrap intervals of VaR and CVaR (see
+    bootstrap_var_cvar) and 'path_metrics' the summary of compute_path_metrics.
+
+    Returns:
+        dict: A dictionary containing the analysis results.
+    """
+    if hasattr(simulations, 'terminal'):
+        return _analyze_streaming_results(simulations, start_price)
+
+    final_prices = _final_prices(simulations)
+    control_mean = getattr(simulations, 'control_mean', None)
+    num_batches = getattr(simulations, 'num_replicates', None) or STANDARD_ERROR_BATCHES
+
+    # Every terminal metric comes from this one sort
+    prices = np.sort(final_prices.to_numpy(dtype=np.float64))
+    price_predictions, risk_metrics, statistical_summary = _terminal_metrics(prices, start_price)
+
+    # Standard errors (and control-variate estimates, if requested); batches need the path order
+    unsorted_prices = final_prices.to_numpy(dtype=np.float64)
+    betas = _control_variate_betas(unsorted_prices, start_price) if control_mean is not None else None
+    if control_mean is not None:
+        adjusted = _point_estimates(unsorted_prices, start_price, control_mean, betas)
+        price_predictions['mean_predicted_price'] = adjusted['mean_predicted_price']
+        statistical_summary['expected_return'] = adjusted['expected_return']
+        for name in ('prob_loss', 'prob_increase_10', 'prob_increase_20', 'prob_increase_30'):
+            risk_metrics[name] = adjusted[name]
+    standard_errors = _standard_errors(unsorted_prices, start_price, num_batches, control_mean, betas)
+
     analysis = {
         "price_predictions": price_predictions,
         "risk_metrics": risk_metrics,
         "statistical_summary": statistical_summary,
+        "standard_errors": standard_errors,
         "final_prices": final_prices # For plotting
     }
+    if bootstrap_samples:
+        analysis["confidence_intervals"] = bootstrap_var_cvar(prices, start_price, bootstrap_samples, rng=0)
+    if path_metrics and _path_matrix(simulations)[0].shape[0] > 2:
+        analysis["path_metrics"] = summarize_path_metrics(compute_path_metrics(simulations, start_price))
 
     return analysis
 
@@ -88,4 +466,7 @@ if __name__ == '__main__':
             if section != 'final_prices':
                 print(f"\n----- {section.replace('_', ' ').title()} -----")
                 for key, value in metrics.items():
-                    print(f"{key}: {value:.4f}")
+                    if isinstance(value, dict):
+                        print(f"{key}: [{value['low']:.4f}, {value['high']:.4f}]")
+                    else:
+                        print(f"{key}: {value:.4f}")
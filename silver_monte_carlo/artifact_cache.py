@@ -0,0 +1,280 @@
+import hashlib
+import os
+import pickle
+import time
+
+DEFAULT_MAX_BYTES = 2 * 2 ** 30  # 2 GB
+ENTRY_SUFFIX = ".pkl"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_code_versions = {}
+
+
+def code_version(*module_names):
+    """
+    Returns a hash of the source files of project modules.
+
+    Artifacts keyed with it are recomputed whenever the code that produced
+    them changes.
+
+    Args:
+        *module_names (str): Module names, e.g. 'data_processor' or 'analyzer'.
+
+    Returns:
+        str: Hex SHA-256 digest (first 16 characters).
+    """
+    key = tuple(sorted(module_names))
+    if key not in _code_versions:
+        digest = hashlib.sha256()
+        for name in key:
+            digest.update(name.encode())
+            with open(os.path.join(SCRIPT_DIR, name + '.py'), 'rb') as f:
+                digest.update(f.read())
+        _code_versions[key] = digest.hexdigest()[:16]
+    return _code_versions[key]
+
+
+def artifact_key(stage, modules, *inputs):
+    """
+    Returns the content address of a stage's artifact.
+
+    Args:
+        stage (str): The stage name, e.g. 'process_data'.
+        modules (sequence): Modules whose source determines the stage's output (see code_version).
+        *inputs: Everything else the output depends on: upstream artifact keys or data
+            fingerprints, parameters, seeds. Anything render_pipeline.fingerprint accepts.
+
+    Returns:
+        str: Hex digest.
+    """
+    from render_pipeline import fingerprint
+
+    return fingerprint(stage, code_version(*modules), inputs)
+
+
+class ArtifactCache:
+    """
+    Disk-backed, content-addressed memoization of pipeline artifacts.
+
+    Every artifact is one pickle file, `<stage>-<key>.pkl`, in `cache_dir`,
+    holding the value and the seconds it took to compute. A hit refreshes
+    the file's modification time, and when the directory grows beyond
+    `max_bytes` the least recently used files are evicted. Hits, misses,
+    bytes and compute seconds saved are counted per stage for the current
+    run (see stats).
+
+    Attributes:
+        cache_dir (str): The cache directory.
+        max_bytes (int): Size budget of the directory.
+        enabled (bool): If False, every lookup is a miss and nothing is written.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._stats = {}
+        self._evictions = 0
+        if enabled and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, f"{stage.replace('/', '_')}-{key}{ENTRY_SUFFIX}")
+
+    def _count(self, stage, **amounts):
+        counts = self._stats.setdefault(stage, {'hits': 0, 'misses': 0, 'uncacheable': 0, 'seconds_saved': 0.0,
+                                                'seconds_computed': 0.0, 'bytes_read': 0, 'bytes_written': 0})
+        for name, amount in amounts.items():
+            counts[name] += amount
+
+    def contains(self, stage, key):
+        """Returns True if the artifact is cached (without loading it or counting a lookup)."""
+        return self.enabled and os.path.exists(self._path(stage, key))
+
+    def get(self, stage, key):
+        """
+        Loads a cached artifact.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The artifact key (see artifact_key).
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        path = self._path(stage, key)
+        if not self.enabled or not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            print(f"Discarding unreadable cache entry '{path}': {e}")
+            os.remove(path)
+            return False, None
+        os.utime(path)
+        self._count(stage, hits=1, seconds_saved=entry['seconds'], bytes_read=os.path.getsize(path))
+        return True, entry['value']
+
+    def put(self, stage, key, value, seconds=0.0):
+        """
+        Stores an artifact and evicts least recently used ones beyond the size budget.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The artifact key.
+            value: Any picklable value.
+            seconds (float): Time it took to compute (reported as saved on later hits).
+        """
+        if not self.enabled:
+            return
+        path = self._path(stage, key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            pickle.dump({'stage': stage, 'seconds': seconds, 'created_at': time.time(), 'value': value}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self._count(stage, bytes_written=os.path.getsize(path))
+        self.evict()
+
+    def get_or_compute(self, stage, key, compute, cacheable=True):
+        """
+        Returns the cached artifact, or computes and stores it.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The artifact key.
+            compute (callable): Produces the value, called without arguments on a miss.
+            cacheable (bool): If False (e.g. an unseeded simulation, whose key never
+                repeats), the value is computed without a lookup, not stored, and
+                counted as 'uncacheable'.
+
+        Returns:
+            The artifact.
+        """
+        if not cacheable:
+            started = time.perf_counter()
+            value = compute()
+            self._count(stage, uncacheable=1, seconds_computed=time.perf_counter() - started)
+            return value
+        hit, value = self.get(stage, key)
+        if hit:
+            return value
+        started = time.perf_counter()
+        value = compute()
+        seconds = time.perf_counter() - started
+        self._count(stage, misses=1, seconds_computed=seconds)
+        self.put(stage, key, value, seconds)
+        return value
+
+    def record(self, stage, hit, seconds=0.0):
+        """
+        Counts a lookup served by another cache (e.g. the chart render cache).
+
+        Args:
+            stage (str): The stage name.
+            hit (bool): Whether the work was skipped.
+            seconds (float): Compute seconds of a miss.
+        """
+        if hit:
+            self._count(stage, hits=1)
+        else:
+            self._count(stage, misses=1, seconds_computed=seconds)
+
+    def entries(self):
+        """
+        Lists the cached artifacts, least recently used first.
+
+        Returns:
+            list: (path, stage, size in bytes, last use timestamp) tuples.
+        """
+        if not os.path.exists(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            info = os.stat(path)
+            entries.append((path, name.rsplit('-', 1)[0], info.st_size, info.st_mtime))
+        return sorted(entries, key=lambda entry: entry[3])
+
+    def size(self):
+        """Returns the total size of the cached artifacts in bytes."""
+        return sum(entry[2] for entry in self.entries())
+
+    def evict(self):
+        """Removes least recently used artifacts until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(entry[2] for entry in entries)
+        for path, _, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self._evictions += 1
+
+    def invalidate(self, stage=None):
+        """
+        Deletes cached artifacts.
+
+        Args:
+            stage (str or None): Only this stage's artifacts; None deletes everything.
+
+        Returns:
+            int: Number of deleted artifacts.
+        """
+        removed = 0
+        for path, entry_stage, _, _ in self.entries():
+            if stage is None or entry_stage == stage.replace('/', '_'):
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def stats(self):
+        """
+        Returns the cache statistics of this run.
+
+        Returns:
+            dict: 'stages' (stage -> hits, misses, uncacheable, hit_rate, seconds_saved,
+            seconds_computed, bytes_read, bytes_written), overall 'hits', 'misses' and 'hit_rate', 'evictions',
+            'size_bytes' and 'max_bytes'.
+        """
+        stages = {}
+        for stage, counts in self._stats.items():
+            lookups = counts['hits'] + counts['misses']
+            stages[stage] = dict(counts, hit_rate=counts['hits'] / lookups if lookups else None)
+        hits = sum(counts['hits'] for counts in self._stats.values())
+        misses = sum(counts['misses'] for counts in self._stats.values())
+        return {
+            'stages': stages,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else None,
+            'evictions': self._evictions,
+            'size_bytes': self.size() if self.enabled else 0,
+            'max_bytes': self.max_bytes,
+        }
+
+
+if __name__ == '__main__':
+    # Example: memoize a simulation and its analysis; the second run loads both from disk
+    import tempfile
+
+    from monte_carlo_simulator import run_monte_carlo_simulation
+    from analyzer import analyze_simulation_results
+
+    cache = ArtifactCache(tempfile.mkdtemp(), max_bytes=200 * 2 ** 20)
+    parameters = {'start_price': 80.0, 'drift': 0.0003, 'volatility': 0.015, 'num_simulations': 100000, 'seed': 7}
+    for run in range(2):
+        started = time.perf_counter()
+        simulation_key = artifact_key('simulate', ['monte_carlo_simulator'], parameters)
+        simulations = cache.get_or_compute('simulate', simulation_key, lambda: run_monte_carlo_simulation(
+            80.0, 0.0003, 0.015, num_simulations=100000, rng=7, as_dataframe=False))
+        analysis_key = artifact_key('analyze', ['analyzer'], simulation_key)
+        analysis = cache.get_or_compute('analyze', analysis_key,
+                                        lambda: analyze_simulation_results(simulations, 80.0))
+        print(f"run {run + 1}: {time.perf_counter() - started:.2f}s, VaR_95 {analysis['risk_metrics']['VaR_95']:.4f}")
+    for stage, counts in cache.stats()['stages'].items():
+        print(f"  {stage}: {counts['hits']} hit(s), {counts['misses']} miss(es), "
+              f"{counts['seconds_saved']:.2f}s saved")
@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from data_processor import process_data
+from monte_carlo_simulator import run_monte_carlo_simulation
+from analyzer import analyze_simulation_results
+
+# Benchmark sizes; 'full' adds the runs that need minutes and ~1GB of memory
+PROFILES = {
+    'quick': {'years': [10, 50], 'paths': [1000, 10000, 100000], 'terminal_paths': [1000000]},
+    'full': {'years': [10, 25, 50], 'paths': [1000, 10000, 100000, 1000000], 'terminal_paths': [10000000]},
+}
+DEFAULT_THRESHOLD = 0.25  # Allowed relative slowdown (or memory growth) against the baseline
+PLOT_PATHS = 10000
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(SCRIPT_DIR, "benchmarks", "baseline.json")
+
+
+def synthetic_market_data(years, seed=0):
+    """
+    Generates reproducible silver and USD/INR bars shaped like the yfinance downloads.
+
+    Args:
+        years (int): Length of the history in years of business days.
+        seed (int): Random seed.
+
+    Returns:
+        tuple: (silver_data, inr_data) DataFrames with a 'Close' column.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("1990-01-01", periods=int(years * 252))
+    silver = 18.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.018, len(dates))))
+    inr = 60.0 * np.exp(np.cumsum(rng.normal(0.0001, 0.004, len(dates))))
+    # Like the real feeds, the two calendars do not line up exactly
+    silver_data = pd.DataFrame({'Close': silver}, index=dates).drop(dates[::97])
+    inr_data = pd.DataFrame({'Close': inr}, index=dates).drop(dates[5::89])
+    return silver_data, inr_data
+
+
+def measure(func, repeats=1, track_memory=True):
+    """
+    Times a callable and measures its peak traced memory.
+
+    The wall time is the best of `repeats` untraced runs; the peak memory
+    comes from one extra run under tracemalloc (NumPy reports its buffers to
+    tracemalloc), so tracing overhead does not distort the timing.
+
+    Args:
+        func (callable): The work to measure, called without arguments.
+        repeats (int): Number of timed runs.
+        track_memory (bool): Whether to do the traced run.
+
+    Returns:
+        dict: 'seconds' and 'peak_memory_mb' (None when not tracked).
+    """
+    seconds = np.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - started)
+
+    peak_memory_mb = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return {'seconds': seconds, 'peak_memory_mb': peak_memory_mb}
+
+
+def _record(results, name, measurement, work, unit):
+    """Adds one case to `results` with its throughput (work units per second)."""
+    measurement['throughput'] = work / measurement['seconds']
+    measurement['unit'] = unit
+    results[name] = measurement
+    memory = measurement['peak_memory_mb']
+    memory_text = "" if memory is None else f", peak {memory:.1f} MB"
+    print(f"  {name:<36} {measurement['seconds']:8.3f}s  {measurement['throughput']:,.0f} {unit}{memory_text}")
+
+
+def run_benchmarks(profile='quick', repeats=1, track_memory=True, seed=0):
+    """
+    Runs every benchmark case on generated fixtures, without any network access.
+
+    Stages: process_data over several history lengths, run_monte_carlo_simulation
+    and analyze_simulation_results over several path counts (the largest only
+    for the terminal price), and every visualizer plot.
+
+    Args:
+        profile (str): A key of PROFILES.
+        repeats (int): Timed runs per case (the best one is kept).
+        track_memory (bool): Whether to measure peak memory.
+        seed (int): Seed of the fixtures and simulations.
+
+    Returns:
+        dict: Case name -> dict with 'seconds', 'throughput', 'unit' and 'peak_memory_mb'.
+    """
+    sizes = PROFILES[profile]
+    results = {}
+
+    print("process_data:")
+    for years in sizes['years']:
+        silver_data, inr_data = synthetic_market_data(years, seed)
+        measurement = measure(lambda: process_data(silver_data, inr_data), repeats, track_memory)
+        _record(results, f"process_data/{years}y", measurement, len(silver_data), "rows/s")
+
+    processed_data, stats = process_data(*synthetic_market_data(10, seed))
+    start_price, drift, volatility = stats['latest_price'], stats['drift'], stats['std_dev']
+
+    print("run_monte_carlo_simulation / analyze_simulation_results:")
+    cases = [(n, None) for n in sizes['paths']] + [(n, 'terminal') for n in sizes['terminal_paths']]
+    for num_simulations, checkpoints in cases:
+        label = f"{num_simulations:.0e}" + ("_terminal" if checkpoints else "")
+
+        def simulate():
+            return run_monte_carlo_simulation(start_price, drift, volatility, num_simulations=num_simulations,
+                                              dtype=np.float32, rng=seed, as_dataframe=False,
+                                              checkpoints=checkpoints)
+
+        _record(results, f"simulate/{label}", measure(simulate, repeats, track_memory), num_simulations, "paths/s")
+        simulations = simulate()
+        measurement = measure(lambda: analyze_simulation_results(simulations, start_price), repeats, track_memory)
+        _record(results, f"analyze/{label}", measurement, num_simulations, "paths/s")
+        del simulations
+
+    print("visualizer:")
+    import matplotlib
+    matplotlib.use('Agg')
+    import visualizer
+    from render_pipeline import standard_chart_jobs
+    from summary_bands import compute_summary_bands
+
+    simulations = run_monte_carlo_simulation(start_price, drift, volatility, num_simulations=PLOT_PATHS,
+                                             rng=seed, as_dataframe=False)
+    analysis_results = analyze_simulation_results(simulations, start_price)
+    jobs = standard_chart_jobs(processed_data, analysis_results, compute_summary_bands(simulations))
+    with tempfile.TemporaryDirectory() as save_path:
+        for name, args in jobs:
+            plot = getattr(visualizer, name)
+            measurement = measure(lambda: plot(*args, save_path=save_path), repeats, track_memory)
+            _record(results, f"plot/{name}", measurement, 1, "plots/s")
+    return results
+
+
+def save_baseline(results, path=DEFAULT_BASELINE_PATH, profile=None):
+    """
+    Writes benchmark results as a JSON baseline.
+
+    Args:
+        results (dict): Output of run_benchmarks.
+        path (str): The baseline file.
+        profile (str): The profile the results came from (stored for reference).
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    baseline = {
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'profile': profile,
+        'numpy': np.__version__,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(path=DEFAULT_BASELINE_PATH):
+    """Returns the 'results' of a JSON baseline, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD, memory_threshold=None):
+    """
+    Compares results with a baseline.
+
+    A case regresses when its wall time grew by more than `threshold` (0.25
+    means 25% slower) or its peak memory grew by more than `memory_threshold`.
+    Cases missing from either side are ignored.
+
+    Args:
+        results (dict): Output of run_benchmarks.
+        baseline (dict): Results loaded with load_baseline.
+        threshold (float): Allowed relative increase of the wall time.
+        memory_threshold (float or None): Allowed relative increase of the peak memory;
+            None uses `threshold`.
+
+    Returns:
+        list: One message per regression (empty if there is none).
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        slowdown = current['seconds'] / reference['seconds'] - 1
+        if slowdown > threshold:
+            regressions.append(f"{name}: {slowdown:+.0%} wall time "
+                               f"({reference['seconds']:.3f}s -> {current['seconds']:.3f}s)")
+        if current.get('peak_memory_mb') and reference.get('peak_memory_mb'):
+            growth = current['peak_memory_mb'] / reference['peak_memory_mb'] - 1
+            if growth > memory_threshold:
+                regressions.append(f"{name}: {growth:+.0%} peak memory "
+                                   f"({reference['peak_memory_mb']:.1f} MB -> {current['peak_memory_mb']:.1f} MB)")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks for the simulation pipeline.")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case; the best is kept.")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak-memory runs.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="JSON baseline file.")
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown before a case fails.")
+    parser.add_argument('--memory-threshold', type=float, default=None,
+                        help="Allowed relative peak-memory growth (default: --threshold).")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.profile, args.repeats, not args.no_memory)
+    if args.update_baseline:
+        save_baseline(results, args.baseline, args.profile)
+        print(f"\nBaseline written to '{args.baseline}'")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at '{args.baseline}'; run with --update-baseline to create one.")
+        sys.exit(0)
+    regressions = find_regressions(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond the threshold:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
@@ -0,0 +1,423 @@
+# Command line interface for headless pipeline jobs. Every subcommand imports its
+# dependencies inside its handler, so `simulate` loads NumPy alone (no pandas,
+# SciPy, matplotlib, seaborn or yfinance).
+import argparse
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "data_cache")
+DEFAULT_CALIBRATION_PATH = os.path.join(OUTPUT_DIR, "calibration.json")
+DEFAULT_STORE_DIR = os.path.join(OUTPUT_DIR, "simulation_results")
+DEFAULT_ANALYSIS_PATH = os.path.join(OUTPUT_DIR, "analysis.json")
+DEFAULT_REPORT_PATH = os.path.join(OUTPUT_DIR, "executive_summary.txt")
+DEFAULT_VISUALIZATIONS_DIR = os.path.join(OUTPUT_DIR, "visualizations")
+DEFAULT_BACKTEST_PATH = os.path.join(OUTPUT_DIR, "var_backtest.csv")
+DEFAULT_ARTIFACT_CACHE_DIR = os.path.join(SCRIPT_DIR, "artifacts")
+DEFAULT_TICKERS = ["SI=F", "INR=X"]
+
+# Modules the simulate path must not import, and its startup budget
+HEAVY_MODULES = ('pandas', 'scipy', 'matplotlib', 'seaborn', 'yfinance')
+DEFAULT_IMPORT_BUDGET = 0.3  # seconds, interpreter startup included
+
+
+def _write_json(path, data):
+    """Writes `data` (numpy types allowed) as JSON, creating the directory if needed."""
+    from result_store import _to_jsonable
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as f:
+        json.dump(_to_jsonable(data), f, indent=2)
+
+
+def _read_json(path):
+    """Reads a JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _load_market_data(args):
+    """Returns (silver_data, inr_data) through the market-data cache, or (None, None)."""
+    from fetch_pipeline import fetch_market_data
+    from market_data_store import MarketDataStore
+
+    store = MarketDataStore(args.cache_dir, offline=args.offline)
+    data, metrics = fetch_market_data(args.tickers, args.start, args.end, store=store)
+    for ticker, m in metrics.items():
+        print(f"  - {ticker}: {m['rows']} rows in {m['seconds']:.2f}s ({m['attempts']} attempt(s))")
+    return data.get(args.tickers[0]), data.get(args.tickers[1])
+
+
+def _load_processed_data(args):
+    """Fetches (or reads from the cache) and processes the market data; returns (data, stats)."""
+    from data_processor import process_data
+
+    silver_data, inr_data = _load_market_data(args)
+    return process_data(silver_data, inr_data)
+
+
+def _model_entry(model):
+    """Describes a calibrated model as {'name', 'params'} for the calibration file."""
+    return {'name': model.name, 'params': dict(vars(model))}
+
+
+def _model_from_entry(entry):
+    """Rebuilds a model saved with _model_entry."""
+    if entry['name'] == 'bootstrap':
+        from bootstrap_simulator import BlockBootstrapModel
+        return BlockBootstrapModel(**entry['params'])
+    from monte_carlo_simulator import MODELS
+    return MODELS[entry['name']](**entry['params'])
+
+
+def _import_simulate_dependencies():
+    """Imports everything the simulate subcommand needs (also used by import-budget)."""
+    import numpy  # noqa: F401
+    import monte_carlo_simulator  # noqa: F401
+    import result_store  # noqa: F401
+
+
+def cmd_fetch(args):
+    """Downloads the missing market data into the local cache."""
+    silver_data, inr_data = _load_market_data(args)
+    if silver_data is None or inr_data is None:
+        print("Failed to fetch data.")
+        return 1
+    print(f"Market data cached in '{args.cache_dir}'")
+    return 0
+
+
+def cmd_calibrate(args):
+    """Computes the historical statistics (and optionally a return model) and saves them as JSON."""
+    processed_data, stats = _load_processed_data(args)
+    if processed_data is None:
+        print("Failed to process data.")
+        return 1
+    calibration = {
+        'statistics': stats,
+        'history': {'start': str(processed_data.index[0].date()), 'end': str(processed_data.index[-1].date()),
+                    'rows': len(processed_data)},
+        'model': None,
+    }
+    if args.model == 'bootstrap':
+        from bootstrap_simulator import BlockBootstrapModel
+        calibration['model'] = _model_entry(BlockBootstrapModel.calibrate(processed_data['Log_Returns'],
+                                                                          args.block_length))
+    elif args.model is not None:
+        from monte_carlo_simulator import calibrate_model
+        calibration['model'] = _model_entry(calibrate_model(args.model, processed_data['Log_Returns']))
+    _write_json(args.output, calibration)
+    print(f"Calibration saved to '{args.output}'")
+    return 0
+
+
+def cmd_simulate(args):
+    """Runs the simulation and writes the paths to a binary result store."""
+    _import_simulate_dependencies()
+    import numpy as np
+    from monte_carlo_simulator import run_monte_carlo_simulation
+    from result_store import save_simulation_result
+
+    stats, model = {}, None
+    if args.calibration:
+        calibration = _read_json(args.calibration)
+        stats = calibration['statistics']
+        if calibration.get('model'):
+            model = _model_from_entry(calibration['model'])
+    start_price = args.start_price if args.start_price is not None else stats.get('latest_price')
+    drift = args.drift if args.drift is not None else stats.get('drift')
+    volatility = args.volatility if args.volatility is not None else stats.get('std_dev')
+    if start_price is None or (model is None and (drift is None or volatility is None)):
+        print("Pass --calibration or --start-price, --drift and --volatility.")
+        return 2
+
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+    checkpoints = args.checkpoints
+    if checkpoints is not None and checkpoints not in ('terminal', 'weekly', 'monthly'):
+        checkpoints = [int(day) for day in checkpoints.split(',')]
+    try:
+        simulations = run_monte_carlo_simulation(start_price, drift, volatility, forecast_period=args.days,
+                                                 num_simulations=args.paths, dtype=np.dtype(args.dtype), rng=seed,
+                                                 as_dataframe=False, variance_reduction=args.variance_reduction,
+                                                 checkpoints=checkpoints, model=model)
+    except ValueError as e:
+        print(e)
+        return 2
+    save_simulation_result(simulations, args.output, metadata={
+        'seed': str(seed),
+        'parameters': {
+            'drift': drift,
+            'volatility': volatility,
+            'forecast_period': args.days,
+            'num_simulations': args.paths,
+            'variance_reduction': args.variance_reduction,
+            'checkpoints': args.checkpoints,
+            'model': None if model is None else model.name,
+        },
+        'calibration': stats,
+    })
+    print(f"Simulated {args.paths} paths over {args.days} days; saved to '{args.output}'")
+    return 0
+
+
+def _analyze_store(store_dir, start_price=None, bootstrap_samples=0, path_metrics=False):
+    """Returns (store, start_price, analysis results) for a saved simulation."""
+    from analyzer import analyze_simulation_results
+    from result_store import SimulationStore
+
+    store = SimulationStore(store_dir)
+    start_price = start_price if start_price is not None else store.metadata['start_price']
+    return store, start_price, analyze_simulation_results(store.to_result(), start_price,
+                                                          bootstrap_samples=bootstrap_samples,
+                                                          path_metrics=path_metrics)
+
+
+def cmd_analyze(args):
+    """Analyzes a saved simulation and writes the metrics as JSON."""
+    store, _, analysis_results = _analyze_store(args.store, args.start_price, args.bootstrap_samples,
+                                                args.path_metrics)
+    analysis = {key: value for key, value in analysis_results.items() if key != 'final_prices'}
+    analysis['num_simulations'] = store.shape[1]
+    analysis['forecast_period'] = store.metadata['parameters']['forecast_period']
+    _write_json(args.output, analysis)
+    print(f"Analysis saved to '{args.output}'")
+    return 0
+
+
+def cmd_plot(args):
+    """Renders the charts of a saved simulation (headless, in parallel, cached)."""
+    from render_pipeline import render_charts, standard_chart_jobs
+    from summary_bands import compute_summary_bands
+
+    processed_data, _ = _load_processed_data(args)
+    if processed_data is None:
+        print("Failed to process data.")
+        return 1
+    store, _, analysis_results = _analyze_store(args.store)
+    jobs = standard_chart_jobs(processed_data, analysis_results, compute_summary_bands(store))
+    if args.charts:
+        jobs = [job for job in jobs if job[0] in args.charts]
+    timings = render_charts(jobs, save_path=args.output_dir, max_workers=args.workers, force=args.force)
+    for name, seconds in timings.items():
+        print(f"  - {name}: {'skipped (unchanged)' if seconds is None else f'{seconds:.2f}s'}")
+    print(f"Visualizations saved in '{args.output_dir}' directory.")
+    return 0
+
+
+def cmd_report(args):
+    """Writes the executive summary from a calibration and an analysis file."""
+    from reporting import generate_executive_summary
+
+    calibration = _read_json(args.calibration)
+    analysis = _read_json(args.analysis)
+    summary = generate_executive_summary(calibration['statistics'], analysis,
+                                         num_simulations=analysis['num_simulations'],
+                                         forecast_period=analysis['forecast_period'])
+    with open(args.output, 'w') as f:
+        f.write(summary)
+    print(f"Executive summary saved to '{args.output}'")
+    return 0
+
+
+def cmd_backtest(args):
+    """Runs the walk-forward VaR backtest and writes the per-date forecasts and the coverage tests."""
+    from var_backtester import run_var_backtest
+
+    processed_data, _ = _load_processed_data(args)
+    if processed_data is None:
+        print("Failed to process data.")
+        return 1
+    backtest = run_var_backtest(processed_data, window=args.window, horizon=args.horizon, step=args.step,
+                                num_simulations=args.paths, model=args.model, block_length=args.block_length,
+                                seed=args.seed, num_workers=args.workers)
+    directory = os.path.dirname(args.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    backtest.frame.to_csv(args.output)
+    coverage_path = os.path.splitext(args.output)[0] + "_coverage.json"
+    _write_json(coverage_path, {'settings': backtest.settings, 'seconds': backtest.seconds,
+                                'coverage': backtest.coverage})
+    print(f"{backtest.settings['rebalance_dates']} rebalance dates in {backtest.seconds:.1f}s")
+    print(backtest.coverage_frame()[['breaches', 'expected_rate', 'observed_rate', 'kupiec_p_value',
+                                     'christoffersen_p_value']].to_string())
+    print(f"Backtest saved to '{args.output}' and '{coverage_path}'")
+    return 0
+
+
+def cmd_cache(args):
+    """Lists the memoized pipeline artifacts, or deletes them (all, or one stage's)."""
+    from artifact_cache import ArtifactCache
+    from render_pipeline import RENDER_CACHE_FILE
+
+    cache = ArtifactCache(args.cache_dir, enabled=False)
+    if args.action == 'clear':
+        removed = cache.invalidate(args.stage)
+        render_cache = os.path.join(args.visualizations_dir, RENDER_CACHE_FILE)
+        if args.stage in (None, 'visualize') and os.path.exists(render_cache):
+            os.remove(render_cache)
+            removed += 1
+        print(f"Removed {removed} cached artifact(s) from '{args.cache_dir}'")
+        return 0
+
+    sizes = {}
+    for _, stage, size, _ in cache.entries():
+        count, total = sizes.get(stage, (0, 0))
+        sizes[stage] = (count + 1, total + size)
+    for stage, (count, total) in sorted(sizes.items()):
+        print(f"{stage:<20} {count:4d} artifact(s) {total / 2 ** 20:10.1f} MB")
+    print(f"{'total':<20} {sum(c for c, _ in sizes.values()):4d} artifact(s) "
+          f"{sum(t for _, t in sizes.values()) / 2 ** 20:10.1f} MB")
+    return 0
+
+
+def measure_import_time(repeats=5):
+    """
+    Measures the startup cost of the simulate subcommand in fresh interpreters.
+
+    Args:
+        repeats (int): Number of interpreters started; the median is reported.
+
+    Returns:
+        dict: 'seconds' (median wall time of a whole interpreter that imports the
+        simulate dependencies), 'import_seconds' (median time of the imports alone)
+        and 'heavy_modules' (HEAVY_MODULES that got imported).
+    """
+    import statistics
+    import subprocess
+    import time
+
+    code = ("import sys, time, json; started = time.perf_counter(); import cli; "
+            "cli._import_simulate_dependencies(); "
+            "print(json.dumps({'import_seconds': time.perf_counter() - started, "
+            f"'heavy_modules': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+    wall, imports, heavy = [], [], set()
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', code], cwd=SCRIPT_DIR, capture_output=True, text=True,
+                                check=True).stdout
+        wall.append(time.perf_counter() - started)
+        result = json.loads(output)
+        imports.append(result['import_seconds'])
+        heavy.update(result['heavy_modules'])
+    return {'seconds': statistics.median(wall), 'import_seconds': statistics.median(imports),
+            'heavy_modules': sorted(heavy)}
+
+
+def cmd_import_budget(args):
+    """Fails when the simulate path is slower to start than the budget or imports heavy modules."""
+    result = measure_import_time(args.repeats)
+    print(f"simulate startup: {result['seconds']:.3f}s (imports {result['import_seconds']:.3f}s), "
+          f"budget {args.budget:.3f}s")
+    if result['heavy_modules']:
+        print(f"Heavy modules imported: {', '.join(result['heavy_modules'])}")
+        return 1
+    return 0 if result['seconds'] <= args.budget else 1
+
+
+def _add_market_data_arguments(parser):
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Market-data cache directory.")
+    parser.add_argument('--start', default="2015-01-01", help="First date (YYYY-MM-DD).")
+    parser.add_argument('--end', default=None, help="End date (YYYY-MM-DD); default today.")
+    parser.add_argument('--tickers', nargs=2, default=DEFAULT_TICKERS, metavar=('SILVER', 'USDINR'))
+    parser.add_argument('--offline', action='store_true', help="Serve market data from the cache only.")
+
+
+def build_parser():
+    """Builds the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(description="Silver price Monte Carlo pipeline.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help="Download market data into the local cache.")
+    _add_market_data_arguments(fetch)
+    fetch.set_defaults(handler=cmd_fetch)
+
+    calibrate = commands.add_parser('calibrate', help="Compute historical statistics and fit a model.")
+    _add_market_data_arguments(calibrate)
+    calibrate.add_argument('--model', choices=['gbm', 'student_t', 'garch', 'merton', 'bootstrap'], default=None,
+                           help="Also fit this return model (default: plain GBM from the statistics).")
+    calibrate.add_argument('--block-length', type=int, default=20, help="Mean block length of the bootstrap.")
+    calibrate.add_argument('--output', default=DEFAULT_CALIBRATION_PATH)
+    calibrate.set_defaults(handler=cmd_calibrate)
+
+    simulate = commands.add_parser('simulate', help="Simulate price paths into a binary result store.")
+    simulate.add_argument('--calibration', default=None, help="Calibration JSON written by 'calibrate'.")
+    simulate.add_argument('--start-price', type=float, default=None)
+    simulate.add_argument('--drift', type=float, default=None, help="Daily drift of the log returns.")
+    simulate.add_argument('--volatility', type=float, default=None, help="Daily volatility of the log returns.")
+    simulate.add_argument('--paths', type=int, default=10000, help="Number of simulated paths.")
+    simulate.add_argument('--days', type=int, default=252, help="Trading days to forecast (including day 0).")
+    simulate.add_argument('--seed', type=int, default=None)
+    simulate.add_argument('--dtype', choices=['float64', 'float32'], default='float64')
+    simulate.add_argument('--variance-reduction', nargs='+', default=None,
+                          choices=['antithetic', 'moment_matching', 'control_variate', 'sobol'])
+    simulate.add_argument('--checkpoints', default=None,
+                          help="'terminal', 'weekly', 'monthly' or comma-separated days.")
+    simulate.add_argument('--output', default=DEFAULT_STORE_DIR, help="Result store directory.")
+    simulate.set_defaults(handler=cmd_simulate)
+
+    analyze = commands.add_parser('analyze', help="Compute forecast and risk metrics of a saved simulation.")
+    analyze.add_argument('--store', default=DEFAULT_STORE_DIR)
+    analyze.add_argument('--start-price', type=float, default=None, help="Default: the simulation's start price.")
+    analyze.add_argument('--bootstrap-samples', type=int, default=0,
+                         help="Resamples for VaR/CVaR confidence intervals (0 skips them).")
+    analyze.add_argument('--path-metrics', action='store_true',
+                         help="Add drawdown, barrier-touch and time-to-target metrics.")
+    analyze.add_argument('--output', default=DEFAULT_ANALYSIS_PATH)
+    analyze.set_defaults(handler=cmd_analyze)
+
+    plot = commands.add_parser('plot', help="Render the charts of a saved simulation.")
+    _add_market_data_arguments(plot)
+    plot.add_argument('--store', default=DEFAULT_STORE_DIR)
+    plot.add_argument('--charts', nargs='+', default=None, help="Only these visualizer functions.")
+    plot.add_argument('--workers', type=int, default=None, help="Render processes (1 renders in-process).")
+    plot.add_argument('--force', action='store_true', help="Re-render unchanged charts.")
+    plot.add_argument('--output-dir', default=DEFAULT_VISUALIZATIONS_DIR)
+    plot.set_defaults(handler=cmd_plot)
+
+    report = commands.add_parser('report', help="Write the executive summary.")
+    report.add_argument('--calibration', default=DEFAULT_CALIBRATION_PATH)
+    report.add_argument('--analysis', default=DEFAULT_ANALYSIS_PATH)
+    report.add_argument('--output', default=DEFAULT_REPORT_PATH)
+    report.set_defaults(handler=cmd_report)
+
+    backtest = commands.add_parser('backtest', help="Walk-forward backtest of the simulated VaR_95 / VaR_99.")
+    _add_market_data_arguments(backtest)
+    backtest.add_argument('--model', choices=['student_t', 'garch', 'merton', 'bootstrap'], default=None,
+                          help="Return model refitted on every window (default: GBM).")
+    backtest.add_argument('--block-length', type=int, default=20, help="Mean block length of 'bootstrap'.")
+    backtest.add_argument('--window', type=int, default=500, help="Calibration window in trading days.")
+    backtest.add_argument('--horizon', type=int, default=1, help="VaR horizon in trading days.")
+    backtest.add_argument('--step', type=int, default=1, help="Trading days between rebalance dates.")
+    backtest.add_argument('--paths', type=int, default=10000, help="Paths simulated per rebalance date.")
+    backtest.add_argument('--seed', type=int, default=0)
+    backtest.add_argument('--workers', type=int, default=None, help="Worker processes (1 runs in-process).")
+    backtest.add_argument('--output', default=DEFAULT_BACKTEST_PATH, help="CSV of the per-date forecasts.")
+    backtest.set_defaults(handler=cmd_backtest)
+
+    cache = commands.add_parser('cache', help="List or invalidate the memoized pipeline artifacts of main.py.")
+    cache.add_argument('action', choices=['list', 'clear'])
+    cache.add_argument('--stage', default=None,
+                       help="Only this stage, e.g. process_data, simulate, analyze or visualize.")
+    cache.add_argument('--cache-dir', default=DEFAULT_ARTIFACT_CACHE_DIR)
+    cache.add_argument('--visualizations-dir', default=DEFAULT_VISUALIZATIONS_DIR,
+                       help="Where the chart render cache lives (cleared with the 'visualize' stage).")
+    cache.set_defaults(handler=cmd_cache)
+
+    budget = commands.add_parser('import-budget', help="Check the startup time of the simulate path.")
+    budget.add_argument('--budget', type=float, default=DEFAULT_IMPORT_BUDGET, help="Allowed seconds.")
+    budget.add_argument('--repeats', type=int, default=5)
+    budget.set_defaults(handler=cmd_import_budget)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
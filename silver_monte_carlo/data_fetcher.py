@@ -2,7 +2,7 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime
 
-def fetch_silver_data(ticker="SI=F", start_date="2015-01-01", end_date="2025-12-30"):
+def fetch_silver_data(ticker="SI=F", start_date="2015-01-01", end_date="2025-12-30", store=None):
     """
     Fetches historical silver price data from Yahoo Finance.
 
@@ -10,6 +10,7 @@ def fetch_silver_data(ticker="SI=F", start_date="2015-01-01", end_date="2025-12-
         ticker (str): The ticker symbol for silver (default: "SI=F" for Silver futures).
         start_date (str): The start date for the data in "YYYY-MM-DD" format.
         end_date (str): The end date for the data in "YYYY-MM-DD" format. If None, fetches up to the current date.
+        store (MarketDataStore): Optional local cache; only the missing date ranges are downloaded.
 
     Returns:
         pd.DataFrame: A DataFrame containing the historical silver price data, or None if fetching fails.
@@ -17,6 +18,9 @@ def fetch_silver_data(ticker="SI=F", start_date="2015-01-01", end_date="2025-12-
     if end_date is None:
         end_date = datetime.now().strftime("%Y-%m-%d")
     
+    if store is not None:
+        return store.get(ticker, start_date, end_date)
+
     try:
         silver_data = yf.download(ticker, start=start_date, end=end_date)
         if silver_data.empty:
@@ -28,7 +32,7 @@ def fetch_silver_data(ticker="SI=F", start_date="2015-01-01", end_date="2025-12-
         print(f"Error fetching silver data: {e}")
         return None
 
-def fetch_inr_data(ticker="INR=X", start_date="2015-01-01", end_date=None):
+def fetch_inr_data(ticker="INR=X", start_date="2015-01-01", end_date=None, store=None):
     """
     Fetches historical USD/INR exchange rate data from Yahoo Finance.
 
@@ -36,6 +40,7 @@ def fetch_inr_data(ticker="INR=X", start_date="2015-01-01", end_date=None):
         ticker (str): The ticker symbol for USD/INR exchange rate (default: "INR=X").
         start_date (str): The start date for the data in "YYYY-MM-DD" format.
         end_date (str): The end date for the data in "YYYY-MM-DD" format. If None, fetches up to the current date.
+        store (MarketDataStore): Optional local cache; only the missing date ranges are downloaded.
 
     Returns:
         pd.DataFrame: A DataFrame containing the historical exchange rate data, or None if fetching fails.
@@ -43,6 +48,9 @@ def fetch_inr_data(ticker="INR=X", start_date="2015-01-01", end_date=None):
     if end_date is None:
         end_date = datetime.now().strftime("%Y-%m-%d")
         
+    if store is not None:
+        return store.get(ticker, start_date, end_date)
+
     try:
         inr_data = yf.download(ticker, start=start_date, end=end_date)
         if inr_data.empty:
@@ -1,6 +1,19 @@
+import json
+
 import pandas as pd
 import numpy as np
 
+TRADING_DAYS_PER_YEAR = 252
+GRAMS_PER_OUNCE = 31.1035
+
+
+def _combine_prices(silver_data, inr_data):
+    """Aligns the silver and USD/INR closes into one DataFrame (no filling or dropping)."""
+    data = pd.concat([silver_data['Close'], inr_data['Close']], axis=1, sort=True)
+    data.columns = ['Silver_USD_Ounce', 'USD_INR']
+    return data
+
+
 def process_data(silver_data, inr_data):
     """
     Cleans, preprocesses, and calculates statistical metrics for the silver price data.
@@ -18,14 +31,13 @@ def process_data(silver_data, inr_data):
         return None, None
 
     # Combine data and handle missing values
-    data = pd.concat([gold_data['Close'], inr_data['Close']], axis=1)
-    data.columns = ['Silver_USD_Ounce', 'USD_INR']
+    data = _combine_prices(silver_data, inr_data)
     data.ffill(inplace=True)
     data.dropna(inplace=True)
 
     # Convert silver price to INR per gram
     # 1 ounce = 31.1035 grams
-    data['Silver_INR_Gram'] = (data['Silver_USD_Ounce'] / 31.1035) * data['USD_INR']
+    data['Silver_INR_Gram'] = (data['Silver_USD_Ounce'] / GRAMS_PER_OUNCE) * data['USD_INR']
 
     # Calculate daily returns
     data['Log_Returns'] = np.log(data['Silver_INR_Gram'] / data['Silver_INR_Gram'].shift(1))
@@ -35,7 +47,7 @@ def process_data(silver_data, inr_data):
     mean_daily_return = data['Log_Returns'].mean()
     std_dev = data['Log_Returns'].std()
     drift = mean_daily_return - 0.5 * std_dev**2
-    annualized_volatility = std_dev * np.sqrt(252) # Assuming 252 trading days
+    annualized_volatility = std_dev * np.sqrt(TRADING_DAYS_PER_YEAR) # Assuming 252 trading days
     
     # Maximum Drawdown
     cumulative_returns = (1 + data['Log_Returns']).cumprod()
@@ -44,7 +56,7 @@ def process_data(silver_data, inr_data):
     max_drawdown = drawdown.min()
 
     # Sharpe Ratio (assuming risk-free rate is 0)
-    sharpe_ratio = (mean_daily_return * 252) / annualized_volatility
+    sharpe_ratio = (mean_daily_return * TRADING_DAYS_PER_YEAR) / annualized_volatility
 
     stats = {
         'mean_daily_return': mean_daily_return,
@@ -58,6 +70,184 @@ def process_data(silver_data, inr_data):
 
     return data, stats
 
+
+class IncrementalCalibrator:
+    """
+    Stateful version of `process_data` whose update cost is O(new rows).
+
+    The calibrator keeps just enough state to extend the full-history
+    statistics: the last silver and USD/INR closes (for forward filling) and
+    the last INR price (for the next log return), running moments of the log
+    returns (Chan/Welford), the running cumulative-return product and its peak
+    for the maximum drawdown, and the last `window` log returns for rolling
+    volatility. Its `stats` match `process_data` over the same history up to
+    floating point rounding.
+
+    Attributes:
+        window (int): Length of the rolling-volatility window.
+        count (int): Number of log returns seen so far.
+        last_date (pd.Timestamp): Date of the last processed bar.
+    """
+
+    def __init__(self, window=TRADING_DAYS_PER_YEAR):
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.cumulative_return = 1.0
+        self.peak = -np.inf
+        self.max_drawdown = np.inf
+        self.last_silver_usd = np.nan
+        self.last_usd_inr = np.nan
+        self.last_price = np.nan
+        self.last_date = None
+        self.recent_returns = np.empty(0)
+
+    def update(self, silver_data, inr_data):
+        """
+        Adds new bars and updates the statistics.
+
+        Bars dated on or before the last processed bar are ignored.
+
+        Args:
+            silver_data (pd.DataFrame): New silver bars in USD (with a 'Close' column).
+            inr_data (pd.DataFrame): New USD/INR bars (with a 'Close' column).
+
+        Returns:
+            pd.DataFrame: The newly processed rows, with the same columns as `process_data`.
+        """
+        data = _combine_prices(silver_data, inr_data).sort_index()
+        if self.last_date is not None:
+            data = data.loc[data.index > self.last_date]
+        if data.empty:
+            return data
+
+        # Continue the forward fill from the previous batch
+        first = data.index[0]
+        data.loc[first] = data.loc[first].fillna({'Silver_USD_Ounce': self.last_silver_usd,
+                                                   'USD_INR': self.last_usd_inr})
+        data = data.ffill().dropna()
+        if data.empty:
+            return data
+        self.last_date = data.index[-1]
+        self.last_silver_usd = data['Silver_USD_Ounce'].iloc[-1]
+        self.last_usd_inr = data['USD_INR'].iloc[-1]
+
+        data['Silver_INR_Gram'] = (data['Silver_USD_Ounce'] / GRAMS_PER_OUNCE) * data['USD_INR']
+        prices = data['Silver_INR_Gram'].to_numpy()
+        previous = np.concatenate([[self.last_price], prices[:-1]])
+        data['Log_Returns'] = np.log(prices / previous)
+        self.last_price = prices[-1]
+        data = data.dropna()
+
+        self._update_moments(data['Log_Returns'].to_numpy())
+        return data
+
+    def _update_moments(self, log_returns):
+        """Folds a batch of log returns into the running state."""
+        if log_returns.size == 0:
+            return
+
+        # Running mean and M2 (Chan et al. pairwise merge)
+        batch_count = log_returns.size
+        batch_mean = log_returns.mean()
+        batch_m2 = ((log_returns - batch_mean) ** 2).sum()
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total
+        self.m2 += batch_m2 + delta * delta * self.count * batch_count / total
+        self.count = total
+
+        # Drawdown of the same cumulative-return series process_data uses
+        cumulative = np.cumprod(np.concatenate([[self.cumulative_return], 1 + log_returns]))[1:]
+        peak = np.maximum.accumulate(np.concatenate([[self.peak], cumulative]))[1:]
+        self.max_drawdown = min(self.max_drawdown, ((cumulative / peak) - 1).min())
+        self.cumulative_return = cumulative[-1]
+        self.peak = peak[-1]
+
+        self.recent_returns = np.concatenate([self.recent_returns, log_returns])[-self.window:]
+
+    @property
+    def stats(self):
+        """dict: The same statistics `process_data` returns, for the history seen so far."""
+        std_dev = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        annualized_volatility = std_dev * np.sqrt(TRADING_DAYS_PER_YEAR)
+        return {
+            'mean_daily_return': self.mean,
+            'std_dev': std_dev,
+            'drift': self.mean - 0.5 * std_dev**2,
+            'annualized_volatility': annualized_volatility,
+            'max_drawdown': self.max_drawdown,
+            'sharpe_ratio': (self.mean * TRADING_DAYS_PER_YEAR) / annualized_volatility,
+            'latest_price': self.last_price,
+        }
+
+    def rolling_volatility(self):
+        """Returns the annualized volatility of the last `window` log returns (NaN until the window is full)."""
+        if self.recent_returns.size < self.window:
+            return np.nan
+        return self.recent_returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def to_dict(self):
+        """Returns the calibrator state as a JSON-serializable dict."""
+        return {
+            'window': self.window,
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'cumulative_return': self.cumulative_return,
+            'peak': self.peak if np.isfinite(self.peak) else None,
+            'max_drawdown': self.max_drawdown if np.isfinite(self.max_drawdown) else None,
+            'last_silver_usd': None if np.isnan(self.last_silver_usd) else self.last_silver_usd,
+            'last_usd_inr': None if np.isnan(self.last_usd_inr) else self.last_usd_inr,
+            'last_price': None if np.isnan(self.last_price) else self.last_price,
+            'last_date': None if self.last_date is None else self.last_date.isoformat(),
+            'recent_returns': self.recent_returns.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuilds a calibrator from `to_dict` output."""
+        calibrator = cls(window=state['window'])
+        calibrator.count = state['count']
+        calibrator.mean = state['mean']
+        calibrator.m2 = state['m2']
+        calibrator.cumulative_return = state['cumulative_return']
+        calibrator.peak = -np.inf if state['peak'] is None else state['peak']
+        calibrator.max_drawdown = np.inf if state['max_drawdown'] is None else state['max_drawdown']
+        calibrator.last_silver_usd = np.nan if state['last_silver_usd'] is None else state['last_silver_usd']
+        calibrator.last_usd_inr = np.nan if state['last_usd_inr'] is None else state['last_usd_inr']
+        calibrator.last_price = np.nan if state['last_price'] is None else state['last_price']
+        calibrator.last_date = None if state['last_date'] is None else pd.Timestamp(state['last_date'])
+        calibrator.recent_returns = np.asarray(state['recent_returns'], dtype=np.float64)
+        return calibrator
+
+    def save(self, path):
+        """Writes the calibrator state to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a calibrator saved with `save`."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def max_stats_difference(stats_a, stats_b):
+    """
+    Returns the largest relative difference between two stats dicts.
+
+    Args:
+        stats_a (dict): Statistics, e.g. from process_data.
+        stats_b (dict): Statistics with the same keys, e.g. from IncrementalCalibrator.stats.
+
+    Returns:
+        float: max |a - b| / max(|a|, 1e-300) over all keys.
+    """
+    return max(abs(stats_a[key] - stats_b[key]) / max(abs(stats_a[key]), 1e-300) for key in stats_a)
+
+
 if __name__ == '__main__':
     # Example usage with dummy data:
     from data_fetcher import fetch_silver_data, fetch_inr_data
@@ -73,3 +263,10 @@ if __name__ == '__main__':
         print("\nCalculated Statistics:")
         for key, value in statistics.items():
             print(f"{key}: {value}")
+
+        # Incremental recalibration over the same history must reproduce the full recompute
+        calibrator = IncrementalCalibrator()
+        for batch in np.array_split(np.arange(len(silver_prices)), 10):
+            calibrator.update(silver_prices.iloc[batch], inr_rates.loc[:silver_prices.index[batch[-1]]])
+        print(f"\nMax relative difference vs. incremental calibration: "
+              f"{max_stats_difference(statistics, calibrator.stats):.2e}")
@@ -0,0 +1,397 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from data_processor import process_data
+from monte_carlo_simulator import run_monte_carlo_simulation, calibrate_model, _parse_schemes
+from analyzer import analyze_simulation_results
+from bootstrap_simulator import BlockBootstrapModel
+from result_store import _to_jsonable
+from render_pipeline import fingerprint
+
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_MAX_PATHS = 500000
+MODEL_NAMES = ('gbm', 'student_t', 'garch', 'merton', 'bootstrap')
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error'}
+
+
+def _run_forecast(start_price, drift, volatility, model, forecast_period, num_simulations, seed, variance_reduction):
+    """Simulates and analyzes one forecast in a worker process; returns the JSON-ready metrics."""
+    simulations = run_monte_carlo_simulation(start_price, drift, volatility, forecast_period, num_simulations,
+                                             rng=seed, as_dataframe=False, variance_reduction=variance_reduction,
+                                             model=model)
+    analysis = analyze_simulation_results(simulations, start_price)
+    analysis.pop('final_prices')
+    return _to_jsonable(analysis)
+
+
+def _warm_up(_):
+    """No-op job that makes the pool start a worker (which imports the simulation modules)."""
+    return os.getpid()
+
+
+class LRUCache:
+    """
+    Size-bounded least-recently-used cache.
+
+    Attributes:
+        max_entries (int): Capacity; the least recently used entry is evicted beyond it.
+        hits (int): Number of lookups that found an entry.
+        misses (int): Number of lookups that did not.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns the cached value (marking it as recently used) or None."""
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entries beyond capacity."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ForecastService:
+    """
+    Long-lived forecast service with a warm calibration and a result cache.
+
+    The historical data is processed once and kept in memory together with
+    every return model calibrated on it. Forecasts run in a process pool so
+    the event loop never blocks; the workers are started up front so the
+    first request does not pay for their imports. Results are cached in an
+    LRU keyed by (calibration hash, model, horizon, variance reduction, path
+    count, seed), and identical requests that arrive while a forecast is running share it.
+    Requests without a seed get fresh randomness and are not cached.
+
+    Attributes:
+        processed_data (pd.DataFrame): Output of process_data.
+        statistics (dict): The historical statistics of process_data.
+        calibration_hash (str): Content hash of the log returns the service is calibrated on.
+        cache (LRUCache): Finished forecasts.
+        max_paths (int): Largest path count a request may ask for.
+    """
+
+    def __init__(self, silver_data, inr_data, max_workers=None, cache_entries=DEFAULT_CACHE_ENTRIES,
+                 max_paths=DEFAULT_MAX_PATHS):
+        self.cache = LRUCache(cache_entries)
+        self.max_paths = max_paths
+        # Spawned (not forked) workers do not inherit open client sockets, which would
+        # otherwise keep connections alive after the server closes them.
+        max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        self._in_flight = {}
+        self.calibrate(silver_data, inr_data)
+        list(self.executor.map(_warm_up, range(max_workers)))
+
+    def calibrate(self, silver_data, inr_data):
+        """
+        Processes new market data and replaces the in-memory calibration.
+
+        Every return model is fitted here, up front, so no request has to
+        calibrate one on the event loop. Cached results stay valid for their
+        own calibration hash and simply stop being hit.
+
+        Args:
+            silver_data (pd.DataFrame): Silver bars in USD (with a 'Close' column).
+            inr_data (pd.DataFrame): USD/INR bars (with a 'Close' column).
+        """
+        processed_data, statistics = process_data(silver_data, inr_data)
+        if processed_data is None:
+            raise ValueError("Market data could not be processed.")
+        self.processed_data = processed_data
+        self.statistics = statistics
+        self.calibration_hash = fingerprint(processed_data['Log_Returns'])[:16]
+        log_returns = processed_data['Log_Returns']
+        self._models = {'gbm': None, 'bootstrap': BlockBootstrapModel.calibrate(log_returns)}
+        for name in MODEL_NAMES:
+            if name not in self._models:
+                self._models[name] = calibrate_model(name, log_returns)
+
+    def model(self, name):
+        """Returns the return model `name` calibrated on the current data (None means plain GBM)."""
+        return self._models[name]
+
+    def parse_forecast_query(self, query):
+        """
+        Validates forecast parameters.
+
+        Args:
+            query (dict): Parameter name -> string value.
+
+        Returns:
+            dict: 'model', 'forecast_period', 'num_simulations', 'seed' and 'variance_reduction'.
+
+        Raises:
+            ValueError: If a parameter is malformed, out of range, or an unsupported
+                combination (e.g. 'sobol' with 'antithetic', or variance reduction with a non-GBM model).
+        """
+        params = {
+            'model': query.get('model', 'gbm'),
+            'forecast_period': int(query.get('days', 252)),
+            'num_simulations': int(query.get('paths', 10000)),
+            'seed': int(query['seed']) if query.get('seed') not in (None, '') else None,
+            'variance_reduction': tuple(sorted(s for s in query.get('variance_reduction', '').split(',') if s)),
+        }
+        if params['model'] not in MODEL_NAMES:
+            raise ValueError(f"Unknown model '{params['model']}'; choose from {MODEL_NAMES}.")
+        if not 1 <= params['num_simulations'] <= self.max_paths:
+            raise ValueError(f"paths must be between 1 and {self.max_paths}.")
+        if params['forecast_period'] < 2:
+            raise ValueError("days must be at least 2.")
+        # Reject every combination the simulator would refuse, so it is a 400 rather than a worker error
+        _parse_schemes(params['variance_reduction'])
+        if params['variance_reduction'] and params['model'] != 'gbm':
+            raise ValueError(f"variance_reduction is only supported for model 'gbm', not '{params['model']}'.")
+        return params
+
+    async def forecast(self, params):
+        """
+        Returns the analysis of one forecast, from the cache when possible.
+
+        Args:
+            params (dict): Output of parse_forecast_query.
+
+        Returns:
+            dict: The analyzer metrics plus 'calibration_hash', 'cached' and 'seconds'.
+        """
+        started = time.perf_counter()
+        key = (self.calibration_hash, params['model'], params['forecast_period'], params['variance_reduction'],
+               params['num_simulations'], params['seed'])
+        cacheable = params['seed'] is not None
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return dict(cached, cached=True, seconds=time.perf_counter() - started)
+            if key in self._in_flight:
+                result = await asyncio.shield(self._in_flight[key])
+                return dict(result, cached=True, seconds=time.perf_counter() - started)
+
+        # The task publishes the complete result, so concurrent waiters and the cache see the same dict
+        task = asyncio.ensure_future(self._compute(key if cacheable else None, params))
+        if cacheable:
+            self._in_flight[key] = task
+        result = await asyncio.shield(task)
+        return dict(result, cached=False, seconds=time.perf_counter() - started)
+
+    async def _compute(self, key, params):
+        """Runs one forecast on the pool and returns it with its calibration hash and parameters."""
+        job = partial(_run_forecast, self.statistics['latest_price'], self.statistics['drift'],
+                      self.statistics['std_dev'], self.model(params['model']), params['forecast_period'],
+                      params['num_simulations'], params['seed'], params['variance_reduction'] or None)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, job)
+            result['calibration_hash'] = self.calibration_hash
+            result['parameters'] = {name: value for name, value in params.items()}
+            if key is not None:
+                self.cache.put(key, result)
+            return result
+        finally:
+            if key is not None:
+                self._in_flight.pop(key, None)
+
+    async def handle(self, method, path, query):
+        """Routes one request; returns (status, JSON-ready body)."""
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/calibration':
+            return 200, {'calibration_hash': self.calibration_hash, 'statistics': _to_jsonable(self.statistics)}
+        if path == '/stats':
+            return 200, {'cache_entries': len(self.cache), 'cache_hits': self.cache.hits,
+                         'cache_misses': self.cache.misses, 'in_flight': len(self._in_flight)}
+        if path == '/forecast':
+            if method not in ('GET', 'POST'):
+                return 405, {'error': "Use GET or POST."}
+            try:
+                params = self.parse_forecast_query(query)
+            except (KeyError, ValueError) as e:
+                return 400, {'error': str(e)}
+            return 200, await self.forecast(params)
+        return 404, {'error': f"Unknown path '{path}'."}
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests (keep-alive) on one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                url = urlsplit(target)
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                try:
+                    if body:
+                        fields = json.loads(body)
+                        if not isinstance(fields, dict):
+                            raise ValueError("The request body must be a JSON object.")
+                        query.update({name: str(value) for name, value in fields.items()})
+                except ValueError as e:
+                    status, payload = 400, {'error': f"Malformed request body: {e}"}
+                else:
+                    try:
+                        status, payload = await self.handle(method, url.path, query)
+                    except Exception as e:
+                        status, payload = 500, {'error': str(e)}
+
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        """Starts listening; returns the asyncio server."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Shuts the worker pool down."""
+        self.executor.shutdown()
+
+
+async def _http_get(host, port, target):
+    """Sends one GET request on a new connection; returns (status, body dict)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    writer.close()
+    return int(status_line.split(b' ', 2)[1]), json.loads(body)
+
+
+async def load_test(host, port, targets, num_requests=200, concurrency=16):
+    """
+    Sends concurrent forecast requests and reports latency percentiles.
+
+    Args:
+        host (str): Service host.
+        port (int): Service port.
+        targets (list): Request targets (path and query) cycled through.
+        num_requests (int): Total number of requests.
+        concurrency (int): Requests in flight at once.
+
+    Returns:
+        dict: 'requests', 'errors', 'seconds', 'requests_per_sec', 'p50_ms', 'p99_ms' and 'max_ms'.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(target):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            status, _ = await _http_get(host, port, target)
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(targets[i % len(targets)]) for i in range(num_requests)))
+    seconds = time.perf_counter() - started
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return {'requests': num_requests, 'errors': errors, 'seconds': seconds,
+            'requests_per_sec': num_requests / seconds, 'p50_ms': p50, 'p99_ms': p99,
+            'max_ms': max(latencies) * 1000}
+
+
+async def _demo(service, num_requests, concurrency):
+    """Runs a cold and a warm load test against an in-process server."""
+    server = await service.serve('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    targets = [f"/forecast?paths=10000&seed={seed}&model={model}" for model in ('gbm', 'student_t')
+               for seed in range(8)]
+    async with server:
+        for label in ('cold (16 distinct queries)', 'warm (all cached)'):
+            stats = await load_test('127.0.0.1', port, targets, num_requests, concurrency)
+            print(f"{label:<28} p50 {stats['p50_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms  "
+                  f"{stats['requests_per_sec']:8.1f} req/s  errors {stats['errors']}")
+        print(await service.handle('GET', '/stats', {}))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local forecast service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache"))
+    parser.add_argument('--start', default="2015-01-01")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES)
+    parser.add_argument('--load-test', action='store_true',
+                        help="Run a load test against synthetic data instead of serving.")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    if args.load_test:
+        from benchmark_suite import synthetic_market_data
+        service = ForecastService(*synthetic_market_data(10), max_workers=args.workers,
+                                  cache_entries=args.cache_entries)
+        try:
+            asyncio.run(_demo(service, args.requests, args.concurrency))
+        finally:
+            service.close()
+    else:
+        from market_data_store import MarketDataStore
+
+        store = MarketDataStore(args.cache_dir, offline=True)
+        service = ForecastService(store.get("SI=F", args.start), store.get("INR=X", args.start),
+                                  max_workers=args.workers, cache_entries=args.cache_entries)
+
+        async def serve_forever():
+            server = await service.serve(args.host, args.port)
+            print(f"Serving forecasts on http://{args.host}:{args.port}/forecast "
+                  f"(calibration {service.calibration_hash})")
+            async with server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(serve_forever())
+        finally:
+            service.close()
@@ -0,0 +1,253 @@
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MANIFEST_FILE = "run_manifest.json"
+PROFILE_TOP_FUNCTIONS = 15
+
+
+class StageRecord:
+    """
+    Measurements of one pipeline stage.
+
+    Attributes:
+        name (str): The stage name, e.g. 'simulate' or 'plot/plot_fan_chart'.
+        parent (str or None): The enclosing stage.
+        seconds (float): Wall time.
+        peak_memory_mb (float or None): Peak traced memory (tracemalloc) during the stage,
+            above what was already allocated when it started.
+        counters (dict): Work done, e.g. {'paths': 10000} or {'rows': 2700}.
+        profile (dict or None): Path of the saved cProfile stats and the top functions.
+    """
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.seconds = None
+        self.peak_memory_mb = None
+        self.counters = {}
+        self.profile = None
+
+    def count(self, **counters):
+        """Adds work counters to the stage, e.g. record.count(paths=10000)."""
+        self.counters.update(counters)
+
+    def to_dict(self):
+        """Returns the record as plain JSON types, with a '<counter>_per_sec' rate for every counter."""
+        throughput = {}
+        if self.seconds:
+            throughput = {f"{name}_per_sec": value / self.seconds for name, value in self.counters.items()
+                          if isinstance(value, (int, float, np.integer, np.floating))}
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'seconds': self.seconds,
+            'peak_memory_mb': self.peak_memory_mb,
+            'counters': {name: _plain(value) for name, value in self.counters.items()},
+            'throughput': {name: float(value) for name, value in throughput.items()},
+            'profile': self.profile,
+        }
+
+
+def _max_rss_mb():
+    """Returns the peak resident set size of the process in MB, or None where `resource` is unavailable."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+def _plain(value):
+    """Converts numpy scalars to Python numbers."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class RunInstrumentation:
+    """
+    Collects wall time, peak memory, work counters and optional profiles of pipeline stages.
+
+    Stages may nest. Peak memory comes from tracemalloc (NumPy buffers are
+    traced too); the peak is reset when a stage starts and folded into the
+    enclosing stage when it ends, so every stage reports its own high-water
+    mark above the memory in use when it started. Stages listed in
+    `profile_stages` also run under cProfile, and their stats are written as
+    .prof files next to the manifest.
+
+    Attributes:
+        trace_memory (bool): Whether tracemalloc is used (it slows pure-Python code down).
+        profile_stages (set): Names of the stages to profile.
+        profile_dir (str or None): Where .prof files go; None disables profiling.
+        stages (list): StageRecord of every finished stage, in completion order.
+    """
+
+    def __init__(self, trace_memory=True, profile_stages=(), profile_dir=None):
+        self.trace_memory = trace_memory
+        self.profile_stages = set(profile_stages)
+        self.profile_dir = profile_dir
+        self.stages = []
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._open = []  # [record, peak bytes seen so far, bytes at start] of the enclosing stages
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, **counters):
+        """
+        Measures the enclosed block as one stage.
+
+        Args:
+            name (str): The stage name.
+            **counters: Initial work counters (more can be added with record.count).
+
+        Yields:
+            StageRecord: The record being filled in.
+        """
+        record = StageRecord(name, self._open[-1][0].name if self._open else None)
+        record.count(**counters)
+        current = 0
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:
+                self._open[-1][1] = max(self._open[-1][1], peak)
+            tracemalloc.reset_peak()
+        self._open.append([record, 0, current])
+
+        profiler = None
+        if name in self.profile_stages and self.profile_dir is not None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                record.profile = self._save_profile(name, profiler)
+            _, peak, start = self._open.pop()
+            if self.trace_memory:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record.peak_memory_mb = (peak - start) / 2 ** 20
+                if self._open:
+                    self._open[-1][1] = max(self._open[-1][1], peak)
+            self.stages.append(record)
+
+    def record(self, name, seconds, peak_memory_mb=None, **counters):
+        """
+        Adds a stage measured elsewhere, e.g. a chart rendered in a worker process.
+
+        Args:
+            name (str): The stage name.
+            seconds (float): Wall time.
+            peak_memory_mb (float or None): Peak memory, if known.
+            **counters: Work counters.
+        """
+        record = StageRecord(name, self._open[-1][0].name if self._open else None)
+        record.seconds = seconds
+        record.peak_memory_mb = peak_memory_mb
+        record.count(**counters)
+        self.stages.append(record)
+
+    def _save_profile(self, name, profiler):
+        """Writes the cProfile stats of a stage and returns its manifest entry."""
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir)
+        path = os.path.join(self.profile_dir, name.replace('/', '_') + '.prof')
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_FUNCTIONS]
+        return {
+            'path': path,
+            'top_cumulative': [{'function': f"{filename}:{line}({function})", 'calls': calls,
+                                'cumulative_seconds': cumulative}
+                               for (filename, line, function), (_, calls, _, cumulative, _) in top],
+        }
+
+    def manifest(self, **extra):
+        """
+        Builds the run manifest.
+
+        Args:
+            **extra: Additional top-level entries, e.g. config=... or outputs=...
+
+        Returns:
+            dict: JSON-serializable description of the run.
+        """
+        manifest = {
+            'started_at': self.started_at.isoformat(),
+            'total_seconds': time.perf_counter() - self._started,
+            'max_rss_mb': _max_rss_mb(),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'numpy': np.__version__,
+            },
+            'stages': [record.to_dict() for record in self.stages],
+        }
+        manifest.update(extra)
+        return manifest
+
+    def write_manifest(self, output_dir, **extra):
+        """
+        Writes the run manifest as JSON.
+
+        Args:
+            output_dir (str): Directory of the manifest (next to executive_summary.txt).
+            **extra: Additional top-level entries.
+
+        Returns:
+            str: Path of the manifest file.
+        """
+        from result_store import _to_jsonable
+
+        path = os.path.join(output_dir, MANIFEST_FILE)
+        with open(path, 'w') as f:
+            json.dump(_to_jsonable(self.manifest(**extra)), f, indent=2, default=str)
+        return path
+
+    def close(self):
+        """Stops tracemalloc if this instance started it."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+
+if __name__ == '__main__':
+    # Example: instrument a small synthetic pipeline and print the manifest
+    import tempfile
+
+    from monte_carlo_simulator import run_monte_carlo_simulation
+    from analyzer import analyze_simulation_results
+
+    output_dir = tempfile.mkdtemp()
+    instrumentation = RunInstrumentation(profile_stages={'analyze'}, profile_dir=os.path.join(output_dir, "profiles"))
+    with instrumentation.stage('pipeline'):
+        with instrumentation.stage('simulate', paths=50000) as stage:
+            result = run_monte_carlo_simulation(80.0, 0.0003, 0.015, num_simulations=50000, rng=0,
+                                                as_dataframe=False)
+            stage.count(bytes=result.paths.nbytes)
+        with instrumentation.stage('analyze', paths=50000):
+            analyze_simulation_results(result, 80.0)
+    path = instrumentation.write_manifest(output_dir, config={'num_simulations': 50000})
+    instrumentation.close()
+
+    with open(path) as f:
+        for stage in json.load(f)['stages']:
+            print(f"{stage['name']:<10} {stage['seconds']:.3f}s  peak {stage['peak_memory_mb']:.1f} MB  "
+                  f"{stage['throughput']}")
@@ -1,12 +1,21 @@
 import os
+import numpy as np
 import pandas as pd
 
 # Import project modules
-from data_fetcher import fetch_silver_data, fetch_inr_data
+from fetch_pipeline import fetch_market_data
+from market_data_store import MarketDataStore
 from data_processor import process_data
-from monte_carlo_simulator import run_monte_carlo_simulation
+from monte_carlo_simulator import run_monte_carlo_simulation, calibrate_model
+from bootstrap_simulator import BlockBootstrapModel
 from analyzer import analyze_simulation_results
-import visualizer as viz
+from adaptive_simulator import run_adaptive_simulation
+from result_store import save_simulation_result, SimulationStore
+from summary_bands import compute_summary_bands
+from render_pipeline import render_charts, standard_chart_jobs, fingerprint
+from instrumentation import RunInstrumentation
+from artifact_cache import ArtifactCache, artifact_key
+from reporting import generate_executive_summary
 
 # --- Configuration ---
 SILVER_TICKER = "SI=F"
@@ -15,13 +24,37 @@ START_DATE = "2015-01-01"
 END_DATE = "2025-12-30" # As per prompt, but will fetch up to today
 NUM_SIMULATIONS = 10000
 FORECAST_PERIOD = 252  # 1 year of trading days
+VARIANCE_REDUCTION = None  # e.g. 'antithetic', 'sobol' or ('antithetic', 'control_variate'); GBM only
+SIMULATION_CHECKPOINTS = None  # None for every day, or 'weekly' / 'monthly' / a list of days
+SIMULATION_MODEL = None  # None for GBM, 'student_t', 'garch', 'merton' or 'bootstrap' (historical returns)
+BOOTSTRAP_BLOCK_LENGTH = 20  # Mean block length (days) of the stationary bootstrap
+ADAPTIVE_TOLERANCES = None  # e.g. {'VaR_99': 0.005, 'CVaR_99': 0.005}: simulate until these half-widths are met
+ADAPTIVE_MAX_PATHS = 2000000  # Path budget of the adaptive mode
+ADAPTIVE_MAX_SECONDS = 120  # Time budget of the adaptive mode
+ANALYSIS_OPTIONS = {'bootstrap_samples': 1000, 'path_metrics': True}  # VaR/CVaR intervals and path risk
+RANDOM_SEED = None  # None draws a fresh seed, which is recorded in the result metadata
+EXPORT_CSV = False  # Also write the (large) CSV dump of every path
 
 # --- Output Directories ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
 VISUALIZATIONS_DIR = os.path.join(OUTPUT_DIR, "visualizations")
+RESULTS_STORE_DIR = os.path.join(OUTPUT_DIR, "simulation_results")
 RESULTS_CSV_PATH = os.path.join(OUTPUT_DIR, "simulation_results.csv")
 SUMMARY_REPORT_PATH = os.path.join(OUTPUT_DIR, "executive_summary.txt")
+PROFILES_DIR = os.path.join(OUTPUT_DIR, "profiles")
+
+# --- Instrumentation ---
+TRACE_MEMORY = True  # Peak memory per stage via tracemalloc (slows pure-Python stages somewhat)
+PROFILE_STAGES = ()  # Stages to run under cProfile, e.g. ('simulate', 'visualize')
+
+# --- Market Data Cache ---
+DATA_CACHE_DIR = os.path.join(SCRIPT_DIR, "data_cache")
+# Memoized stage outputs, keyed by a hash of their inputs, parameters, seed and code
+ARTIFACT_CACHE_DIR = os.path.join(SCRIPT_DIR, "artifacts")
+ARTIFACT_CACHE_MAX_BYTES = 2 * 2 ** 30  # Least recently used artifacts are evicted beyond this size
+USE_ARTIFACT_CACHE = True
+OFFLINE_MODE = False  # Serve market data purely from DATA_CACHE_DIR
 
 def create_output_directories():
     """Creates the necessary output directories if they don't exist."""
@@ -30,62 +63,73 @@ def create_output_directories():
     if not os.path.exists(VISUALIZATIONS_DIR):
         os.makedirs(VISUALIZATIONS_DIR)
 
-def generate_executive_summary(historical_stats, analysis):
-    """Generates a formatted string for the executive summary report."""
-    summary = f"""
-# Executive Summary: Monte Carlo Simulation of Silver Prices in INR
-
-## 1. Historical Analysis (2015 - Present)
-- **Annualized Volatility:** {historical_stats['annualized_volatility']:.2%}
-- **Mean Daily Return:** {historical_stats['mean_daily_return']:.5f}
-- **Maximum Drawdown:** {historical_stats['max_drawdown']:.2%}
-- **Sharpe Ratio:** {historical_stats['sharpe_ratio']:.2f}
-- **Latest Price (as of analysis):** {historical_stats['latest_price']:.2f} INR/Gram
-
-## 2. Monte Carlo Simulation Results (1-Year Forecast)
-Based on {NUM_SIMULATIONS} simulations over {FORECAST_PERIOD} trading days:
-
-### Price Predictions:
-- **Mean Predicted Price:** {analysis['price_predictions']['mean_predicted_price']:.2f} INR/Gram
-- **Median Predicted Price:** {analysis['price_predictions']['median_predicted_price']:.2f} INR/Gram
-- **Confidence Interval (90%):** The price is expected to be between {analysis['price_predictions']['5th_percentile']:.2f} and {analysis['price_predictions']['95th_percentile']:.2f} INR/Gram.
-
-### Risk Assessment:
-- **Value at Risk (VaR 95%):** There is a 5% chance of losing at least {-analysis['risk_metrics']['VaR_95']:.2%} of the investment.
-- **Conditional VaR (CVaR 95%):** In the worst 5% of scenarios, the average loss is {-analysis['risk_metrics']['CVaR_95']:.2%}.
-- **Probability of Loss:** There is a {analysis['risk_metrics']['prob_loss']:.2%} chance the price will be lower than the current price in one year.
-
-### Potential Upside:
-- **Probability of >10% Gain:** {analysis['risk_metrics']['prob_increase_10']:.2%}
-- **Probability of >20% Gain:** {analysis['risk_metrics']['prob_increase_20']:.2%}
-
-## 3. Investment Recommendations & Insights
-- **Expected Return:** The simulation forecasts an expected return of {analysis['statistical_summary']['expected_return']:.2%} over the next year.
-- **Volatility:** The forecasted price distribution shows a standard deviation of {analysis['statistical_summary']['std_dev_forecast']:.2f}, indicating the potential range of outcomes.
-- **Insight:** Based on the historical trend and simulation, [Your interpretation here, e.g., "silver shows a positive expected return, but investors should be aware of the significant downside risk as indicated by the VaR and the wide confidence interval."]
-
-This analysis is based on historical data and models with inherent assumptions. It should not be considered as financial advice.
-"""
-    return summary.strip()
-
-
 def main():
     """Main function to run the entire data science project."""
     print("Starting Monte Carlo Simulation for Silver Price...\n")
     create_output_directories()
+    instrumentation = RunInstrumentation(trace_memory=TRACE_MEMORY, profile_stages=PROFILE_STAGES,
+                                         profile_dir=PROFILES_DIR)
+    cache = ArtifactCache(ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_BYTES, enabled=USE_ARTIFACT_CACHE)
+    run_info = {}
+    try:
+        run_pipeline(instrumentation, run_info, cache)
+    finally:
+        run_info['artifact_cache'] = cache_stats = cache.stats()
+        if cache_stats['hits'] + cache_stats['misses']:
+            uncacheable = sum(stage['uncacheable'] for stage in cache_stats['stages'].values())
+            print(f"Artifact cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), "
+                  f"{uncacheable} uncacheable (no RANDOM_SEED), "
+                  f"{sum(stage['seconds_saved'] for stage in cache_stats['stages'].values()):.2f}s saved")
+        manifest_path = instrumentation.write_manifest(OUTPUT_DIR, config={
+            'num_simulations': NUM_SIMULATIONS,
+            'forecast_period': FORECAST_PERIOD,
+            'variance_reduction': VARIANCE_REDUCTION,
+            'checkpoints': SIMULATION_CHECKPOINTS,
+            'model': SIMULATION_MODEL,
+            'adaptive_tolerances': ADAPTIVE_TOLERANCES,
+            'offline': OFFLINE_MODE,
+        }, **run_info)
+        instrumentation.close()
+        print(f"Run manifest saved to '{manifest_path}'")
+
+
+def _store_holds(directory, simulation_key):
+    """Returns True if the result store already holds the simulation with this artifact key."""
+    try:
+        return SimulationStore(directory).metadata.get('artifact_key') == simulation_key
+    except (OSError, ValueError):
+        return False
+
+
+def run_pipeline(instrumentation, run_info, cache):
+    """
+    Runs the pipeline stages, measuring each one with `instrumentation` and adding manifest entries to `run_info`.
 
+    Stage outputs are memoized in `cache` under keys derived from the raw-data
+    fingerprint, the upstream keys, the parameters, the seed and the source of
+    the producing modules, so an unchanged re-run skips every computation.
+    """
     # 1. Data Collection
     print("Step 1: Fetching historical data...")
-    silver_data = fetch_silver_data(SILVER_TICKER, START_DATE, END_DATE)
-    inr_data = fetch_inr_data(INR_TICKER, START_DATE, END_DATE)
+    with instrumentation.stage('fetch') as stage:
+        store = MarketDataStore(DATA_CACHE_DIR, offline=OFFLINE_MODE)
+        market_data, fetch_metrics = fetch_market_data([SILVER_TICKER, INR_TICKER], START_DATE, END_DATE, store=store)
+        stage.count(rows=sum(metrics['rows'] for metrics in fetch_metrics.values()), tickers=len(fetch_metrics))
+    silver_data = market_data[SILVER_TICKER]
+    inr_data = market_data[INR_TICKER]
     if silver_data is None or inr_data is None:
         print("Failed to fetch data. Exiting.")
         return
     print("Data fetched successfully.")
+    for ticker, metrics in fetch_metrics.items():
+        print(f"  - {ticker}: {metrics['rows']} rows in {metrics['seconds']:.2f}s ({metrics['attempts']} attempt(s))")
 
     # 2. Data Preprocessing & Analysis
     print("\nStep 2: Processing data and calculating historical metrics...")
-    processed_data, historical_stats = process_data(silver_data, inr_data)
+    with instrumentation.stage('process_data', rows=len(silver_data)):
+        process_key = artifact_key('process_data', ['data_processor'], fingerprint(silver_data, inr_data))
+        processed_data, historical_stats = cache.get_or_compute('process_data', process_key,
+                                                                lambda: process_data(silver_data, inr_data))
     if processed_data is None:
         print("Failed to process data. Exiting.")
         return
@@ -94,48 +138,153 @@ def main():
     print(f"  - Annualized Volatility: {historical_stats['annualized_volatility']:.2%}")
 
     # 3. Monte Carlo Simulation
-    print(f"\nStep 3: Running Monte Carlo simulation with {NUM_SIMULATIONS} paths...")
-    simulations = run_monte_carlo_simulation(
-        start_price=historical_stats['latest_price'],
-        drift=historical_stats['drift'],
-        volatility=historical_stats['std_dev'],
-        forecast_period=FORECAST_PERIOD,
-        num_simulations=NUM_SIMULATIONS
-    )
+    if ADAPTIVE_TOLERANCES:
+        print(f"\nStep 3: Running adaptive Monte Carlo simulation (targets {ADAPTIVE_TOLERANCES})...")
+    else:
+        print(f"\nStep 3: Running Monte Carlo simulation with {NUM_SIMULATIONS} paths...")
+    seed = RANDOM_SEED if RANDOM_SEED is not None else np.random.SeedSequence().entropy
+    with instrumentation.stage('calibrate_model'):
+        model_key = artifact_key('calibrate_model', ['monte_carlo_simulator', 'bootstrap_simulator'], process_key,
+                                 SIMULATION_MODEL, BOOTSTRAP_BLOCK_LENGTH)
+        if SIMULATION_MODEL == 'bootstrap':
+            model = cache.get_or_compute('calibrate_model', model_key, lambda: BlockBootstrapModel.calibrate(
+                processed_data['Log_Returns'], BOOTSTRAP_BLOCK_LENGTH))
+        elif SIMULATION_MODEL is not None:
+            model = cache.get_or_compute('calibrate_model', model_key, lambda: calibrate_model(
+                SIMULATION_MODEL, processed_data['Log_Returns']))
+        else:
+            model = None
+    # Without a fixed seed the simulation and everything derived from it never repeats
+    seeded = RANDOM_SEED is not None
+    simulation_modules = ['monte_carlo_simulator', 'bootstrap_simulator']
+    simulation_parameters = {'forecast_period': FORECAST_PERIOD, 'variance_reduction': VARIANCE_REDUCTION,
+                             'checkpoints': SIMULATION_CHECKPOINTS, 'seed': str(seed)}
+    if ADAPTIVE_TOLERANCES:
+        # Keep monthly checkpoints by default so the fan chart still has a time axis
+        with instrumentation.stage('simulate_adaptive') as stage:
+            simulation_key = artifact_key('simulate_adaptive', simulation_modules + ['adaptive_simulator', 'analyzer'],
+                                          model_key, simulation_parameters, ADAPTIVE_TOLERANCES,
+                                          ADAPTIVE_MAX_PATHS, ADAPTIVE_MAX_SECONDS, ANALYSIS_OPTIONS)
+            bands_key = artifact_key('summary_bands', ['summary_bands'], simulation_key)
+            adaptive = cache.get_or_compute('simulate_adaptive', simulation_key, lambda: run_adaptive_simulation(
+                start_price=historical_stats['latest_price'],
+                drift=historical_stats['drift'],
+                volatility=historical_stats['std_dev'],
+                forecast_period=FORECAST_PERIOD,
+                tolerances=ADAPTIVE_TOLERANCES,
+                max_paths=ADAPTIVE_MAX_PATHS,
+                max_seconds=ADAPTIVE_MAX_SECONDS,
+                seed=seed,
+                variance_reduction=VARIANCE_REDUCTION,
+                checkpoints=SIMULATION_CHECKPOINTS or 'monthly',
+                model=model,
+                analysis_options=ANALYSIS_OPTIONS
+            ), cacheable=seeded)
+            simulations, analysis_results = adaptive.result, adaptive.analysis
+            run_info['adaptive'] = adaptive.report
+            stage.count(paths=adaptive.report['paths_used'], batches=adaptive.report['batches'],
+                        path_days=simulations.paths.size)
+        num_simulations = adaptive.report['paths_used']
+        print(f"  - {num_simulations} paths in {adaptive.report['batches']} batches "
+              f"({adaptive.report['stopped_because']})")
+        for name, precision in adaptive.report['precision'].items():
+            print(f"  - {name}: {precision['estimate']:.4f} +/- {precision['half_width']:.4f} "
+                  f"(target {precision['tolerance']})")
+    else:
+        simulation_key = artifact_key('simulate', simulation_modules, model_key, simulation_parameters,
+                                      NUM_SIMULATIONS)
+        bands_key = artifact_key('summary_bands', ['summary_bands'], simulation_key)
+        analysis_key = artifact_key('analyze', ['analyzer'], simulation_key, ANALYSIS_OPTIONS)
+        # When every consumer of the paths is cached, the paths are neither simulated nor loaded
+        needs_paths = not (cache.contains('summary_bands', bands_key) and cache.contains('analyze', analysis_key)
+                           and _store_holds(RESULTS_STORE_DIR, simulation_key))
+        simulations = None
+        with instrumentation.stage('simulate', paths=NUM_SIMULATIONS) as stage:
+            if needs_paths:
+                simulations = cache.get_or_compute('simulate', simulation_key, lambda: run_monte_carlo_simulation(
+                    start_price=historical_stats['latest_price'],
+                    drift=historical_stats['drift'],
+                    volatility=historical_stats['std_dev'],
+                    forecast_period=FORECAST_PERIOD,
+                    num_simulations=NUM_SIMULATIONS,
+                    as_dataframe=False,
+                    variance_reduction=VARIANCE_REDUCTION,
+                    checkpoints=SIMULATION_CHECKPOINTS,
+                    rng=seed,
+                    model=model
+                ), cacheable=seeded)
+                stage.count(path_days=simulations.paths.size)
+        num_simulations = NUM_SIMULATIONS
+    with instrumentation.stage('summary_bands', paths=num_simulations):
+        bands = cache.get_or_compute('summary_bands', bands_key, lambda: compute_summary_bands(simulations),
+                                     cacheable=seeded)
     print("Simulation complete.")
 
     # 4. Analysis & Insights
     print("\nStep 4: Analyzing simulation results...")
-    analysis_results = analyze_simulation_results(simulations, historical_stats['latest_price'])
+    if not ADAPTIVE_TOLERANCES:
+        with instrumentation.stage('analyze', paths=num_simulations):
+            analysis_results = cache.get_or_compute('analyze', analysis_key, lambda: analyze_simulation_results(
+                simulations, historical_stats['latest_price'], **ANALYSIS_OPTIONS), cacheable=seeded)
     print("Analysis complete.")
     
-    # Save simulation results to CSV
-    simulations.to_csv(RESULTS_CSV_PATH)
-    print(f"  - Full simulation data saved to '{RESULTS_CSV_PATH}'")
+    # Save simulation results as a memory-mappable binary store
+    if _store_holds(RESULTS_STORE_DIR, simulation_key):
+        print(f"  - Simulation data in '{RESULTS_STORE_DIR}' is up to date")
+    else:
+        with instrumentation.stage('save_results', bytes=simulations.paths.nbytes):
+            save_simulation_result(simulations, RESULTS_STORE_DIR, metadata={
+                'seed': str(seed),
+                'artifact_key': simulation_key,
+                'parameters': {
+                    'drift': historical_stats['drift'],
+                    'volatility': historical_stats['std_dev'],
+                    'forecast_period': FORECAST_PERIOD,
+                    'num_simulations': num_simulations,
+                    'variance_reduction': VARIANCE_REDUCTION,
+                    'checkpoints': SIMULATION_CHECKPOINTS,
+                    'model': SIMULATION_MODEL,
+                },
+                'calibration': historical_stats,
+                'adaptive': run_info.get('adaptive'),
+            })
+        print(f"  - Full simulation data saved to '{RESULTS_STORE_DIR}'")
+    if EXPORT_CSV:
+        result_store = SimulationStore(RESULTS_STORE_DIR)
+        with instrumentation.stage('export_csv', rows=result_store.shape[0]):
+            result_store.export_csv(RESULTS_CSV_PATH)
+        print(f"  - CSV export saved to '{RESULTS_CSV_PATH}'")
 
     # 5. Visualization
     print("\nStep 5: Generating visualizations...")
-    viz.plot_historical_prices(processed_data, save_path=VISUALIZATIONS_DIR)
-    viz.plot_daily_returns_distribution(processed_data, save_path=VISUALIZATIONS_DIR)
-    viz.plot_rolling_volatility(processed_data, save_path=VISUALIZATIONS_DIR)
-    viz.plot_simulation_paths(simulations, analysis_results, save_path=VISUALIZATIONS_DIR)
-    viz.plot_final_price_distribution(analysis_results, save_path=VISUALIZATIONS_DIR)
-    viz.plot_fan_chart(simulations, save_path=VISUALIZATIONS_DIR)
-    viz.plot_pdf_and_cdf(analysis_results, save_path=VISUALIZATIONS_DIR)
+    chart_memory = {}
+    with instrumentation.stage('visualize') as stage:
+        chart_timings = render_charts(standard_chart_jobs(processed_data, analysis_results, bands),
+                                      save_path=VISUALIZATIONS_DIR,
+                                      peak_memory=chart_memory if TRACE_MEMORY else None)
+        for name, seconds in chart_timings.items():
+            cache.record('visualize', seconds is None, seconds or 0.0)
+            if seconds is not None:
+                instrumentation.record(f"plot/{name}", seconds, chart_memory.get(name))
+        skipped = [name for name, seconds in chart_timings.items() if seconds is None]
+        stage.count(charts=len(chart_timings) - len(skipped), skipped=len(skipped))
+    if skipped:
+        print(f"  - {len(skipped)} chart(s) unchanged since the last run, skipped")
     print(f"Visualizations saved in '{VISUALIZATIONS_DIR}' directory.")
 
     # 6. Reporting
     print("\nStep 6: Generating executive summary...")
-    executive_summary = generate_executive_summary(historical_stats, analysis_results)
-    
-    with open(SUMMARY_REPORT_PATH, 'w') as f:
-        f.write(executive_summary)
-    
+    with instrumentation.stage('report'):
+        executive_summary = generate_executive_summary(historical_stats, analysis_results,
+                                                       num_simulations=num_simulations,
+                                                       forecast_period=FORECAST_PERIOD)
+        with open(SUMMARY_REPORT_PATH, 'w') as f:
+            f.write(executive_summary)
+
     print(f"Executive summary saved to '{SUMMARY_REPORT_PATH}'")
     print("\n--- Executive Summary ---")
     print(executive_summary)
     print("\nProject finished successfully!")
 
-
 if __name__ == '__main__':
     main()
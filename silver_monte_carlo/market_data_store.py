@@ -0,0 +1,314 @@
+import glob
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+class MarketDataSource:
+    """
+    Interface for anything that can provide daily bars for a ticker.
+
+    Subclasses implement `fetch`, returning a DataFrame indexed by date with
+    price columns such as 'Open', 'High', 'Low', 'Close' and 'Volume', or None
+    if nothing could be fetched.
+    """
+
+    name = "source"
+
+    def fetch(self, ticker, start_date, end_date):
+        """
+        Fetches daily bars for [start_date, end_date).
+
+        Args:
+            ticker (str): The ticker symbol.
+            start_date (str): The first date, in "YYYY-MM-DD" format.
+            end_date (str): The end date (exclusive), in "YYYY-MM-DD" format.
+
+        Returns:
+            pd.DataFrame: The bars, or None if there are none in the range.
+
+        Raises:
+            Exception: Any error (network, provider) is left to the caller.
+        """
+        raise NotImplementedError
+
+
+class YahooFinanceSource(MarketDataSource):
+    """Fetches daily bars from Yahoo Finance through yfinance."""
+
+    name = "yahoo"
+
+    def fetch(self, ticker, start_date, end_date):
+        import yfinance as yf
+
+        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+        if data is None or data.empty:
+            return None
+        return data
+
+
+class InMemorySource(MarketDataSource):
+    """
+    Serves bars from DataFrames held in memory; a stand-in for Yahoo Finance in tests.
+
+    It can also simulate provider latency and transient failures, and tracks
+    how many fetches were in flight at the same time, to exercise the
+    concurrent fetch pipeline offline.
+
+    Attributes:
+        frames (dict): Ticker -> DataFrame of all bars the source knows about.
+        latency (float or dict): Seconds every fetch takes, globally or per ticker.
+        failures (dict): Ticker -> number of initial fetches that raise ConnectionError.
+        calls (list): (ticker, start_date, end_date) of every fetch, to check what was requested.
+        timings (list): (ticker, start_time, end_time) of every fetch.
+        max_in_flight (int): Peak number of concurrent fetches seen.
+    """
+
+    name = "memory"
+
+    def __init__(self, frames, latency=0.0, failures=None):
+        self.frames = frames
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.timings = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, cache_dir, **kwargs):
+        """
+        Builds a source that replays the files of a MarketDataStore cache directory.
+
+        Args:
+            cache_dir (str): A directory previously filled by MarketDataStore.
+            **kwargs: Passed on to InMemorySource (latency, failures).
+
+        Returns:
+            InMemorySource: A source serving every cached ticker.
+        """
+        store = MarketDataStore(cache_dir, offline=True)
+        frames = {}
+        for path in glob.glob(os.path.join(cache_dir, "*.npz")):
+            frame, metadata = store.load_file(path)
+            frames[metadata['ticker']] = frame
+        return cls(frames, **kwargs)
+
+    def fetch(self, ticker, start_date, end_date):
+        with self._lock:
+            self.calls.append((ticker, start_date, end_date))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            should_fail = self.failures.get(ticker, 0) > 0
+            if should_fail:
+                self.failures[ticker] -= 1
+        started = time.perf_counter()
+        try:
+            latency = self.latency.get(ticker, 0.0) if isinstance(self.latency, dict) else self.latency
+            if latency:
+                time.sleep(latency)
+            if should_fail:
+                raise ConnectionError(f"Simulated failure for {ticker}")
+            frame = self.frames.get(ticker)
+            if frame is None:
+                return None
+            selected = frame.loc[(frame.index >= pd.Timestamp(start_date)) & (frame.index < pd.Timestamp(end_date))]
+            return selected.copy() if not selected.empty else None
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.timings.append((ticker, started, time.perf_counter()))
+
+
+def _flatten_columns(frame):
+    """Drops the ticker level yfinance adds to its columns, leaving 'Close', 'Open', ..."""
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    return frame
+
+
+class MarketDataStore:
+    """
+    On-disk, per-ticker cache of daily bars with incremental top-up.
+
+    Every ticker is stored as one columnar `.npz` file holding the dates, one
+    array per price column and the date range that has already been requested
+    from the source. A request only fetches the parts of its range that are
+    not covered yet and appends them to the file.
+
+    Staleness rules: the range after the covered end is only topped up once
+    the cache is older than `max_age`, so repeated runs on the same day are
+    served purely from disk; the last `refetch_days` cached days are fetched
+    again on every top-up so a partial (intraday) bar is replaced by the final
+    one. In offline mode the source is never contacted.
+
+    Attributes:
+        cache_dir (str): Directory holding the `.npz` files.
+        source (MarketDataSource): Where missing bars come from.
+        offline (bool): If True, serve only from the cache.
+        max_age (timedelta): How long a cache is considered fresh.
+        refetch_days (int): Number of trailing cached days refreshed on every top-up.
+    """
+
+    def __init__(self, cache_dir, source=None, offline=False, max_age=timedelta(hours=12), refetch_days=3):
+        self.cache_dir = cache_dir
+        self.source = source if source is not None else YahooFinanceSource()
+        self.offline = offline
+        self.max_age = max_age
+        self.refetch_days = refetch_days
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', ticker) + ".npz")
+
+    def load(self, ticker):
+        """
+        Reads the cached bars of a ticker.
+
+        Returns:
+            tuple: (DataFrame of bars, metadata dict), or (None, None) if nothing is cached.
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None, None
+        return self.load_file(path)
+
+    def load_file(self, path):
+        """
+        Reads one cache file.
+
+        Files written before the ticker was stored fall back to the file name,
+        which is the ticker with characters other than letters, digits, '_',
+        '.' and '-' replaced by '_'.
+
+        Returns:
+            tuple: (DataFrame of bars, metadata dict).
+        """
+        with np.load(path, allow_pickle=False) as stored:
+            columns = [str(c) for c in stored['columns']]
+            frame = pd.DataFrame({c: stored['col_' + c] for c in columns},
+                                 index=pd.DatetimeIndex(stored['dates'].astype('datetime64[ns]'), name='Date'))
+            metadata = {
+                'ticker': str(stored['ticker']) if 'ticker' in stored.files else os.path.splitext(os.path.basename(path))[0],
+                'covered_start': pd.Timestamp(str(stored['covered_start'])),
+                'covered_end': pd.Timestamp(str(stored['covered_end'])),
+                'fetched_at': pd.Timestamp(str(stored['fetched_at'])),
+            }
+        return frame, metadata
+
+    def save(self, ticker, frame, metadata):
+        """Writes the bars and coverage metadata of a ticker, replacing the previous file."""
+        frame = _flatten_columns(frame)
+        arrays = {'col_' + c: frame[c].to_numpy(dtype=np.float64) for c in frame.columns}
+        path = self._path(ticker)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path,
+                 ticker=ticker,
+                 dates=frame.index.to_numpy(dtype='datetime64[ns]').astype(np.int64),
+                 columns=np.array(list(frame.columns), dtype=str),
+                 covered_start=str(metadata['covered_start'].date()),
+                 covered_end=str(metadata['covered_end'].date()),
+                 fetched_at=metadata['fetched_at'].isoformat(),
+                 **arrays)
+        os.replace(tmp_path, path)
+
+    def _missing_ranges(self, metadata, start, end, now):
+        """Returns the (start, end) ranges of the request that must come from the source."""
+        if metadata is None:
+            return [(start, end)]
+        ranges = []
+        if start < metadata['covered_start']:
+            ranges.append((start, metadata['covered_start']))
+        # A cache fetched "up to today" is only topped up once it is stale; a gap after a
+        # historical end date (covered_end before the day it was fetched) is always filled.
+        # The top-up starts at covered_end even when the request starts later, because the
+        # coverage is one contiguous interval and is extended over the whole gap.
+        reached_fetch_day = metadata['covered_end'] >= metadata['fetched_at'].normalize()
+        stale = now - metadata['fetched_at'] >= self.max_age
+        if end > metadata['covered_end'] and (stale or not reached_fetch_day):
+            ranges.append((metadata['covered_end'] - pd.Timedelta(days=self.refetch_days), end))
+        return ranges
+
+    def get(self, ticker, start_date, end_date=None):
+        """
+        Returns the bars of a ticker for [start_date, end_date), fetching only what is missing.
+
+        Args:
+            ticker (str): The ticker symbol.
+            start_date (str): The first date, in "YYYY-MM-DD" format.
+            end_date (str): The end date (exclusive). If None, fetches up to the current date.
+
+        Returns:
+            pd.DataFrame: The bars, or None if there is no data for the range.
+        """
+        now = pd.Timestamp(datetime.now())
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date) if end_date is not None else now.normalize()
+        # Nothing beyond today can be fetched, so never mark it as covered
+        end = min(end, now.normalize() + pd.Timedelta(days=1))
+
+        cached, metadata = self.load(ticker)
+        missing = [] if self.offline else self._missing_ranges(metadata, start, end, now)
+
+        new_frames = []
+        failed = False
+        for range_start, range_end in missing:
+            try:
+                fetched = self.source.fetch(ticker, range_start.strftime("%Y-%m-%d"),
+                                            range_end.strftime("%Y-%m-%d"))
+            except Exception as e:
+                print(f"Error fetching {ticker} from {self.source.name}: {e}")
+                failed = True
+                continue
+            if fetched is not None and not fetched.empty:
+                new_frames.append(_flatten_columns(fetched))
+
+        # A failed fetch leaves the coverage untouched, so the range is retried next time
+        if missing and not failed:
+            frames = ([cached] if cached is not None else []) + new_frames
+            if frames:
+                combined = pd.concat(frames)
+                combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+                metadata = {
+                    'covered_start': min(start, metadata['covered_start']) if metadata else start,
+                    'covered_end': max(end, metadata['covered_end']) if metadata else end,
+                    'fetched_at': now,
+                }
+                self.save(ticker, combined, metadata)
+                cached = combined
+        elif new_frames:
+            combined = pd.concat(([cached] if cached is not None else []) + new_frames)
+            cached = combined[~combined.index.duplicated(keep='last')].sort_index()
+
+        if cached is None:
+            print(f"No cached data for ticker {ticker}" + (" (offline mode)." if self.offline else "."))
+            return None
+
+        selected = cached.loc[(cached.index >= start) & (cached.index < end)]
+        if selected.empty:
+            print(f"No data found for ticker {ticker} from {start_date} to {end_date}.")
+            return None
+        return selected
+
+
+if __name__ == '__main__':
+    # Example usage with a fake source, so no network is needed
+    import tempfile
+
+    dates = pd.bdate_range("2015-01-01", "2024-12-31")
+    prices = 15 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.015, len(dates))))
+    fake_source = InMemorySource({"SI=F": pd.DataFrame({"Close": prices}, index=dates)})
+
+    store = MarketDataStore(tempfile.mkdtemp(), source=fake_source, max_age=timedelta(0))
+    store.get("SI=F", "2015-01-01", "2024-01-01")
+    store.get("SI=F", "2015-01-01", "2025-01-01")
+    print("Source calls:", fake_source.calls)
+    print(store.get("SI=F", "2023-12-20", "2024-01-10"))
@@ -1,7 +1,636 @@
 import numpy as np
-import pandas as pd
 
-def run_monte_carlo_simulation(start_price, drift, volatility, forecast_period=252, num_simulations=10000):
+
+VARIANCE_REDUCTION_SCHEMES = ('antithetic', 'moment_matching', 'control_variate', 'sobol')
+
+# Named sparse grids, as spacing in trading days
+CHECKPOINT_SPACINGS = {'weekly': 5, 'monthly': 21}
+
+
+class SimulationResult:
+    """
+    Lightweight, ndarray-backed container for simulated price paths.
+
+    The paths are kept in a single (forecast_period, num_simulations) array so
+    that large runs avoid the extra copy a DataFrame would need. A DataFrame
+    is only built when `to_dataframe` is called.
+
+    Attributes:
+        paths (np.ndarray): Simulated prices; each column is one path.
+        start_price (float): The starting price of the asset.
+        num_replicates (int or None): Number of independent, equally sized column blocks
+            (used by the analyzer to estimate standard errors). None means paths are i.i.d.
+        control_mean (float or None): Known expected terminal price, if the analyzer should
+            apply it as a control variate.
+        checkpoints (np.ndarray or None): The trading day of every row for sparse (checkpoint
+            or terminal-only) runs. None means the full daily grid 0..forecast_period-1.
+    """
+
+    def __init__(self, paths, start_price, num_replicates=None, control_mean=None, checkpoints=None):
+        self.paths = paths
+        self.start_price = start_price
+        self.num_replicates = num_replicates
+        self.control_mean = control_mean
+        self.checkpoints = checkpoints
+
+    @property
+    def days(self):
+        """np.ndarray: The trading day of every row of `paths`."""
+        if self.checkpoints is None:
+            return np.arange(self.paths.shape[0])
+        return self.checkpoints
+
+    @property
+    def shape(self):
+        """tuple: (forecast_period, num_simulations)."""
+        return self.paths.shape
+
+    @property
+    def dtype(self):
+        """np.dtype: The floating point type of the stored paths."""
+        return self.paths.dtype
+
+    @property
+    def final_prices(self):
+        """np.ndarray: The simulated price of every path on the last day."""
+        return self.paths[-1]
+
+    def to_dataframe(self):
+        """
+        Wraps the paths in a DataFrame without copying the underlying array.
+
+        Returns:
+            pd.DataFrame: A DataFrame where each column represents a simulated price path.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.paths, index=self.days, copy=False)
+
+
+def gbm_expected_price(start_price, drift, volatility, forecast_period=252):
+    """
+    Returns the closed-form expected terminal price of the GBM simulated by this module.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The drift component of the asset's daily log returns.
+        volatility (float): The volatility of the asset's daily log returns.
+        forecast_period (int): The number of trading days to forecast (including day 0).
+
+    Returns:
+        float: E[S_T] = start_price * exp((drift + volatility**2 / 2) * (forecast_period - 1)).
+    """
+    return start_price * np.exp((drift + 0.5 * volatility ** 2) * (forecast_period - 1))
+
+
+def replicate_boundaries(num_simulations, num_replicates):
+    """
+    Splits the path columns into contiguous, nearly equal blocks with even boundaries.
+
+    Even boundaries keep antithetic pairs inside a single block.
+
+    Args:
+        num_simulations (int): The number of simulated paths.
+        num_replicates (int): The number of blocks.
+
+    Returns:
+        np.ndarray: num_replicates + 1 column offsets, starting at 0 and ending at num_simulations.
+    """
+    bounds = np.linspace(0, num_simulations, num_replicates + 1).astype(np.int64)
+    bounds[1:-1] -= bounds[1:-1] % 2
+    return bounds
+
+
+def resolve_checkpoints(checkpoints, forecast_period=252):
+    """
+    Turns a checkpoint specification into a sorted array of trading days.
+
+    Args:
+        checkpoints (str, sequence or None): None for the full daily grid, 'terminal' for
+            day 0 and the horizon only, 'weekly' or 'monthly', or explicit trading days.
+        forecast_period (int): The number of trading days to forecast (including day 0).
+
+    Returns:
+        np.ndarray or None: The simulated days, always including 0 and forecast_period - 1,
+            or None for the full daily grid.
+    """
+    if checkpoints is None:
+        return None
+    horizon = forecast_period - 1
+    if isinstance(checkpoints, str):
+        if checkpoints == 'terminal':
+            checkpoints = []
+        elif checkpoints in CHECKPOINT_SPACINGS:
+            checkpoints = np.arange(0, horizon, CHECKPOINT_SPACINGS[checkpoints])
+        else:
+            raise ValueError(f"Unknown checkpoint grid '{checkpoints}'; expected 'terminal', "
+                             f"{', '.join(repr(name) for name in CHECKPOINT_SPACINGS)} or a list of days.")
+    days = np.unique(np.concatenate([[0], np.asarray(checkpoints, dtype=np.int64), [horizon]]))
+    if days[0] < 0 or days[-1] > horizon:
+        raise ValueError(f"Checkpoints must lie between 0 and {horizon}.")
+    return days
+
+
+def _parse_schemes(variance_reduction):
+    """Normalizes the variance_reduction argument to a set of scheme names."""
+    if variance_reduction is None:
+        return set()
+    if isinstance(variance_reduction, str):
+        variance_reduction = (variance_reduction,)
+    schemes = set(variance_reduction)
+    unknown = schemes - set(VARIANCE_REDUCTION_SCHEMES)
+    if unknown:
+        raise ValueError(f"Unknown variance reduction scheme(s) {sorted(unknown)}; "
+                         f"choose from {VARIANCE_REDUCTION_SCHEMES}.")
+    if 'sobol' in schemes and schemes & {'antithetic', 'moment_matching'}:
+        raise ValueError("'sobol' cannot be combined with 'antithetic' or 'moment_matching'.")
+    return schemes
+
+
+def _brownian_bridge_schedule(num_steps):
+    """
+    Returns the Brownian bridge construction order for times 1..num_steps.
+
+    The terminal point comes first, then midpoints of ever finer intervals, so
+    the leading (best distributed) quasi-random dimensions drive the coarse
+    shape of each path.
+
+    Returns:
+        list: (time, left_time, right_time) tuples; right_time is None for the terminal point.
+    """
+    schedule = [(num_steps, 0, None)]
+    intervals = [(0, num_steps)]
+    while intervals:
+        left, right = intervals.pop(0)
+        if right - left > 1:
+            middle = (left + right) // 2
+            schedule.append((middle, left, right))
+            intervals += [(left, middle), (middle, right)]
+    return schedule
+
+
+def _fill_sobol_brownian_paths(paths, rng, num_replicates):
+    """
+    Writes Brownian motion values W_t (unit daily variance) into `paths`.
+
+    Uses scrambled Sobol points with Brownian bridge ordering. Every replicate
+    block of columns gets an independent scramble, so the blocks are
+    i.i.d. randomized QMC estimates.
+    """
+    from scipy.stats import norm, qmc
+
+    num_steps = paths.shape[0] - 1
+    schedule = _brownian_bridge_schedule(num_steps)
+    bounds = replicate_boundaries(paths.shape[1], num_replicates)
+    eps = np.finfo(np.float64).eps
+
+    paths[0] = 0
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        sampler = qmc.Sobol(d=num_steps, scramble=True, seed=rng)
+        uniforms = sampler.random(last - first)
+        normals = norm.ppf(np.clip(uniforms, eps, 1 - eps)).T
+        block = paths[:, first:last]
+        for k, (t, left, right) in enumerate(schedule):
+            if right is None:
+                block[t] = np.sqrt(t) * normals[k]
+            else:
+                span = right - left
+                block[t] = (((right - t) * block[left] + (t - left) * block[right]) / span
+                            + np.sqrt((t - left) * (right - t) / span) * normals[k])
+
+
+def simulate_gbm_paths(start_price, drift, volatility, forecast_period=252, num_simulations=10000,
+                       dtype=np.float64, rng=None, variance_reduction=None, num_replicates=16,
+                       checkpoints=None):
+    """
+    Simulates Geometric Brownian Motion price paths in log space.
+
+    The random shocks are drawn straight into one preallocated buffer, scaled,
+    accumulated with a single cumulative sum along the time axis and
+    exponentiated in place. Peak memory is therefore roughly one
+    forecast_period x num_simulations array of `dtype` (about 2 GB for
+    252 days x 1M paths in float64, half that in float32). Antithetic
+    sampling needs an extra half array for the shared draws.
+
+    With `checkpoints`, only the given days are simulated, using the exact GBM
+    increment between consecutive checkpoints (drift * dt, volatility * sqrt(dt)).
+    'terminal' samples the horizon distribution directly in O(num_simulations),
+    about forecast_period times less work than the daily grid, which is all the
+    analyzer needs; a weekly or monthly grid is enough for the fan chart and
+    the sample-path plot.
+
+    Variance reduction schemes (any combination, except that 'sobol' stands alone
+    or with 'control_variate'):
+        - 'antithetic': paths come in pairs (2i, 2i+1) driven by opposite shocks.
+        - 'moment_matching': shocks of each day are rescaled to exactly mean 0 and
+          variance 1 within every replicate block (blocks of fewer than two paths,
+          when num_replicates exceeds num_simulations / 2, are left as drawn).
+        - 'control_variate': the result carries the closed-form E[S_T], which
+          `analyze_simulation_results` uses as a control variate.
+        - 'sobol': scrambled Sobol quasi-random draws with Brownian bridge ordering,
+          randomized independently per replicate block. Use a power of two for
+          num_simulations / num_replicates to keep the Sobol balance properties.
+          Only available on the full daily grid.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The drift component of the asset's daily log returns.
+        volatility (float): The volatility of the asset's daily log returns.
+        forecast_period (int): The number of trading days to forecast (including day 0).
+        num_simulations (int): The number of simulations to run.
+        dtype (np.dtype): np.float64 (default) or np.float32 to halve memory use.
+        rng (np.random.Generator, int or None): Random generator or seed. None draws fresh entropy.
+        variance_reduction (str, sequence or None): Scheme name(s) from VARIANCE_REDUCTION_SCHEMES.
+        num_replicates (int): Number of independent blocks for 'moment_matching' and 'sobol'.
+        checkpoints (str, sequence or None): Sparse grid of days, see `resolve_checkpoints`.
+
+    Returns:
+        SimulationResult: The simulated paths; row 0 holds the start price.
+    """
+    rng = np.random.default_rng(rng)
+    dtype = np.dtype(dtype)
+    schemes = _parse_schemes(variance_reduction)
+    days = resolve_checkpoints(checkpoints, forecast_period)
+    if days is not None and 'sobol' in schemes:
+        raise ValueError("'sobol' is only available on the full daily grid.")
+
+    num_rows = forecast_period if days is None else days.size
+    paths = np.empty((num_rows, num_simulations), dtype=dtype)
+    if days is None and not schemes - {'control_variate'}:
+        rng.standard_normal(out=paths, dtype=dtype)
+        paths *= dtype.type(volatility)
+        paths += dtype.type(drift)
+        paths[0] = 0
+
+        # Cumulative log returns -> prices, all in the same buffer
+        np.cumsum(paths, axis=0, out=paths)
+    elif 'sobol' in schemes:
+        _fill_sobol_brownian_paths(paths, rng, num_replicates)
+        paths *= dtype.type(volatility)
+        paths += (drift * np.arange(forecast_period, dtype=dtype))[:, None]
+    else:
+        shocks = paths[1:]
+        if 'antithetic' in schemes:
+            draws = rng.standard_normal((num_rows - 1, (num_simulations + 1) // 2), dtype=dtype)
+            shocks[:, 0::2] = draws
+            shocks[:, 1::2] = -draws[:, :num_simulations // 2]
+            del draws
+        else:
+            rng.standard_normal(out=shocks, dtype=dtype)
+        if 'moment_matching' in schemes:
+            bounds = replicate_boundaries(num_simulations, num_replicates)
+            for first, last in zip(bounds[:-1], bounds[1:]):
+                # A block of fewer than two paths has no spread to match and is left as drawn
+                if last - first < 2:
+                    continue
+                block = shocks[:, first:last]
+                block -= block.mean(axis=1, keepdims=True)
+                block /= block.std(axis=1, keepdims=True)
+        if days is None:
+            shocks *= dtype.type(volatility)
+            shocks += dtype.type(drift)
+        else:
+            steps = np.diff(days)
+            shocks *= (volatility * np.sqrt(steps)).astype(dtype)[:, None]
+            shocks += (drift * steps).astype(dtype)[:, None]
+        paths[0] = 0
+        np.cumsum(paths, axis=0, out=paths)
+
+    np.exp(paths, out=paths)
+    paths *= dtype.type(start_price)
+
+    result = SimulationResult(paths, start_price, checkpoints=days)
+    if 'moment_matching' in schemes or 'sobol' in schemes:
+        result.num_replicates = num_replicates
+    if 'control_variate' in schemes:
+        result.control_mean = gbm_expected_price(start_price, drift, volatility, forecast_period)
+    return result
+
+
+def _row_chunks(num_rows, num_cols, max_elements=2 ** 22):
+    """Yields row slices covering num_rows so that each chunk holds at most ~max_elements values."""
+    rows_per_chunk = max(1, max_elements // max(num_cols, 1))
+    for first in range(0, num_rows, rows_per_chunk):
+        yield slice(first, min(first + rows_per_chunk, num_rows))
+
+
+class StochasticModel:
+    """
+    Interface for the daily log-return models the simulator can run.
+
+    A model is calibrated from the processed `Log_Returns` series and fills a
+    (steps, num_simulations) buffer with simulated daily log returns, in place
+    and vectorized across paths. `simulate_model_paths` turns those returns
+    into prices. Following the GBM convention of this project, the mean daily
+    log return is `mean_daily_return - volatility**2 / 2`.
+    """
+
+    name = "model"
+
+    @classmethod
+    def calibrate(cls, log_returns):
+        """
+        Estimates the model parameters.
+
+        Args:
+            log_returns (pd.Series or np.ndarray): Historical daily log returns.
+
+        Returns:
+            StochasticModel: The calibrated model.
+        """
+        raise NotImplementedError
+
+    def fill_log_returns(self, out, rng):
+        """
+        Writes simulated daily log returns into `out`.
+
+        Args:
+            out (np.ndarray): Buffer of shape (steps, num_simulations), overwritten in place.
+            rng (np.random.Generator): The random generator.
+        """
+        raise NotImplementedError
+
+
+class GBMModel(StochasticModel):
+    """Constant-volatility Geometric Brownian Motion (the model of run_monte_carlo_simulation)."""
+
+    name = "gbm"
+
+    def __init__(self, drift, volatility):
+        self.drift = drift
+        self.volatility = volatility
+
+    @classmethod
+    def calibrate(cls, log_returns):
+        log_returns = np.asarray(log_returns, dtype=np.float64)
+        std_dev = log_returns.std(ddof=1)
+        return cls(log_returns.mean() - 0.5 * std_dev ** 2, std_dev)
+
+    def fill_log_returns(self, out, rng):
+        rng.standard_normal(out=out, dtype=out.dtype)
+        out *= out.dtype.type(self.volatility)
+        out += out.dtype.type(self.drift)
+
+
+class StudentTModel(StochasticModel):
+    """
+    GBM with fat-tailed Student-t innovations, rescaled to unit variance.
+
+    The degrees of freedom are calibrated by the method of moments from the
+    excess kurtosis of the log returns (kurtosis = 6 / (dof - 4)).
+    """
+
+    name = "student_t"
+
+    def __init__(self, drift, volatility, dof):
+        self.drift = drift
+        self.volatility = volatility
+        self.dof = dof
+
+    @classmethod
+    def calibrate(cls, log_returns, min_dof=4.5, max_dof=100.0):
+        from scipy.stats import kurtosis
+
+        log_returns = np.asarray(log_returns, dtype=np.float64)
+        std_dev = log_returns.std(ddof=1)
+        excess_kurtosis = kurtosis(log_returns)
+        dof = 4 + 6 / excess_kurtosis if excess_kurtosis > 0 else max_dof
+        return cls(log_returns.mean() - 0.5 * std_dev ** 2, std_dev, float(np.clip(dof, min_dof, max_dof)))
+
+    def fill_log_returns(self, out, rng):
+        scale = self.volatility / np.sqrt(self.dof / (self.dof - 2))
+        for rows in _row_chunks(*out.shape):
+            out[rows] = rng.standard_t(self.dof, size=out[rows].shape)
+        out *= out.dtype.type(scale)
+        out += out.dtype.type(self.drift)
+
+
+class GarchModel(StochasticModel):
+    """
+    GARCH(1,1) volatility clustering with Gaussian innovations.
+
+    sigma2[t] = omega + alpha * eps[t-1]**2 + beta * sigma2[t-1] and
+    r[t] = mean - sigma2[t] / 2 + eps[t], eps[t] = sqrt(sigma2[t]) * z[t].
+    The recursion is sequential in time only; every step updates all paths
+    at once. Calibration maximizes the Gaussian likelihood with variance
+    targeting (omega = variance * (1 - alpha - beta)), and simulations start
+    from the last filtered conditional variance.
+    """
+
+    name = "garch"
+
+    def __init__(self, mean, omega, alpha, beta, initial_variance):
+        self.mean = mean
+        self.omega = omega
+        self.alpha = alpha
+        self.beta = beta
+        self.initial_variance = initial_variance
+
+    @staticmethod
+    def _conditional_variances(residuals, omega, alpha, beta, variance):
+        """Filters sigma2[0..n] (one step past the data) with a linear filter instead of a Python loop."""
+        from scipy.signal import lfilter
+
+        squared = np.concatenate([[variance], residuals ** 2])
+        inputs = omega + alpha * squared
+        return lfilter([1.0], [1.0, -beta], inputs, zi=[beta * variance])[0]
+
+    @classmethod
+    def calibrate(cls, log_returns):
+        from scipy.optimize import minimize
+
+        log_returns = np.asarray(log_returns, dtype=np.float64)
+        mean = log_returns.mean()
+        residuals = log_returns - mean
+        variance = residuals.var()
+
+        # Optimize persistence = alpha + beta and alpha's share of it, so that
+        # box bounds alone keep the process stationary.
+        def unpack(params):
+            persistence, share = params
+            return persistence * share, persistence * (1 - share)
+
+        def negative_log_likelihood(params):
+            alpha, beta = unpack(params)
+            sigma2 = cls._conditional_variances(residuals, variance * (1 - alpha - beta), alpha, beta, variance)[:-1]
+            return 0.5 * np.sum(np.log(sigma2) + residuals ** 2 / sigma2)
+
+        fit = minimize(negative_log_likelihood, x0=[0.95, 0.05], method='L-BFGS-B',
+                       bounds=[(0.0, 0.999), (1e-6, 1.0)])
+        alpha, beta = unpack(fit.x)
+        omega = variance * (1 - alpha - beta)
+        sigma2 = cls._conditional_variances(residuals, omega, alpha, beta, variance)
+        return cls(mean, omega, alpha, beta, sigma2[-1])
+
+    def fill_log_returns(self, out, rng):
+        dtype = out.dtype
+        num_paths = out.shape[1]
+        sigma2 = np.full(num_paths, self.initial_variance, dtype=dtype)
+        eps = np.empty(num_paths, dtype=dtype)
+        for t in range(out.shape[0]):
+            row = out[t]
+            rng.standard_normal(out=row, dtype=dtype)
+            np.sqrt(sigma2, out=eps)
+            eps *= row
+            # r = mean - sigma2 / 2 + eps
+            np.multiply(sigma2, dtype.type(-0.5), out=row)
+            row += dtype.type(self.mean)
+            row += eps
+            # Next step's conditional variance
+            eps *= eps
+            sigma2 *= dtype.type(self.beta)
+            sigma2 += dtype.type(self.alpha) * eps
+            sigma2 += dtype.type(self.omega)
+
+
+class MertonJumpModel(StochasticModel):
+    """
+    Merton jump diffusion: GBM plus Poisson-arriving normal jumps in the log price.
+
+    Each day has Poisson(jump_intensity) jumps of size N(jump_mean, jump_std**2).
+    Only the (few) path-days with jumps get extra work. The diffusion drift is
+    compensated so the mean daily log return matches the calibration. Calibration
+    treats returns further than `threshold` standard deviations from the mean as
+    jump days.
+    """
+
+    name = "merton"
+
+    def __init__(self, drift, volatility, jump_intensity, jump_mean, jump_std):
+        self.drift = drift
+        self.volatility = volatility
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+
+    @classmethod
+    def calibrate(cls, log_returns, threshold=3.0):
+        log_returns = np.asarray(log_returns, dtype=np.float64)
+        mean = log_returns.mean()
+        std_dev = log_returns.std(ddof=1)
+        is_jump = np.abs(log_returns - mean) > threshold * std_dev
+        diffusion = log_returns[~is_jump]
+        volatility = diffusion.std(ddof=1)
+        jump_intensity = is_jump.mean()
+        jumps = log_returns[is_jump] - diffusion.mean()
+        jump_mean = jumps.mean() if jumps.size else 0.0
+        jump_std = jumps.std(ddof=1) if jumps.size > 1 else 0.0
+        drift = mean - 0.5 * std_dev ** 2 - jump_intensity * jump_mean
+        return cls(drift, volatility, jump_intensity, jump_mean, jump_std)
+
+    def fill_log_returns(self, out, rng):
+        rng.standard_normal(out=out, dtype=out.dtype)
+        out *= out.dtype.type(self.volatility)
+        out += out.dtype.type(self.drift)
+        flat = out.reshape(-1)
+        for rows in _row_chunks(*out.shape):
+            first, last = rows.start * out.shape[1], rows.stop * out.shape[1]
+            counts = rng.poisson(self.jump_intensity, size=last - first)
+            hits = np.flatnonzero(counts)
+            jump_counts = counts[hits]
+            flat[first + hits] += (jump_counts * self.jump_mean
+                                   + np.sqrt(jump_counts) * self.jump_std * rng.standard_normal(hits.size))
+
+
+MODELS = {model.name: model for model in (GBMModel, StudentTModel, GarchModel, MertonJumpModel)}
+
+
+def calibrate_model(name, log_returns):
+    """
+    Calibrates a model by name from historical log returns.
+
+    Args:
+        name (str): One of MODELS ('gbm', 'student_t', 'garch', 'merton').
+        log_returns (pd.Series or np.ndarray): Historical daily log returns, e.g.
+            processed_data['Log_Returns'].
+
+    Returns:
+        StochasticModel: The calibrated model.
+    """
+    if name not in MODELS:
+        raise ValueError(f"Unknown model '{name}'; choose from {sorted(MODELS)}.")
+    return MODELS[name].calibrate(log_returns)
+
+
+def simulate_model_paths(model, start_price, forecast_period=252, num_simulations=10000,
+                         dtype=np.float64, rng=None, checkpoints=None, max_chunk_elements=2 ** 22):
+    """
+    Simulates price paths for any StochasticModel in a single preallocated buffer.
+
+    Models may carry state along a path (GARCH variance, bootstrap blocks), so
+    a checkpoint run still simulates every day, but only for a block of paths
+    at a time: the daily matrix of one block is accumulated and only the
+    checkpoint rows are kept, so memory scales with the stored days.
+
+    Args:
+        model (StochasticModel): A calibrated model.
+        start_price (float): The starting price of the asset.
+        forecast_period (int): The number of trading days to forecast (including day 0).
+        num_simulations (int): The number of simulations to run.
+        dtype (np.dtype): np.float64 (default) or np.float32 to halve memory use.
+        rng (np.random.Generator, int or None): Random generator or seed.
+        checkpoints (str, sequence or None): Store only these days (see resolve_checkpoints).
+        max_chunk_elements (int): Upper bound on the daily values held per block of paths
+            in a checkpoint run.
+
+    Returns:
+        SimulationResult: The simulated paths; row 0 holds the start price.
+    """
+    rng = np.random.default_rng(rng)
+    dtype = np.dtype(dtype)
+    days = resolve_checkpoints(checkpoints, forecast_period)
+    if days is None:
+        paths = np.empty((forecast_period, num_simulations), dtype=dtype)
+        paths[0] = 0
+        model.fill_log_returns(paths[1:], rng)
+        np.cumsum(paths, axis=0, out=paths)
+    else:
+        paths = np.empty((days.size, num_simulations), dtype=dtype)
+        paths_per_block = max(1, max_chunk_elements // forecast_period)
+        for first in range(0, num_simulations, paths_per_block):
+            block = np.empty((forecast_period, min(paths_per_block, num_simulations - first)), dtype=dtype)
+            block[0] = 0
+            model.fill_log_returns(block[1:], rng)
+            np.cumsum(block, axis=0, out=block)
+            paths[:, first:first + block.shape[1]] = block[days]
+    np.exp(paths, out=paths)
+    paths *= dtype.type(start_price)
+    return SimulationResult(paths, start_price, checkpoints=days)
+
+
+def benchmark_models(log_returns, num_simulations=1000000, forecast_period=252, dtype=np.float32, seed=0):
+    """
+    Measures the throughput of every model relative to GBM.
+
+    Args:
+        log_returns (pd.Series or np.ndarray): Historical daily log returns used for calibration.
+        num_simulations (int): Paths simulated per model.
+        forecast_period (int): The number of trading days to forecast.
+        dtype (np.dtype): Floating point type of the paths.
+        seed (int): Seed shared by every model.
+
+    Returns:
+        list: One dict per model with 'model', 'seconds', 'paths_per_sec' and 'relative_to_gbm'.
+    """
+    import time
+
+    results = []
+    for name in MODELS:
+        model = calibrate_model(name, log_returns)
+        started = time.perf_counter()
+        result = simulate_model_paths(model, 1.0, forecast_period, num_simulations, dtype=dtype, rng=seed)
+        seconds = time.perf_counter() - started
+        del result
+        results.append({'model': name, 'seconds': seconds, 'paths_per_sec': num_simulations / seconds})
+    gbm_seconds = results[0]['seconds']
+    for row in results:
+        row['relative_to_gbm'] = row['seconds'] / gbm_seconds
+    return results
+
+
+def run_monte_carlo_simulation(start_price, drift, volatility, forecast_period=252, num_simulations=10000,
+                               dtype=np.float64, rng=None, as_dataframe=True, variance_reduction=None,
+                               num_replicates=16, checkpoints=None, model=None):
     """
     Runs a Monte Carlo simulation for future asset prices using Geometric Brownian Motion.
 
@@ -11,20 +640,37 @@ def run_monte_carlo_simulation(start_price, drift, volatility, forecast_period=2
         volatility (float): The volatility of the asset's returns.
         forecast_period (int): The number of trading days to forecast.
         num_simulations (int): The number of simulations to run.
+        dtype (np.dtype): Floating point type of the paths (np.float64 or np.float32).
+        rng (np.random.Generator, int or None): Random generator or seed for reproducible runs.
+        as_dataframe (bool): If True, return a DataFrame; otherwise return the SimulationResult.
+            Keep the SimulationResult to let the analyzer use the variance reduction metadata.
+        variance_reduction (str, sequence or None): See `simulate_gbm_paths`.
+        num_replicates (int): Number of independent blocks for 'moment_matching' and 'sobol'.
+        checkpoints (str, sequence or None): 'terminal', 'weekly', 'monthly' or a list of days
+            to simulate only a sparse grid; the DataFrame index holds the simulated days.
+        model (StochasticModel or None): Simulate this calibrated model (see calibrate_model)
+            instead of GBM with `drift` and `volatility`. Checkpoints are supported;
+            variance reduction is GBM-only.
 
     Returns:
-        pd.DataFrame: A DataFrame where each column represents a simulated price path.
+        pd.DataFrame or SimulationResult: The simulated price paths, one path per column.
+
+    Raises:
+        ValueError: If variance_reduction is combined with a model.
     """
-    # Generate random daily returns
-    daily_returns = np.exp(drift + volatility * np.random.normal(0, 1, (forecast_period, num_simulations)))
-    
-    # Create a price path for each simulation
-    price_paths = np.zeros_like(daily_returns)
-    price_paths[0] = start_price
-    for t in range(1, forecast_period):
-        price_paths[t] = price_paths[t - 1] * daily_returns[t]
-        
-    return pd.DataFrame(price_paths)
+    if model is not None:
+        if _parse_schemes(variance_reduction):
+            raise ValueError(f"Variance reduction {sorted(_parse_schemes(variance_reduction))} is only "
+                             f"supported for GBM, not the '{model.name}' model.")
+        result = simulate_model_paths(model, start_price, forecast_period, num_simulations, dtype=dtype, rng=rng,
+                                      checkpoints=checkpoints)
+    else:
+        result = simulate_gbm_paths(start_price, drift, volatility, forecast_period, num_simulations,
+                                    dtype=dtype, rng=rng, variance_reduction=variance_reduction,
+                                    num_replicates=num_replicates, checkpoints=checkpoints)
+    if as_dataframe:
+        return result.to_dataframe()
+    return result
 
 if __name__ == '__main__':
     # Example usage with dummy data from the previous step
@@ -49,3 +695,10 @@ if __name__ == '__main__':
         print("Monte Carlo Simulation Results:")
         print(simulations.head())
         print(f"\nSimulated {simulations.shape[1]} paths over {simulations.shape[0]} days.")
+
+        # 4. Compare the alternative return models calibrated on the same history
+        for name in MODELS:
+            model = calibrate_model(name, processed_data['Log_Returns'])
+            result = run_monte_carlo_simulation(start_price, drift, volatility, num_simulations=10000,
+                                                as_dataframe=False, model=model)
+            print(f"{name:>10}: median final price {np.median(result.final_prices):.2f}")
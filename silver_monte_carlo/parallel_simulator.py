@@ -0,0 +1,158 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from monte_carlo_simulator import SimulationResult, simulate_gbm_paths
+from streaming_simulator import new_streaming_summary
+
+DEFAULT_BLOCK_SIZE = 100000
+
+
+def split_into_blocks(num_simulations, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Splits a path count into fixed-size blocks.
+
+    The split depends only on num_simulations and block_size, never on the
+    number of workers, which is what makes parallel runs reproducible.
+
+    Args:
+        num_simulations (int): The total number of paths.
+        block_size (int): The number of paths per block (the last block may be smaller).
+
+    Returns:
+        list: The size of every block.
+    """
+    full_blocks, remainder = divmod(num_simulations, block_size)
+    return [block_size] * full_blocks + ([remainder] if remainder else [])
+
+
+def _simulate_block(task):
+    """Worker entry point: simulates one block with its own spawned seed."""
+    (start_price, drift, volatility, forecast_period, size, seed_sequence,
+     dtype, output, grid_options) = task
+    rng = np.random.default_rng(seed_sequence)
+    block = simulate_gbm_paths(start_price, drift, volatility, forecast_period, size, dtype=dtype, rng=rng)
+    if output == 'paths':
+        return block.paths
+
+    summary = new_streaming_summary(start_price, drift, volatility, forecast_period, **grid_options)
+    summary.terminal.update(block.final_prices)
+    summary.daily.update(block.paths)
+    return summary
+
+
+def run_parallel_simulation(start_price, drift, volatility, forecast_period=252, num_simulations=10000,
+                            seed=None, num_workers=None, block_size=DEFAULT_BLOCK_SIZE,
+                            dtype=np.float64, output='summary', **grid_options):
+    """
+    Runs a GBM Monte Carlo simulation across a pool of worker processes.
+
+    The paths are split into fixed-size blocks. Every block draws from its own
+    stream, spawned from `np.random.SeedSequence(seed)`, and the block results
+    are reduced in block order. For a given seed and block_size the output is
+    therefore bit-identical for any num_workers.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The drift component of the asset's returns.
+        volatility (float): The volatility of the asset's returns.
+        forecast_period (int): The number of trading days to forecast.
+        num_simulations (int): The total number of simulations to run.
+        seed (int or None): Root seed; None draws fresh entropy.
+        num_workers (int or None): Number of processes (default: os.cpu_count()). 1 runs in-process.
+        block_size (int): Number of paths per block.
+        dtype (np.dtype): Floating point type of the simulated paths.
+        output (str): 'summary' to merge streaming accumulators (fixed memory), or
+            'paths' to assemble the full SimulationResult.
+        **grid_options: Passed on to `streaming_simulator.new_streaming_summary`.
+
+    Returns:
+        StreamingSummary or SimulationResult: Either can be passed to analyze_simulation_results.
+    """
+    if output not in ('summary', 'paths'):
+        raise ValueError(f"Unknown output '{output}'; expected 'summary' or 'paths'.")
+
+    sizes = split_into_blocks(num_simulations, block_size)
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(start_price, drift, volatility, forecast_period, size, seed_sequence, dtype, output, grid_options)
+             for size, seed_sequence in zip(sizes, seed_sequences)]
+
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1:
+        block_results = map(_simulate_block, tasks)
+        return _reduce_blocks(block_results, start_price, drift, volatility, forecast_period,
+                              num_simulations, dtype, output, grid_options)
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        # map() yields in submission order, so the reduction order is fixed
+        block_results = executor.map(_simulate_block, tasks)
+        return _reduce_blocks(block_results, start_price, drift, volatility, forecast_period,
+                              num_simulations, dtype, output, grid_options)
+
+
+def _reduce_blocks(block_results, start_price, drift, volatility, forecast_period,
+                   num_simulations, dtype, output, grid_options):
+    """Reduces per-block results, in block order, into a single output."""
+    if output == 'paths':
+        paths = np.empty((forecast_period, num_simulations), dtype=dtype)
+        offset = 0
+        for block_paths in block_results:
+            paths[:, offset:offset + block_paths.shape[1]] = block_paths
+            offset += block_paths.shape[1]
+        return SimulationResult(paths, start_price)
+
+    summary = new_streaming_summary(start_price, drift, volatility, forecast_period, **grid_options)
+    for block_summary in block_results:
+        summary.merge(block_summary)
+    return summary
+
+
+def benchmark_scaling(worker_counts=None, num_simulations=2000000, forecast_period=252,
+                      block_size=DEFAULT_BLOCK_SIZE, seed=0):
+    """
+    Measures simulation throughput (paths/sec) against the number of workers.
+
+    Args:
+        worker_counts (list or None): Worker counts to try (default: powers of two up to cpu_count).
+        num_simulations (int): Paths simulated for every worker count.
+        forecast_period (int): The number of trading days to forecast.
+        block_size (int): Number of paths per block.
+        seed (int): Root seed, shared by every run.
+
+    Returns:
+        list: One dict per worker count with 'workers', 'seconds', 'paths_per_sec' and 'speedup'.
+    """
+    if worker_counts is None:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = [2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count]
+
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        run_parallel_simulation(100.0, 0.0003, 0.015, forecast_period, num_simulations, seed=seed,
+                                num_workers=workers, block_size=block_size)
+        seconds = time.perf_counter() - start
+        results.append({
+            'workers': workers,
+            'seconds': seconds,
+            'paths_per_sec': num_simulations / seconds,
+            'speedup': results[0]['seconds'] / seconds if results else 1.0,
+        })
+    return results
+
+
+if __name__ == '__main__':
+    # Reproducibility check and scaling benchmark with made-up parameters
+    from analyzer import analyze_simulation_results
+
+    single = run_parallel_simulation(80.0, 0.0003, 0.015, num_simulations=400000, seed=7, num_workers=1)
+    pooled = run_parallel_simulation(80.0, 0.0003, 0.015, num_simulations=400000, seed=7, num_workers=4)
+    single_metrics = analyze_simulation_results(single, 80.0)['risk_metrics']
+    pooled_metrics = analyze_simulation_results(pooled, 80.0)['risk_metrics']
+    print(f"Identical results with 1 and 4 workers: {single_metrics == pooled_metrics}")
+
+    print("\nWorkers  Seconds  Paths/sec  Speedup")
+    for row in benchmark_scaling():
+        print(f"{row['workers']:>7}  {row['seconds']:>7.2f}  {row['paths_per_sec']:>9.0f}  {row['speedup']:>7.2f}")
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from artifact_cache import code_version
+
+# Image written by every visualizer function
+CHART_FILES = {
+    'plot_historical_prices': 'historical_prices.png',
+    'plot_daily_returns_distribution': 'daily_returns_distribution.png',
+    'plot_rolling_volatility': 'rolling_volatility.png',
+    'plot_simulation_paths': 'simulation_paths.png',
+    'plot_final_price_distribution': 'final_price_distribution.png',
+    'plot_fan_chart': 'fan_chart.png',
+    'plot_pdf_and_cdf': 'pdf_cdf_of_returns.png',
+}
+RENDER_CACHE_FILE = ".render_cache.json"
+
+
+def _update_fingerprint(digest, obj):
+    """
+    Feeds a stable, unambiguous representation of an input into a hash.
+
+    Every element is written as a type tag and a length-prefixed payload,
+    and containers record their size, so different inputs never serialize
+    to the same bytes (e.g. [21, 42] and [2, 142]).
+    """
+    def write(tag, payload):
+        digest.update(f"{tag}:{len(payload)}:".encode())
+        digest.update(payload)
+
+    if isinstance(obj, np.ndarray):
+        write('ndarray', f"{obj.dtype.str}{obj.shape}".encode())
+        write('data', np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        write(type(obj).__name__, str(len(obj)).encode())
+        _update_fingerprint(digest, obj.index.to_numpy())
+        if isinstance(obj, pd.DataFrame):
+            write('columns', str(len(obj.columns)).encode())
+            for column in obj.columns:
+                _update_fingerprint(digest, str(column))
+                _update_fingerprint(digest, obj[column].to_numpy())
+        else:
+            _update_fingerprint(digest, obj.to_numpy())
+    elif isinstance(obj, dict):
+        write('dict', str(len(obj)).encode())
+        for key in sorted(obj, key=str):
+            _update_fingerprint(digest, key)
+            _update_fingerprint(digest, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        write(type(obj).__name__, str(len(obj)).encode())
+        for item in obj:
+            _update_fingerprint(digest, item)
+    elif hasattr(obj, '__dict__'):
+        write('object', type(obj).__name__.encode())
+        _update_fingerprint(digest, vars(obj))
+    else:
+        write(type(obj).__name__, repr(obj).encode())
+
+
+def fingerprint(*objects):
+    """
+    Returns a content hash of chart inputs (arrays, DataFrames, dicts, SummaryBands, scalars).
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        _update_fingerprint(digest, obj)
+    return digest.hexdigest()
+
+
+def _init_worker():
+    """Switches worker processes to the headless Agg backend before pyplot is imported."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(job):
+    """
+    Renders one chart; returns (name, seconds, peak traced memory in MB or None).
+
+    The peak is only measured when this call starts tracemalloc itself (always
+    the case in a worker process). If the caller is already tracing, e.g. an
+    in-process render inside an instrumented stage, resetting the peak would
+    erase the caller's high-water mark, so the peak is reported as None.
+    """
+    name, args, save_path, trace_memory = job
+    import visualizer
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    getattr(visualizer, name)(*args, save_path=save_path)
+    seconds = time.perf_counter() - started
+    peak_memory_mb = None
+    if started_tracing:
+        peak_memory_mb = (tracemalloc.get_traced_memory()[1] - start) / 2 ** 20
+        tracemalloc.stop()
+    return name, seconds, peak_memory_mb
+
+
+def standard_chart_jobs(processed_data, analysis_results, bands):
+    """
+    Returns the (function name, args) of the seven charts produced by main.py.
+
+    Args:
+        processed_data (pd.DataFrame): Output of process_data.
+        analysis_results (dict): Output of analyze_simulation_results.
+        bands (SummaryBands): Output of compute_summary_bands.
+
+    Returns:
+        list: (visualizer function name, positional args) pairs.
+    """
+    history = processed_data[['Silver_INR_Gram', 'Log_Returns']]
+    return [
+        ('plot_historical_prices', (history,)),
+        ('plot_daily_returns_distribution', (history,)),
+        ('plot_rolling_volatility', (history,)),
+        ('plot_simulation_paths', (bands, analysis_results)),
+        ('plot_final_price_distribution', (analysis_results,)),
+        ('plot_fan_chart', (bands,)),
+        ('plot_pdf_and_cdf', (analysis_results,)),
+    ]
+
+
+def render_charts(jobs, save_path="visualizations", max_workers=None, force=False, peak_memory=None):
+    """
+    Renders charts in parallel, skipping those whose inputs did not change since the last render.
+
+    Every chart is rendered in a worker process with the headless Agg
+    backend (a single pending chart, or max_workers=1, renders in-process
+    with the caller's backend). A hash of each chart's inputs and of the
+    visualizer source is stored in `.render_cache.json` next to the images;
+    when the hash matches and the image still exists, the chart is skipped.
+
+    Args:
+        jobs (list): (visualizer function name, positional args) pairs.
+        save_path (str): Directory for the images.
+        max_workers (int or None): Number of worker processes; 1 renders in-process.
+        force (bool): If True, render every chart regardless of the cache.
+        peak_memory (dict or None): If given, filled with function name -> peak traced
+            memory (MB) of every rendered chart (None for in-process renders while the
+            caller is tracing; see _render).
+
+    Returns:
+        dict: Function name -> render seconds, or None if the chart was skipped.
+    """
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    cache_path = os.path.join(save_path, RENDER_CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    timings = {}
+    pending = []
+    hashes = {}
+    visualizer_version = code_version('visualizer')
+    for name, args in jobs:
+        hashes[name] = fingerprint(name, visualizer_version, args)
+        image = os.path.join(save_path, CHART_FILES.get(name, name + '.png'))
+        if not force and cache.get(name) == hashes[name] and os.path.exists(image):
+            timings[name] = None
+        else:
+            pending.append((name, args, save_path, peak_memory is not None))
+
+    if pending:
+        if max_workers == 1 or len(pending) == 1:
+            rendered = [_render(job) for job in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+                rendered = list(executor.map(_render, pending))
+        for name, seconds, peak_memory_mb in rendered:
+            timings[name] = seconds
+            if peak_memory is not None:
+                peak_memory[name] = peak_memory_mb
+            cache[name] = hashes[name]
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+
+    return timings
@@ -0,0 +1,84 @@
+# Text reports built from calibration statistics and an analysis. Kept free of
+# heavy imports so `cli.py report` does not load the whole pipeline.
+
+
+def _path_risk_lines(analysis):
+    """
+    Formats the path-dependent risk lines of the summary.
+
+    Lines whose metrics were not computed (no path metrics, or custom barriers
+    without the 15% down barrier) are left out.
+    """
+    path_metrics = analysis.get('path_metrics')
+    if not path_metrics:
+        return ""
+    lines = ""
+    if path_metrics.get('prob_touch_down_15') is not None:
+        lines += (f"- **Intra-Year Fall:** There is a {path_metrics['prob_touch_down_15']:.2%} chance the price "
+                  f"drops 15% below the current price at some point during the year.\n")
+    if path_metrics.get('max_drawdown_median') is not None:
+        lines += (f"- **Maximum Drawdown:** The median worst peak-to-trough fall along a path is "
+                  f"{path_metrics['max_drawdown_median']:.2%} "
+                  f"(95th percentile {path_metrics['max_drawdown_95th']:.2%}).\n")
+    return lines
+
+
+def generate_executive_summary(historical_stats, analysis, num_simulations=10000, forecast_period=252):
+    """
+    Generates a formatted string for the executive summary report.
+
+    Args:
+        historical_stats (dict): Statistics from process_data.
+        analysis (dict): Output of analyze_simulation_results (or its JSON export).
+        num_simulations (int): Number of simulated paths behind the analysis.
+        forecast_period (int): Number of trading days forecast.
+
+    Returns:
+        str: The summary in Markdown.
+    """
+    summary = f"""
+# Executive Summary: Monte Carlo Simulation of Silver Prices in INR
+
+## 1. Historical Analysis (2015 - Present)
+- **Annualized Volatility:** {historical_stats['annualized_volatility']:.2%}
+- **Mean Daily Return:** {historical_stats['mean_daily_return']:.5f}
+- **Maximum Drawdown:** {historical_stats['max_drawdown']:.2%}
+- **Sharpe Ratio:** {historical_stats['sharpe_ratio']:.2f}
+- **Latest Price (as of analysis):** {historical_stats['latest_price']:.2f} INR/Gram
+
+## 2. Monte Carlo Simulation Results (1-Year Forecast)
+Based on {num_simulations} simulations over {forecast_period} trading days:
+
+### Price Predictions:
+- **Mean Predicted Price:** {analysis['price_predictions']['mean_predicted_price']:.2f} INR/Gram
+- **Median Predicted Price:** {analysis['price_predictions']['median_predicted_price']:.2f} INR/Gram
+- **Confidence Interval (90%):** The price is expected to be between {analysis['price_predictions']['5th_percentile']:.2f} and {analysis['price_predictions']['95th_percentile']:.2f} INR/Gram.
+
+### Risk Assessment:
+- **Value at Risk (VaR 95%):** There is a 5% chance of losing at least {-analysis['risk_metrics']['VaR_95']:.2%} of the investment.
+- **Conditional VaR (CVaR 95%):** In the worst 5% of scenarios, the average loss is {-analysis['risk_metrics']['CVaR_95']:.2%}.
+- **Probability of Loss:** There is a {analysis['risk_metrics']['prob_loss']:.2%} chance the price will be lower than the current price in one year.
+{_path_risk_lines(analysis)}
+### Potential Upside:
+- **Probability of >10% Gain:** {analysis['risk_metrics']['prob_increase_10']:.2%}
+- **Probability of >20% Gain:** {analysis['risk_metrics']['prob_increase_20']:.2%}
+
+## 3. Investment Recommendations & Insights
+- **Expected Return:** The simulation forecasts an expected return of {analysis['statistical_summary']['expected_return']:.2%} over the next year.
+- **Volatility:** The forecasted price distribution shows a standard deviation of {analysis['statistical_summary']['std_dev_forecast']:.2f}, indicating the potential range of outcomes.
+- **Insight:** Based on the historical trend and simulation, [Your interpretation here, e.g., "silver shows a positive expected return, but investors should be aware of the significant downside risk as indicated by the VaR and the wide confidence interval."]
+
+This analysis is based on historical data and models with inherent assumptions. It should not be considered as financial advice.
+"""
+    return summary.strip()
+
+
+if __name__ == '__main__':
+    # Example: a summary from a simulated analysis
+    from monte_carlo_simulator import run_monte_carlo_simulation
+    from analyzer import analyze_simulation_results
+
+    stats = {'annualized_volatility': 0.24, 'mean_daily_return': 0.0004, 'max_drawdown': -0.35,
+             'sharpe_ratio': 0.42, 'latest_price': 80.0}
+    simulations = run_monte_carlo_simulation(80.0, 0.0003, 0.015, num_simulations=10000, rng=0, as_dataframe=False)
+    print(generate_executive_summary(stats, analyze_simulation_results(simulations, 80.0, path_metrics=True)))
@@ -0,0 +1,206 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from monte_carlo_simulator import SimulationResult
+
+FORMAT_VERSION = 1
+PATHS_FILE = "paths.npy"
+METADATA_FILE = "metadata.json"
+
+
+def _to_jsonable(value):
+    """Converts numpy scalars and arrays (also nested in dicts/lists) to plain Python types."""
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ResultStoreWriter:
+    """
+    Writes simulated paths into a binary result store, block by block.
+
+    A store is a directory holding `paths.npy`, a plain .npy array of shape
+    (num_days, num_simulations) written through a memory map, and
+    `metadata.json` with the simulation parameters, seed, calibration
+    statistics, dtype and shape. Blocks of paths can be written as they are
+    produced (e.g. by a streaming or parallel run), so the full matrix never
+    has to exist in memory.
+
+    Attributes:
+        directory (str): The store directory.
+        paths (np.memmap): The writable path matrix.
+        metadata (dict): The sidecar contents written on close().
+    """
+
+    def __init__(self, directory, num_days, num_simulations, dtype=np.float64, metadata=None, days=None):
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.paths = np.lib.format.open_memmap(os.path.join(directory, PATHS_FILE), mode='w+',
+                                               dtype=np.dtype(dtype), shape=(num_days, num_simulations))
+        self.metadata = {
+            'format_version': FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'dtype': np.dtype(dtype).name,
+            'shape': [num_days, num_simulations],
+            'days': None if days is None else _to_jsonable(np.asarray(days)),
+        }
+        self.metadata.update(_to_jsonable(metadata or {}))
+
+    def write_block(self, first_path, block):
+        """
+        Writes a block of paths.
+
+        Args:
+            first_path (int): Column index of the first path in the block.
+            block (np.ndarray): Prices of shape (num_days, block_size).
+        """
+        self.paths[:, first_path:first_path + block.shape[1]] = block
+
+    def close(self):
+        """Flushes the paths to disk and writes the metadata sidecar."""
+        self.paths.flush()
+        del self.paths
+        with open(os.path.join(self.directory, METADATA_FILE), 'w') as f:
+            json.dump(self.metadata, f, indent=2)
+
+
+def save_simulation_result(result, directory, metadata=None, block_size=100000):
+    """
+    Saves a SimulationResult as a binary result store.
+
+    Args:
+        result (SimulationResult): The simulated paths.
+        directory (str): The store directory (created if needed, overwritten if present).
+        metadata (dict): Extra sidecar entries, e.g. 'parameters', 'seed' and 'calibration'.
+        block_size (int): Number of paths copied at a time.
+
+    Returns:
+        str: The store directory.
+    """
+    num_days, num_simulations = result.shape
+    sidecar = {'start_price': result.start_price}
+    sidecar.update(metadata or {})
+    writer = ResultStoreWriter(directory, num_days, num_simulations, result.dtype, sidecar,
+                               days=result.checkpoints)
+    for first in range(0, num_simulations, block_size):
+        writer.write_block(first, result.paths[:, first:first + block_size])
+    writer.close()
+    return directory
+
+
+class SimulationStore:
+    """
+    Read-only, memory-mapped view of a binary result store.
+
+    Nothing is loaded up front: pulling a day reads one contiguous row and
+    pulling a range of paths reads only those columns.
+
+    Attributes:
+        directory (str): The store directory.
+        metadata (dict): The sidecar contents.
+        paths (np.memmap): The (num_days, num_simulations) path matrix.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, METADATA_FILE)) as f:
+            self.metadata = json.load(f)
+        self.paths = np.load(os.path.join(directory, PATHS_FILE), mmap_mode='r')
+
+    @property
+    def shape(self):
+        return self.paths.shape
+
+    @property
+    def days(self):
+        """np.ndarray: The trading day of every stored row."""
+        if self.metadata.get('days') is None:
+            return np.arange(self.paths.shape[0])
+        return np.asarray(self.metadata['days'])
+
+    def day(self, day):
+        """
+        Returns the simulated prices of every path on one trading day.
+
+        Args:
+            day (int): The trading day (a row label; -1 selects the last stored day).
+
+        Returns:
+            np.ndarray: One price per path.
+        """
+        if day == -1:
+            return np.asarray(self.paths[-1])
+        rows = np.flatnonzero(self.days == day)
+        if rows.size == 0:
+            raise KeyError(f"Day {day} is not stored.")
+        return np.asarray(self.paths[rows[0]])
+
+    def path_range(self, start, stop):
+        """
+        Returns a contiguous range of paths.
+
+        Args:
+            start (int): Index of the first path.
+            stop (int): Index one past the last path.
+
+        Returns:
+            np.ndarray: Prices of shape (num_days, stop - start).
+        """
+        return np.asarray(self.paths[:, start:stop])
+
+    @property
+    def final_prices(self):
+        return self.day(-1)
+
+    def to_result(self):
+        """
+        Wraps the memory-mapped paths in a SimulationResult for the analyzer and visualizer.
+
+        Returns:
+            SimulationResult: Backed by the memory map, not loaded into memory.
+        """
+        days = self.metadata.get('days')
+        return SimulationResult(self.paths, self.metadata.get('start_price'),
+                                checkpoints=None if days is None else np.asarray(days))
+
+    def export_csv(self, csv_path, rows_per_chunk=16):
+        """
+        Writes the paths as CSV (one row per day, one column per path), a few rows at a time.
+
+        Args:
+            csv_path (str): The CSV file to write.
+            rows_per_chunk (int): Number of days formatted per chunk.
+        """
+        import pandas as pd
+
+        days = self.days
+        for first in range(0, self.paths.shape[0], rows_per_chunk):
+            chunk = pd.DataFrame(np.asarray(self.paths[first:first + rows_per_chunk]),
+                                 index=days[first:first + rows_per_chunk])
+            chunk.to_csv(csv_path, mode='w' if first == 0 else 'a', header=first == 0)
+
+
+if __name__ == '__main__':
+    # Example usage with made-up parameters
+    import tempfile
+
+    from monte_carlo_simulator import run_monte_carlo_simulation
+
+    result = run_monte_carlo_simulation(80.0, 0.0003, 0.015, num_simulations=100000, rng=1, as_dataframe=False)
+    directory = save_simulation_result(result, os.path.join(tempfile.mkdtemp(), "simulation_results"),
+                                       metadata={'seed': 1, 'parameters': {'drift': 0.0003, 'volatility': 0.015}})
+
+    store = SimulationStore(directory)
+    print(f"Stored {store.shape[1]} paths over {store.shape[0]} days ({store.metadata['dtype']}).")
+    print(f"Day 126 median: {np.median(store.day(126)):.2f}")
+    print(f"First 3 paths on the last day: {store.path_range(0, 3)[-1]}")
@@ -0,0 +1,131 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.stats import skew, kurtosis
+
+# Columns describing a scenario
+SCENARIO_COLUMNS = ['start_price', 'drift', 'volatility', 'forecast_period']
+
+
+def build_scenario_grid(start_price, drift, volatility, forecast_period=252):
+    """
+    Builds the cartesian product of parameter values as a scenario table.
+
+    Args:
+        start_price (float or sequence): Starting price(s).
+        drift (float or sequence): Daily drift(s) of the log returns.
+        volatility (float or sequence): Daily volatility(ies) of the log returns.
+        forecast_period (int or sequence): Horizon(s) in trading days (including day 0).
+
+    Returns:
+        pd.DataFrame: One row per scenario with the SCENARIO_COLUMNS.
+    """
+    axes = [np.atleast_1d(start_price), np.atleast_1d(drift), np.atleast_1d(volatility),
+            np.atleast_1d(forecast_period)]
+    return pd.DataFrame(list(itertools.product(*axes)), columns=SCENARIO_COLUMNS)
+
+
+def _interpolate_sorted(sorted_values, quantiles):
+    """Linear-interpolation quantiles (like pandas) of every row of an already sorted matrix."""
+    positions = np.asarray(quantiles) * (sorted_values.shape[1] - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, sorted_values.shape[1] - 1)
+    weight = positions - lower
+    return sorted_values[:, lower] + weight * (sorted_values[:, upper] - sorted_values[:, lower])
+
+
+def run_scenario_grid(scenarios, num_simulations=10000, rng=None, max_chunk_elements=2 ** 24):
+    """
+    Computes the analyzer metrics for many GBM scenarios using common random numbers.
+
+    One set of standard normals Z is drawn and sorted once. Every scenario's
+    terminal price S0 * exp(drift * h + volatility * sqrt(h) * Z), with h the
+    number of simulated steps, is an increasing function of Z, so the shared
+    sorted order serves all scenarios. Quantiles, VaR and CVaR are then read
+    off without any per-scenario sort. Scenarios are processed in chunks so
+    that at most max_chunk_elements prices exist at once. Because every
+    scenario reuses the same draws, the resulting sensitivity surfaces are
+    smooth (common random numbers).
+
+    Args:
+        scenarios (pd.DataFrame): One row per scenario with the SCENARIO_COLUMNS
+            (see build_scenario_grid).
+        num_simulations (int): Number of terminal draws shared by every scenario.
+        rng (np.random.Generator, int or None): Random generator or seed.
+        max_chunk_elements (int): Upper bound on scenarios x paths held at once.
+
+    Returns:
+        pd.DataFrame: The scenario columns plus one column per analyzer metric.
+    """
+    rng = np.random.default_rng(rng)
+    shocks = np.sort(rng.standard_normal(num_simulations))
+
+    start_prices = scenarios['start_price'].to_numpy(dtype=np.float64)
+    drifts = scenarios['drift'].to_numpy(dtype=np.float64)
+    volatilities = scenarios['volatility'].to_numpy(dtype=np.float64)
+    steps = scenarios['forecast_period'].to_numpy(dtype=np.float64) - 1
+
+    rows_per_chunk = max(1, max_chunk_elements // num_simulations)
+    chunks = []
+    for first in range(0, len(scenarios), rows_per_chunk):
+        chunk = slice(first, first + rows_per_chunk)
+        start = start_prices[chunk][:, None]
+        log_returns = (drifts[chunk] * steps[chunk])[:, None] + (volatilities[chunk] * np.sqrt(steps[chunk]))[:, None] * shocks
+        final_prices = start * np.exp(log_returns)  # rows are sorted ascending
+        returns = final_prices / start - 1
+
+        p05, p25, p50, p75, p95 = _interpolate_sorted(final_prices, [0.05, 0.25, 0.5, 0.75, 0.95]).T
+        var_95, var_99 = _interpolate_sorted(returns, [0.05, 0.01]).T
+        in_tail_95 = returns <= var_95[:, None]
+        in_tail_99 = returns <= var_99[:, None]
+
+        chunks.append(pd.DataFrame({
+            'mean_predicted_price': final_prices.mean(axis=1),
+            'median_predicted_price': p50,
+            '5th_percentile': p05,
+            '25th_percentile': p25,
+            '75th_percentile': p75,
+            '95th_percentile': p95,
+            'VaR_95': var_95,
+            'VaR_99': var_99,
+            'CVaR_95': np.where(in_tail_95, returns, 0).sum(axis=1) / in_tail_95.sum(axis=1),
+            'CVaR_99': np.where(in_tail_99, returns, 0).sum(axis=1) / in_tail_99.sum(axis=1),
+            'prob_loss': (final_prices < start).mean(axis=1),
+            'prob_increase_10': (final_prices > start * 1.1).mean(axis=1),
+            'prob_increase_20': (final_prices > start * 1.2).mean(axis=1),
+            'prob_increase_30': (final_prices > start * 1.3).mean(axis=1),
+            'expected_return': returns.mean(axis=1),
+            'std_dev_forecast': final_prices.std(axis=1, ddof=1),
+            'skewness': skew(final_prices, axis=1),
+            'kurtosis': kurtosis(final_prices, axis=1),
+        }))
+
+    metrics = pd.concat(chunks, ignore_index=True)
+    return pd.concat([scenarios.reset_index(drop=True)[SCENARIO_COLUMNS], metrics], axis=1)
+
+
+if __name__ == '__main__':
+    # 40 x 40 drift/volatility stress grid compared against the per-scenario loop
+    import time
+
+    from analyzer import analyze_simulation_results
+    from monte_carlo_simulator import run_monte_carlo_simulation
+
+    grid = build_scenario_grid(80.0, np.linspace(-0.001, 0.001, 40), np.linspace(0.005, 0.03, 40))
+
+    started = time.perf_counter()
+    surface = run_scenario_grid(grid, num_simulations=10000, rng=0)
+    batched_seconds = time.perf_counter() - started
+    print(f"Batched grid: {len(grid)} scenarios in {batched_seconds:.2f}s")
+
+    sample = grid.iloc[:20]
+    started = time.perf_counter()
+    for row in sample.itertuples():
+        simulations = run_monte_carlo_simulation(row.start_price, row.drift, row.volatility,
+                                                 int(row.forecast_period), 10000, rng=0, as_dataframe=False)
+        analyze_simulation_results(simulations, row.start_price)
+    loop_seconds = (time.perf_counter() - started) / len(sample) * len(grid)
+    print(f"Per-scenario loop (extrapolated): {loop_seconds:.2f}s")
+
+    print(surface.pivot(index='drift', columns='volatility', values='VaR_95').iloc[:5, :5])
@@ -0,0 +1,484 @@
+import numpy as np
+
+from monte_carlo_simulator import simulate_gbm_paths
+
+# Return thresholds tracked exactly by the terminal accumulator
+DEFAULT_THRESHOLDS = (0.0, 0.1, 0.2, 0.3)
+DEFAULT_PERCENTILES = (5, 20, 50, 80, 95)
+# Terminal prices outside the histogram grid kept exactly, per side
+DEFAULT_MAX_OUTSIDE = 100000
+
+
+def gbm_log_bounds(drift, volatility, forecast_period, num_sigmas=10.0):
+    """
+    Returns per-day (low, high) bounds of log(S_t / S_0) for a GBM forecast.
+
+    Args:
+        drift (float): The daily drift of the log returns.
+        volatility (float): The daily volatility of the log returns.
+        forecast_period (int): The number of simulated days (including day 0).
+        num_sigmas (float): Half-width of the bounds in standard deviations.
+
+    Returns:
+        tuple: Two np.ndarrays of length forecast_period with the lower and upper bounds.
+    """
+    days = np.arange(forecast_period)
+    center = drift * days
+    half_width = np.maximum(num_sigmas * volatility * np.sqrt(days), 1e-9)
+    return center - half_width, center + half_width
+
+
+def _batch_moments(values):
+    """Returns (count, mean, M2, M3, M4) of a batch of values."""
+    mean = values.mean()
+    centered = values - mean
+    squared = centered * centered
+    return (values.size, mean, squared.sum(), (squared * centered).sum(), (squared * squared).sum())
+
+
+def _merge_moments(a, b):
+    """Merges two (count, mean, M2, M3, M4) tuples (Chan / Pebay pairwise update)."""
+    na, mean_a, m2a, m3a, m4a = a
+    nb, mean_b, m2b, m3b, m4b = b
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    n = na + nb
+    delta = mean_b - mean_a
+    delta_n = delta / n
+    mean = mean_a + delta_n * nb
+    m2 = m2a + m2b + delta * delta_n * na * nb
+    m3 = (m3a + m3b + delta * delta_n * delta_n * na * nb * (na - nb)
+          + 3.0 * delta_n * (na * m2b - nb * m2a))
+    m4 = (m4a + m4b + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+          + 6.0 * delta_n * delta_n * (na * na * m2b + nb * nb * m2a)
+          + 4.0 * delta_n * (na * m3b - nb * m3a))
+    return (n, mean, m2, m3, m4)
+
+
+class TerminalAccumulator:
+    """
+    Online, mergeable summary of simulated terminal prices.
+
+    Terminal prices are binned on a fixed log-return grid that stores both the
+    count and the sum of prices per bin, so quantiles and tail means (CVaR) can
+    be read back without keeping the individual prices. Prices outside the
+    grid are kept exactly, up to `max_outside` per side; further ones are
+    counted in the edge bin (and in `clipped`), so memory is bounded by
+    num_bins * 16 + 2 * max_outside * 8 bytes plus the plotting sample. Mean,
+    variance, skewness and kurtosis use running central moments, and the
+    `prob_*` metrics use exact threshold counters.
+
+    Quantiles and CVaR are accurate to within one bin, i.e. a relative price
+    error of at most (log_high - log_low) / num_bins, as long as nothing was
+    clipped; with the default 10-sigma GBM bounds and 2**16 bins this is
+    about 3e-4 standard deviations of the terminal log return. All other
+    statistics match the in-memory analyzer up to floating point rounding.
+
+    Attributes:
+        start_price (float): The starting price the returns are measured against.
+        count (int): The number of terminal prices seen so far.
+        clipped (int): Prices outside the grid beyond `max_outside`, folded into the edge bins.
+        sample (np.ndarray): The first `sample_size` terminal prices, kept for plotting.
+    """
+
+    def __init__(self, start_price, log_low, log_high, num_bins=2 ** 16,
+                 thresholds=DEFAULT_THRESHOLDS, sample_size=10000, max_outside=DEFAULT_MAX_OUTSIDE):
+        self.start_price = float(start_price)
+        self.log_low = float(log_low)
+        self.log_high = float(log_high)
+        self.num_bins = int(num_bins)
+        self.thresholds = tuple(thresholds)
+        self.sample_size = int(sample_size)
+        self.max_outside = int(max_outside)
+
+        self.bin_counts = np.zeros(self.num_bins, dtype=np.int64)
+        self.bin_sums = np.zeros(self.num_bins, dtype=np.float64)
+        self.below = np.empty(0)
+        self.above = np.empty(0)
+        self.clipped = 0
+        self.threshold_counts = np.zeros(len(self.thresholds), dtype=np.int64)
+        self.loss_count = 0
+        self.moments = (0, 0.0, 0.0, 0.0, 0.0)
+        self.sample = np.empty(0)
+
+    @property
+    def count(self):
+        return self.moments[0]
+
+    @property
+    def bin_width(self):
+        return (self.log_high - self.log_low) / self.num_bins
+
+    def _keep_outside(self, kept, values, edge):
+        """Appends out-of-grid prices up to max_outside; the rest go into bin `edge`."""
+        room = max(self.max_outside - kept.size, 0)
+        if values.size > room:
+            overflow = values[room:]
+            self.bin_counts[edge] += overflow.size
+            self.bin_sums[edge] += overflow.sum()
+            self.clipped += overflow.size
+            values = values[:room]
+        return np.concatenate([kept, values]) if values.size else kept
+
+    def update(self, final_prices):
+        """
+        Folds a batch of terminal prices into the accumulator.
+
+        Args:
+            final_prices (np.ndarray): One terminal price per simulated path.
+        """
+        prices = np.asarray(final_prices, dtype=np.float64).ravel()
+        if prices.size == 0:
+            return
+
+        log_returns = np.log(prices / self.start_price)
+        position = (log_returns - self.log_low) / self.bin_width
+        is_below = position < 0
+        is_above = position >= self.num_bins
+        inside = ~(is_below | is_above)
+
+        idx = position[inside].astype(np.int64)
+        self.bin_counts += np.bincount(idx, minlength=self.num_bins)
+        self.bin_sums += np.bincount(idx, weights=prices[inside], minlength=self.num_bins)
+        if is_below.any():
+            self.below = self._keep_outside(self.below, prices[is_below], 0)
+        if is_above.any():
+            self.above = self._keep_outside(self.above, prices[is_above], -1)
+
+        for i, threshold in enumerate(self.thresholds):
+            self.threshold_counts[i] += np.count_nonzero(prices > self.start_price * (1 + threshold))
+        self.loss_count += np.count_nonzero(prices < self.start_price)
+
+        self.moments = _merge_moments(self.moments, _batch_moments(prices))
+
+        if self.sample.size < self.sample_size:
+            needed = self.sample_size - self.sample.size
+            self.sample = np.concatenate([self.sample, prices[:needed]])
+
+    def merge(self, other):
+        """
+        Merges another accumulator built on the same grid into this one.
+
+        Args:
+            other (TerminalAccumulator): The accumulator to merge.
+
+        Returns:
+            TerminalAccumulator: self, to allow chaining.
+        """
+        if (self.num_bins, self.log_low, self.log_high) != (other.num_bins, other.log_low, other.log_high):
+            raise ValueError("Cannot merge accumulators built on different grids.")
+        self.bin_counts += other.bin_counts
+        self.bin_sums += other.bin_sums
+        self.below = self._keep_outside(self.below, other.below, 0)
+        self.above = self._keep_outside(self.above, other.above, -1)
+        self.clipped += other.clipped
+        self.threshold_counts += other.threshold_counts
+        self.loss_count += other.loss_count
+        self.moments = _merge_moments(self.moments, other.moments)
+        if self.sample.size < self.sample_size:
+            needed = self.sample_size - self.sample.size
+            self.sample = np.concatenate([self.sample, other.sample[:needed]])
+        return self
+
+    def _order_statistic(self, k, below, above, cumulative):
+        """Returns an approximation of the k-th smallest terminal price (0-based integer rank)."""
+        if k < below.size:
+            return below[k]
+        inside_rank = k - below.size
+        total_inside = cumulative[-1] if cumulative.size else 0
+        if inside_rank < total_inside:
+            # Treat the values of a bin as evenly spread over its log-return range
+            b = int(np.searchsorted(cumulative, inside_rank, side='right'))
+            before = cumulative[b - 1] if b > 0 else 0
+            fraction = (inside_rank - before + 0.5) / self.bin_counts[b]
+            return self.start_price * np.exp(self.log_low + (b + fraction) * self.bin_width)
+        return above[min(inside_rank - total_inside, above.size - 1)]
+
+    def _price_at_rank(self, rank):
+        """
+        Returns an approximation of the order statistic with (0-based, fractional) rank.
+
+        Like pandas, a fractional rank interpolates linearly between the two
+        neighbouring order statistics; each of them is within one bin of the
+        true value, so the interpolated price is too.
+        """
+        below, above = np.sort(self.below), np.sort(self.above)
+        cumulative = np.cumsum(self.bin_counts)
+        lower = int(np.floor(rank))
+        value = self._order_statistic(lower, below, above, cumulative)
+        if rank > lower and lower + 1 < self.count:
+            upper_value = self._order_statistic(lower + 1, below, above, cumulative)
+            value += (rank - lower) * (upper_value - value)
+        return value
+
+    def quantile(self, q):
+        """
+        Approximates the q-th quantile of the terminal prices (linear interpolation, like pandas).
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The approximate quantile.
+        """
+        return float(self._price_at_rank(q * (self.count - 1)))
+
+    def tail_mean(self, q):
+        """
+        Approximates the mean of the terminal prices at or below the q-th quantile.
+
+        Like the in-memory analyzer, this averages the floor(q * (n - 1)) + 1
+        smallest prices. Bins below the cutoff contribute their exact sums and
+        the bin holding the cutoff its mean price, so the result is within one
+        bin of the exact tail mean.
+
+        Args:
+            q (float): The tail probability, e.g. 0.05 for CVaR 95%.
+
+        Returns:
+            float: The mean terminal price of the lower tail.
+        """
+        if self.count == 0:
+            return float('nan')
+        tail_size = int(np.floor(q * (self.count - 1))) + 1
+        needed = tail_size
+        below = np.sort(self.below)[:needed]
+        total = below.sum()
+        needed -= below.size
+
+        if needed > 0:
+            cumulative = np.cumsum(self.bin_counts)
+            full_bins = int(np.searchsorted(cumulative, needed, side='right'))
+            taken = cumulative[full_bins - 1] if full_bins > 0 else 0
+            total += self.bin_sums[:full_bins].sum()
+            if full_bins < self.num_bins and needed > taken:
+                # Take the matching share of the bin holding the cutoff
+                total += (needed - taken) / self.bin_counts[full_bins] * self.bin_sums[full_bins]
+                taken = needed
+            needed -= taken
+        if needed > 0:
+            total += np.sort(self.above)[:needed].sum()
+        return float(total / tail_size)
+
+    def mean(self):
+        return float(self.moments[1])
+
+    def std(self, ddof=1):
+        n, _, m2, _, _ = self.moments
+        return float(np.sqrt(m2 / (n - ddof)))
+
+    def skewness(self):
+        """Returns the biased sample skewness (same as scipy.stats.skew)."""
+        n, _, m2, m3, _ = self.moments
+        return float(np.sqrt(n) * m3 / m2 ** 1.5)
+
+    def kurtosis(self):
+        """Returns the biased Fisher kurtosis (same as scipy.stats.kurtosis)."""
+        n, _, m2, _, m4 = self.moments
+        return float(n * m4 / (m2 * m2) - 3.0)
+
+    def prob_above(self, threshold):
+        """Returns the fraction of terminal prices above start_price * (1 + threshold)."""
+        return float(self.threshold_counts[self.thresholds.index(threshold)] / self.count)
+
+    def prob_loss(self):
+        return float(self.loss_count / self.count)
+
+
+class DailyBandAccumulator:
+    """
+    Online per-day summary of simulated paths for the visualizer.
+
+    Every day keeps its own log-return histogram (with grid bounds that widen
+    with the horizon) plus a running sum, so per-day percentiles and means can
+    be produced without the full path matrix. The first `num_sample_paths`
+    paths are kept as-is for plotting.
+
+    Attributes:
+        start_price (float): The starting price of the asset.
+        sample_paths (np.ndarray): The kept sample paths, shape (forecast_period, k).
+    """
+
+    def __init__(self, start_price, log_lows, log_highs, num_bins=4096, num_sample_paths=100):
+        self.start_price = float(start_price)
+        self.log_lows = np.asarray(log_lows, dtype=np.float64)
+        self.log_highs = np.asarray(log_highs, dtype=np.float64)
+        self.num_bins = int(num_bins)
+        self.num_sample_paths = int(num_sample_paths)
+
+        self.forecast_period = self.log_lows.size
+        self.bin_widths = (self.log_highs - self.log_lows) / self.num_bins
+        self.bin_counts = np.zeros((self.forecast_period, self.num_bins), dtype=np.int64)
+        self.sums = np.zeros(self.forecast_period)
+        self.count = 0
+        self.sample_paths = np.empty((self.forecast_period, 0))
+
+    def update(self, paths):
+        """
+        Folds a batch of paths into the accumulator.
+
+        Args:
+            paths (np.ndarray): Simulated prices of shape (forecast_period, batch_size).
+        """
+        batch_size = paths.shape[1]
+        position = np.log(paths / self.start_price)
+        position -= self.log_lows[:, None]
+        position /= self.bin_widths[:, None]
+        # Values outside the grid land in the edge bins; only the tails are affected
+        idx = np.clip(position, 0, self.num_bins - 1).astype(np.int64)
+        idx += (np.arange(self.forecast_period) * self.num_bins)[:, None]
+        self.bin_counts += np.bincount(idx.ravel(), minlength=self.bin_counts.size).reshape(self.bin_counts.shape)
+
+        self.sums += paths.sum(axis=1)
+        self.count += batch_size
+
+        if self.sample_paths.shape[1] < self.num_sample_paths:
+            needed = self.num_sample_paths - self.sample_paths.shape[1]
+            self.sample_paths = np.hstack([self.sample_paths, paths[:, :needed]])
+
+    def merge(self, other):
+        """Merges another accumulator built on the same grid into this one and returns self."""
+        self.bin_counts += other.bin_counts
+        self.sums += other.sums
+        self.count += other.count
+        if self.sample_paths.shape[1] < self.num_sample_paths:
+            needed = self.num_sample_paths - self.sample_paths.shape[1]
+            self.sample_paths = np.hstack([self.sample_paths, other.sample_paths[:, :needed]])
+        return self
+
+    def mean(self):
+        """np.ndarray: The mean simulated price of every day."""
+        return self.sums / self.count
+
+    def percentile(self, p):
+        """
+        Approximates the p-th percentile of every day.
+
+        Args:
+            p (float): The percentile, between 0 and 100.
+
+        Returns:
+            np.ndarray: One approximate percentile per day.
+        """
+        rank = p / 100 * (self.count - 1)
+        cumulative = np.cumsum(self.bin_counts, axis=1)
+        bins = (cumulative <= rank).sum(axis=1)
+        bins = np.minimum(bins, self.num_bins - 1)
+        before = np.where(bins > 0, cumulative[np.arange(self.forecast_period), bins - 1], 0)
+        in_bin = self.bin_counts[np.arange(self.forecast_period), bins]
+        fraction = np.clip((rank - before + 0.5) / np.maximum(in_bin, 1), 0, 1)
+        log_return = self.log_lows + (bins + fraction) * self.bin_widths
+        return self.start_price * np.exp(log_return)
+
+
+class StreamingSummary:
+    """
+    Result of a streaming simulation: terminal and per-day accumulators.
+
+    Can be passed to `analyzer.analyze_simulation_results` in place of the
+    full simulations DataFrame.
+
+    Attributes:
+        terminal (TerminalAccumulator): Summary of the terminal prices.
+        daily (DailyBandAccumulator): Per-day summary for the visualizer.
+    """
+
+    def __init__(self, terminal, daily):
+        self.terminal = terminal
+        self.daily = daily
+
+    @property
+    def shape(self):
+        """tuple: (forecast_period, num_simulations), mirroring the full path matrix."""
+        return (self.daily.forecast_period, self.terminal.count)
+
+    def merge(self, other):
+        self.terminal.merge(other.terminal)
+        self.daily.merge(other.daily)
+        return self
+
+
+def new_streaming_summary(start_price, drift, volatility, forecast_period=252,
+                          terminal_bins=2 ** 16, daily_bins=4096, num_sample_paths=100,
+                          sample_size=10000, max_outside=DEFAULT_MAX_OUTSIDE):
+    """
+    Creates an empty StreamingSummary with grids sized for a GBM forecast.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The daily drift of the log returns.
+        volatility (float): The daily volatility of the log returns.
+        forecast_period (int): The number of simulated days (including day 0).
+        terminal_bins (int): Number of bins of the terminal price grid.
+        daily_bins (int): Number of bins of every per-day grid.
+        num_sample_paths (int): Number of full paths kept for plotting.
+        sample_size (int): Number of terminal prices kept for plotting.
+        max_outside (int): Terminal prices outside the grid kept exactly, per side.
+
+    Returns:
+        StreamingSummary: The empty accumulators.
+    """
+    log_lows, log_highs = gbm_log_bounds(drift, volatility, forecast_period)
+    terminal = TerminalAccumulator(start_price, log_lows[-1], log_highs[-1], num_bins=terminal_bins,
+                                   sample_size=sample_size, max_outside=max_outside)
+    daily = DailyBandAccumulator(start_price, log_lows, log_highs, num_bins=daily_bins,
+                                 num_sample_paths=num_sample_paths)
+    return StreamingSummary(terminal, daily)
+
+
+def run_streaming_simulation(start_price, drift, volatility, forecast_period=252, num_simulations=10000,
+                             batch_size=100000, dtype=np.float64, rng=None, track_daily=True, **grid_options):
+    """
+    Runs a GBM Monte Carlo simulation in fixed-size batches without keeping the path matrix.
+
+    Each batch is generated with `simulate_gbm_paths`, folded into the online
+    accumulators and discarded, so memory stays at about one
+    forecast_period x batch_size array regardless of num_simulations.
+
+    Args:
+        start_price (float): The starting price of the asset.
+        drift (float): The drift component of the asset's returns.
+        volatility (float): The volatility of the asset's returns.
+        forecast_period (int): The number of trading days to forecast.
+        num_simulations (int): The total number of simulations to run.
+        batch_size (int): The number of paths generated per batch.
+        dtype (np.dtype): Floating point type of every batch.
+        rng (np.random.Generator, int or None): Random generator or seed.
+        track_daily (bool): If False, skip the per-day accumulator (terminal metrics only).
+        **grid_options: Passed on to `new_streaming_summary`.
+
+    Returns:
+        StreamingSummary: The accumulated summary of all simulated paths.
+    """
+    rng = np.random.default_rng(rng)
+    summary = new_streaming_summary(start_price, drift, volatility, forecast_period, **grid_options)
+
+    remaining = num_simulations
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        batch = simulate_gbm_paths(start_price, drift, volatility, forecast_period, size,
+                                   dtype=dtype, rng=rng)
+        summary.terminal.update(batch.final_prices)
+        if track_daily:
+            summary.daily.update(batch.paths)
+        remaining -= size
+
+    return summary
+
+
+if __name__ == '__main__':
+    # Example usage with made-up parameters
+    from analyzer import analyze_simulation_results
+
+    summary = run_streaming_simulation(start_price=80.0, drift=0.0003, volatility=0.015,
+                                       num_simulations=1000000, batch_size=100000, rng=42)
+    analysis_results = analyze_simulation_results(summary, 80.0)
+
+    print(f"Streamed {summary.shape[1]} paths over {summary.shape[0]} days.")
+    for section, metrics in analysis_results.items():
+        if section != 'final_prices':
+            print(f"\n----- {section.replace('_', ' ').title()} -----")
+            for key, value in metrics.items():
+                print(f"{key}: {value:.4f}")
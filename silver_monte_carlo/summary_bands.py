@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Percentiles needed by the fan chart and the simulation-paths plot
+DEFAULT_BAND_PERCENTILES = (5, 20, 50, 80, 95)
+
+
+class SummaryBands:
+    """
+    Per-day summary of a simulation: percentile bands, mean and a few sample paths.
+
+    Computed once per run and shared by every plot, so rendering cost does
+    not depend on the number of simulated paths.
+
+    Attributes:
+        days (np.ndarray): The trading day of every row.
+        percentiles (tuple): The percentiles stored in `bands`.
+        bands (np.ndarray): Shape (len(percentiles), len(days)); one row per percentile.
+        mean (np.ndarray): The mean price of every day.
+        sample_paths (np.ndarray): Shape (len(days), k); the first k simulated paths.
+    """
+
+    def __init__(self, days, percentiles, bands, mean, sample_paths):
+        self.days = np.asarray(days)
+        self.percentiles = tuple(percentiles)
+        self.bands = bands
+        self.mean = mean
+        self.sample_paths = sample_paths
+
+    def band(self, percentile):
+        """
+        Returns one percentile band.
+
+        Args:
+            percentile (float): One of `percentiles`.
+
+        Returns:
+            pd.Series: The percentile of every day, indexed by day.
+        """
+        if percentile not in self.percentiles:
+            raise KeyError(f"Percentile {percentile} was not computed; available: {self.percentiles}.")
+        return pd.Series(self.bands[self.percentiles.index(percentile)], index=self.days)
+
+    @property
+    def median(self):
+        return self.band(50)
+
+
+def _paths_and_days(simulations):
+    """Returns (paths ndarray, days) for a DataFrame, SimulationResult, SimulationStore or ndarray."""
+    if isinstance(simulations, pd.DataFrame):
+        return simulations.to_numpy(), simulations.index.to_numpy()
+    if isinstance(simulations, np.ndarray):
+        return simulations, np.arange(simulations.shape[0])
+    return simulations.paths, simulations.days
+
+
+def compute_summary_bands(simulations, percentiles=DEFAULT_BAND_PERCENTILES, num_sample_paths=100,
+                          max_chunk_elements=2 ** 24):
+    """
+    Computes every requested percentile band in one partition-based pass over the paths.
+
+    All percentiles of a day are found with a single `np.quantile` call (one
+    partition per day instead of one sort per percentile), processing a few
+    days at a time so the temporary copy stays below max_chunk_elements.
+
+    Args:
+        simulations (pd.DataFrame, SimulationResult, SimulationStore or np.ndarray): Simulated
+            paths of shape (days, paths).
+        percentiles (sequence): Percentiles to compute, between 0 and 100.
+        num_sample_paths (int): Number of paths kept for plotting.
+        max_chunk_elements (int): Upper bound on the elements processed per chunk.
+
+    Returns:
+        SummaryBands: The per-day summary.
+    """
+    paths, days = _paths_and_days(simulations)
+    num_days, num_paths = paths.shape
+    quantiles = np.asarray(percentiles, dtype=np.float64) / 100
+
+    bands = np.empty((len(quantiles), num_days))
+    mean = np.empty(num_days)
+    rows_per_chunk = max(1, max_chunk_elements // max(num_paths, 1))
+    for first in range(0, num_days, rows_per_chunk):
+        chunk = np.asarray(paths[first:first + rows_per_chunk], dtype=np.float64)
+        bands[:, first:first + rows_per_chunk] = np.quantile(chunk, quantiles, axis=1)
+        mean[first:first + rows_per_chunk] = chunk.mean(axis=1)
+
+    sample_paths = np.array(paths[:, :num_sample_paths], dtype=np.float64)
+    return SummaryBands(days, percentiles, bands, mean, sample_paths)
+
+
+def bands_from_streaming(summary, percentiles=DEFAULT_BAND_PERCENTILES):
+    """
+    Builds SummaryBands from a streaming_simulator.StreamingSummary without any path matrix.
+
+    Args:
+        summary (StreamingSummary): The result of a streaming or parallel run.
+        percentiles (sequence): Percentiles to compute, between 0 and 100.
+
+    Returns:
+        SummaryBands: The per-day summary (percentiles accurate to within one histogram bin).
+    """
+    daily = summary.daily
+    bands = np.vstack([daily.percentile(p) for p in percentiles])
+    return SummaryBands(np.arange(daily.forecast_period), percentiles, bands, daily.mean(),
+                        daily.sample_paths)
+
+
+def as_summary_bands(simulations, percentiles=DEFAULT_BAND_PERCENTILES):
+    """Returns `simulations` if it already is SummaryBands, otherwise computes them."""
+    if isinstance(simulations, SummaryBands):
+        return simulations
+    if hasattr(simulations, 'daily'):
+        return bands_from_streaming(simulations, percentiles)
+    return compute_summary_bands(simulations, percentiles)
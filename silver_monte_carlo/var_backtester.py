@@ -0,0 +1,265 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.special import xlogy
+from scipy.stats import chi2
+
+from monte_carlo_simulator import run_monte_carlo_simulation, calibrate_model
+from bootstrap_simulator import BlockBootstrapModel
+
+DEFAULT_LEVELS = (0.95, 0.99)
+DEFAULT_WINDOWS_PER_TASK = 64
+
+
+def rolling_moments(values, window):
+    """
+    Computes the mean and sample standard deviation of every trailing window in O(n).
+
+    Window sums come from differences of cumulative sums of the values and
+    their squares; the values are shifted by their overall mean first so
+    the cumulative sums stay small and the variance does not lose precision.
+
+    Args:
+        values (np.ndarray): 1-D series, e.g. daily log returns.
+        window (int): Window length.
+
+    Returns:
+        tuple: (mean, std) arrays of length len(values) - window + 1; entry i covers
+        values[i:i + window].
+    """
+    values = np.asarray(values, dtype=np.float64)
+    shift = values.mean()
+    centered = values - shift
+    sums = np.concatenate(([0.0], np.cumsum(centered)))
+    squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    window_sums = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    variance = np.maximum(window_squares - window_sums ** 2 / window, 0.0) / (window - 1)
+    return window_sums / window + shift, np.sqrt(variance)
+
+
+def kupiec_test(breaches, level):
+    """
+    Kupiec proportion-of-failures test of the breach rate.
+
+    Args:
+        breaches (np.ndarray): Boolean breach indicators.
+        level (float): VaR confidence level, e.g. 0.99 (expected breach rate 1%).
+
+    Returns:
+        dict: 'statistic' (likelihood ratio, chi-squared with 1 dof) and 'p_value'.
+    """
+    n = breaches.size
+    x = int(np.count_nonzero(breaches))
+    p = 1 - level
+    observed = x / n
+    log_likelihood_ratio = xlogy(n - x, 1 - p) + xlogy(x, p) - xlogy(n - x, 1 - observed) - xlogy(x, observed)
+    statistic = max(-2 * log_likelihood_ratio, 0.0)
+    return {'statistic': statistic, 'p_value': chi2.sf(statistic, 1)}
+
+
+def christoffersen_test(breaches):
+    """
+    Christoffersen test of the independence of consecutive breaches.
+
+    Compares a first-order Markov chain of the breach indicator with an
+    independent (constant-probability) one, so breaches that cluster in
+    volatile periods are rejected even when their overall rate is right.
+
+    Args:
+        breaches (np.ndarray): Boolean breach indicators in time order.
+
+    Returns:
+        dict: 'statistic' (likelihood ratio, chi-squared with 1 dof) and 'p_value'.
+    """
+    previous, current = breaches[:-1], breaches[1:]
+    n00 = np.count_nonzero(~previous & ~current)
+    n01 = np.count_nonzero(~previous & current)
+    n10 = np.count_nonzero(previous & ~current)
+    n11 = np.count_nonzero(previous & current)
+    pi01 = n01 / max(n00 + n01, 1)
+    pi11 = n11 / max(n10 + n11, 1)
+    pi = (n01 + n11) / max(n00 + n01 + n10 + n11, 1)
+    independent = xlogy(n00 + n10, 1 - pi) + xlogy(n01 + n11, pi)
+    markov = xlogy(n00, 1 - pi01) + xlogy(n01, pi01) + xlogy(n10, 1 - pi11) + xlogy(n11, pi11)
+    statistic = max(-2 * (independent - markov), 0.0)
+    return {'statistic': statistic, 'p_value': chi2.sf(statistic, 1)}
+
+
+def coverage_tests(breaches, level):
+    """
+    Kupiec, Christoffersen and the combined conditional-coverage test of one VaR level.
+
+    Args:
+        breaches (np.ndarray): Boolean breach indicators in time order.
+        level (float): VaR confidence level.
+
+    Returns:
+        dict: Observation and breach counts, expected and observed breach rates,
+        and statistic / p-value of every test.
+    """
+    breaches = np.asarray(breaches, dtype=bool)
+    kupiec = kupiec_test(breaches, level)
+    independence = christoffersen_test(breaches)
+    conditional = kupiec['statistic'] + independence['statistic']
+    return {
+        'observations': breaches.size,
+        'breaches': int(np.count_nonzero(breaches)),
+        'expected_rate': 1 - level,
+        'observed_rate': breaches.mean(),
+        'kupiec_LR': kupiec['statistic'],
+        'kupiec_p_value': kupiec['p_value'],
+        'christoffersen_LR': independence['statistic'],
+        'christoffersen_p_value': independence['p_value'],
+        'conditional_coverage_LR': conditional,
+        'conditional_coverage_p_value': chi2.sf(conditional, 2),
+    }
+
+
+def _forecast_windows(task):
+    """Worker entry point: simulates the horizon return distribution of a block of rebalance dates."""
+    (log_returns, positions, drifts, volatilities, window, horizon, num_simulations, model,
+     block_length, levels, seed_sequences, dtype) = task
+    quantiles = 1 - np.asarray(levels)
+    var = np.empty((len(positions), len(levels)))
+    for i, (position, seed_sequence) in enumerate(zip(positions, seed_sequences)):
+        history = log_returns[position - window + 1:position + 1]
+        if model is None:
+            window_model = None
+        elif model == 'bootstrap':
+            window_model = BlockBootstrapModel.calibrate(history, block_length)
+        else:
+            window_model = calibrate_model(model, history)
+        # Returns are scale free, so every window starts at 1; GBM uses the terminal fast path
+        result = run_monte_carlo_simulation(1.0, drifts[i], volatilities[i], horizon + 1, num_simulations,
+                                            dtype=dtype, rng=np.random.default_rng(seed_sequence),
+                                            as_dataframe=False, checkpoints='terminal', model=window_model)
+        var[i] = np.quantile(result.final_prices, quantiles) - 1
+    return var
+
+
+class BacktestResult:
+    """
+    Outcome of a walk-forward VaR backtest.
+
+    Attributes:
+        frame (pd.DataFrame): One row per rebalance date with the calibrated drift and
+            volatility, the forecast 'VaR_95' / 'VaR_99', the realized horizon return and
+            the 'breach_95' / 'breach_99' indicators.
+        coverage (dict): Level label (e.g. 'VaR_99') -> coverage_tests output.
+        settings (dict): The backtest parameters.
+        seconds (float): Wall time of the backtest.
+    """
+
+    def __init__(self, frame, coverage, settings, seconds):
+        self.frame = frame
+        self.coverage = coverage
+        self.settings = settings
+        self.seconds = seconds
+
+    def coverage_frame(self):
+        """Returns the coverage tests as a DataFrame, one row per VaR level."""
+        return pd.DataFrame(self.coverage).T
+
+
+def _level_label(level):
+    return f"{level * 100:g}".replace('.', '_')
+
+
+def run_var_backtest(processed_data, window=500, horizon=1, step=1, num_simulations=10000, model=None,
+                     block_length=20, levels=DEFAULT_LEVELS, seed=0, num_workers=None,
+                     windows_per_task=DEFAULT_WINDOWS_PER_TASK, dtype=np.float32):
+    """
+    Walk-forward backtest of the simulated VaR against realized returns.
+
+    At every rebalance date t the model is calibrated on the `window` log
+    returns up to and including t (GBM drift and volatility for all dates
+    come from one vectorized rolling-moment pass; other models are fitted
+    per window), the return over the next `horizon` days is simulated, and
+    the realized return from t to t + horizon is checked against each VaR.
+    Blocks of rebalance dates run on a process pool; every date draws from
+    its own stream spawned from `np.random.SeedSequence(seed)`, so results
+    do not depend on num_workers or windows_per_task.
+
+    With horizon > step the forecast periods overlap and breaches are
+    autocorrelated by construction, which the Christoffersen test will flag;
+    use step >= horizon for a clean independence test.
+
+    Args:
+        processed_data (pd.DataFrame): Output of process_data ('Silver_INR_Gram', 'Log_Returns').
+        window (int): Trailing calibration window in trading days.
+        horizon (int): VaR horizon in trading days.
+        step (int): Trading days between rebalance dates.
+        num_simulations (int): Paths simulated per rebalance date.
+        model (str or None): None for GBM, a key of MODELS ('student_t', 'garch', ...) or 'bootstrap'.
+        block_length (int): Mean block length of the 'bootstrap' model.
+        levels (sequence): VaR confidence levels.
+        seed (int or None): Root seed.
+        num_workers (int or None): Number of processes (default: os.cpu_count()). 1 runs in-process.
+        windows_per_task (int): Rebalance dates per worker task.
+        dtype (np.dtype): Floating point type of the simulated prices.
+
+    Returns:
+        BacktestResult: Per-date forecasts and breaches, and the coverage tests.
+    """
+    started = time.perf_counter()
+    log_returns = processed_data['Log_Returns'].to_numpy(dtype=np.float64)
+    prices = processed_data['Silver_INR_Gram'].to_numpy(dtype=np.float64)
+    positions = np.arange(window - 1, len(prices) - horizon, step)
+    if positions.size == 0:
+        raise ValueError(f"Need more than window + horizon = {window + horizon} rows, got {len(prices)}.")
+
+    mean, std_dev = rolling_moments(log_returns, window)
+    volatilities = std_dev[positions - window + 1]
+    drifts = mean[positions - window + 1] - 0.5 * volatilities ** 2
+    realized = prices[positions + horizon] / prices[positions] - 1
+
+    seed_sequences = np.random.SeedSequence(seed).spawn(positions.size)
+    tasks = []
+    for first in range(0, positions.size, windows_per_task):
+        block = slice(first, first + windows_per_task)
+        tasks.append((log_returns, positions[block], drifts[block], volatilities[block], window, horizon,
+                      num_simulations, model, block_length, levels, seed_sequences[block], dtype))
+
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(tasks) == 1:
+        var = np.concatenate(list(map(_forecast_windows, tasks)))
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            var = np.concatenate(list(executor.map(_forecast_windows, tasks)))
+
+    frame = pd.DataFrame({'drift': drifts, 'volatility': volatilities}, index=processed_data.index[positions])
+    coverage = {}
+    for j, level in enumerate(levels):
+        label = _level_label(level)
+        frame[f'VaR_{label}'] = var[:, j]
+        frame[f'breach_{label}'] = realized < var[:, j]
+        coverage[f'VaR_{label}'] = coverage_tests(frame[f'breach_{label}'].to_numpy(), level)
+    frame.insert(2, 'realized_return', realized)
+
+    settings = {'window': window, 'horizon': horizon, 'step': step, 'num_simulations': num_simulations,
+                'model': model or 'gbm', 'levels': list(levels), 'seed': seed, 'rebalance_dates': positions.size}
+    return BacktestResult(frame, coverage, settings, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    # Example: backtest GBM and Student-t VaR on a synthetic history with a volatility regime change
+    from data_processor import process_data
+    from benchmark_suite import synthetic_market_data
+
+    silver_data, inr_data = synthetic_market_data(12, seed=3)
+    calm = slice(None, len(silver_data) // 2)
+    returns = np.log(silver_data['Close']).diff().fillna(0.0)
+    returns.iloc[calm] *= 0.5
+    silver_data['Close'] = silver_data['Close'].iloc[0] * np.exp(returns.cumsum())
+    processed_data, _ = process_data(silver_data, inr_data)
+
+    for model in (None, 'student_t'):
+        backtest = run_var_backtest(processed_data, window=250, model=model, num_simulations=5000)
+        print(f"{backtest.settings['model']}: {backtest.settings['rebalance_dates']} rebalance dates "
+              f"in {backtest.seconds:.1f}s")
+        print(backtest.coverage_frame()[['observations', 'breaches', 'expected_rate', 'observed_rate',
+                                         'kupiec_p_value', 'christoffersen_p_value']].to_string())
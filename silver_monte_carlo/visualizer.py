@@ -2,6 +2,32 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
+from matplotlib.collections import LineCollection
+from scipy.stats import gaussian_kde
+
+from summary_bands import as_summary_bands
+
+# KDEs are fitted on at most this many points; histograms always use every value
+KDE_MAX_SAMPLES = 20000
+# Number of probability levels used to draw an ECDF
+ECDF_POINTS = 1000
+
+
+def _histogram_with_kde(ax, values, bins, density=False):
+    """
+    Draws a histogram of all values plus a KDE fitted on a bounded, evenly strided subsample.
+
+    Binning is O(N), so the cost of the plot no longer grows with the KDE fit.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values, bins=bins, density=density)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.6, edgecolor='white')
+
+    step = max(1, values.size // KDE_MAX_SAMPLES)
+    kde = gaussian_kde(values[::step])
+    grid = np.linspace(edges[0], edges[-1], 512)
+    scale = 1.0 if density else values.size * (edges[1] - edges[0])
+    ax.plot(grid, kde(grid) * scale)
 
 def plot_historical_prices(data, save_path="visualizations"):
     """Plots historical silver prices with a trend line."""
@@ -53,21 +79,33 @@ def plot_rolling_volatility(data, save_path="visualizations"):
     plt.savefig(os.path.join(save_path, 'rolling_volatility.png'))
     plt.close()
 
-def plot_simulation_paths(simulations, analysis_results, save_path="visualizations"):
-    """Plots sample simulation paths with confidence intervals."""
+def plot_simulation_paths(bands, analysis_results, save_path="visualizations"):
+    """
+    Plots sample simulation paths with confidence intervals.
+
+    Args:
+        bands (SummaryBands): Precomputed per-day summary (the raw simulations are also
+            accepted and summarized on the fly).
+        analysis_results (dict): The analysis results.
+        save_path (str): Directory for the image.
+    """
     if not os.path.exists(save_path):
         os.makedirs(save_path)
-        
+
+    bands = as_summary_bands(bands)
+    num_paths = bands.sample_paths.shape[1]
+
     plt.figure(figsize=(12, 6))
-    # Plot a sample of paths
-    plt.plot(simulations.iloc[:, :100], color='grey', alpha=0.1)
-    
+    # Plot a sample of paths as a single collection
+    segments = np.stack([np.broadcast_to(bands.days, bands.sample_paths.T.shape), bands.sample_paths.T], axis=-1)
+    plt.gca().add_collection(LineCollection(segments, colors='grey', alpha=0.1))
+
     # Plot mean and confidence intervals
-    plt.plot(simulations.mean(axis=1), color='red', label='Mean Forecast')
-    plt.plot(simulations.quantile(0.05, axis=1), 'b--', label='5th Percentile')
-    plt.plot(simulations.quantile(0.95, axis=1), 'b--', label='95th Percentile')
+    plt.plot(bands.days, bands.mean, color='red', label='Mean Forecast')
+    plt.plot(bands.band(5), 'b--', label='5th Percentile')
+    plt.plot(bands.band(95), 'b--', label='95th Percentile')
 
-    plt.title('Monte Carlo Simulation of Silver Prices (100 Sample Paths)')
+    plt.title(f'Monte Carlo Simulation of Silver Prices ({num_paths} Sample Paths)')
     plt.xlabel('Days')
     plt.ylabel('Price (INR per Gram)')
     plt.legend()
@@ -84,7 +122,7 @@ def plot_final_price_distribution(analysis_results, save_path="visualizations"):
     preds = analysis_results['price_predictions']
 
     plt.figure(figsize=(10, 6))
-    sns.histplot(final_prices, bins=100, kde=True)
+    _histogram_with_kde(plt.gca(), final_prices, bins=100)
     
     plt.axvline(preds['5th_percentile'], color='red', linestyle='--', label=f"5th Percentile: {preds['5th_percentile']:.2f}")
     plt.axvline(preds['median_predicted_price'], color='green', linestyle='-', label=f"Median: {preds['median_predicted_price']:.2f}")
@@ -98,24 +136,33 @@ def plot_final_price_distribution(analysis_results, save_path="visualizations"):
     plt.savefig(os.path.join(save_path, 'final_price_distribution.png'))
     plt.close()
 
-def plot_fan_chart(simulations, save_path="visualizations"):
-    """Creates a fan chart showing confidence intervals over time."""
+def plot_fan_chart(bands, save_path="visualizations"):
+    """
+    Creates a fan chart showing confidence intervals over time.
+
+    Args:
+        bands (SummaryBands): Precomputed per-day summary (the raw simulations are also
+            accepted and summarized on the fly).
+        save_path (str): Directory for the image.
+    """
     if not os.path.exists(save_path):
         os.makedirs(save_path)
-        
+
+    bands = as_summary_bands(bands)
+
     plt.figure(figsize=(12, 6))
     
     percentiles = [5, 20, 50, 80, 95]
     colors = ['lightblue', 'skyblue', 'blue', 'skyblue', 'lightblue']
     
     for i in range(len(percentiles) - 1):
-        plt.fill_between(simulations.index, 
-                         simulations.quantile(percentiles[i]/100, axis=1), 
-                         simulations.quantile(percentiles[i+1]/100, axis=1), 
+        plt.fill_between(bands.days,
+                         bands.band(percentiles[i]),
+                         bands.band(percentiles[i+1]),
                          color=colors[i],
                          label=f'{percentiles[i]}-{percentiles[i+1]}th Percentile')
 
-    plt.plot(simulations.quantile(0.5, axis=1), color='darkblue', label='Median (50th Percentile)')
+    plt.plot(bands.median, color='darkblue', label='Median (50th Percentile)')
     
     plt.title('Fan Chart of Simulated Price Confidence Intervals')
     plt.xlabel('Days')
@@ -131,19 +178,20 @@ def plot_pdf_and_cdf(analysis_results, save_path="visualizations"):
         os.makedirs(save_path)
     
     final_prices = analysis_results['final_prices']
-    returns = final_prices / final_prices.iloc[0] - 1
+    returns = np.asarray(final_prices / final_prices.iloc[0] - 1)
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     
     # PDF
-    sns.histplot(returns, bins=50, kde=True, stat="density", ax=ax1)
+    _histogram_with_kde(ax1, returns, bins=50, density=True)
     ax1.set_title('Probability Density Function (PDF) of Returns')
     ax1.set_xlabel('Return')
     ax1.set_ylabel('Density')
     ax1.grid(True)
     
-    # CDF
-    sns.ecdfplot(returns, ax=ax2)
+    # CDF, drawn on a fixed grid of probability levels
+    levels = np.linspace(0, 1, ECDF_POINTS)
+    ax2.step(np.quantile(returns, levels), levels, where='post')
     ax2.set_title('Cumulative Distribution Function (CDF) of Returns')
     ax2.set_xlabel('Return')
     ax2.set_ylabel('Cumulative Probability')
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The project modules import each other by top-level name (e.g. `from analyzer import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "silver_monte_carlo"))
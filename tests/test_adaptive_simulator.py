@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from adaptive_simulator import TOLERANCE_METRICS, run_adaptive_simulation
+from analyzer import _point_estimates
+
+
+def test_tolerance_metrics_are_the_batch_estimates():
+    assert set(TOLERANCE_METRICS) == set(_point_estimates(np.array([1.0, 2.0, 3.0]), 2.0))
+
+
+def test_seeded_runs_are_reproducible():
+    runs = [run_adaptive_simulation(80.0, 0.0002, 0.015, 30, tolerances={'VaR_95': 0.004}, batch_size=2000,
+                                    seed=4, max_seconds=60) for _ in range(2)]
+    np.testing.assert_array_equal(runs[0].result.paths, runs[1].result.paths)
+    assert runs[0].report['batches'] == runs[1].report['batches']
+    assert runs[0].report['precision'] == runs[1].report['precision']
+    assert runs[0].report['seed'] == 4
+
+
+def test_stops_once_every_half_width_meets_its_target():
+    adaptive = run_adaptive_simulation(80.0, 0.0002, 0.015, 30, tolerances={'VaR_95': 0.004, 'prob_loss': 0.02},
+                                       batch_size=2000, min_batches=5, seed=1, max_seconds=60)
+    report = adaptive.report
+    assert report['stopped_because'] == 'converged'
+    assert report['batches'] >= 5
+    assert report['paths_used'] == report['batches'] * 2000 == adaptive.result.paths.shape[1]
+    assert all(p['converged'] and p['half_width'] <= p['tolerance'] for p in report['precision'].values())
+
+
+def test_tighter_targets_use_more_paths():
+    loose, tight = (run_adaptive_simulation(80.0, 0.0002, 0.015, 30, tolerances={'VaR_95': tolerance},
+                                            batch_size=2000, seed=1, max_seconds=60).report['paths_used']
+                    for tolerance in (0.008, 0.002))
+    assert tight > loose
+
+
+def test_path_budget_stops_an_unreachable_target():
+    report = run_adaptive_simulation(80.0, 0.0002, 0.015, 30, tolerances={'VaR_99': 1e-6}, batch_size=1000,
+                                     max_paths=8000, seed=1, max_seconds=60).report
+    assert report['stopped_because'] == 'max_paths'
+    assert report['paths_used'] <= 8000
+    assert not report['precision']['VaR_99']['converged']
+
+
+def test_unknown_tolerance_is_rejected():
+    with pytest.raises(ValueError, match='std_dev_forecast'):
+        run_adaptive_simulation(80.0, 0.0002, 0.015, 30, tolerances={'std_dev_forecast': 0.1})
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from analyzer import analyze_simulation_results
+from monte_carlo_simulator import run_monte_carlo_simulation
+
+
+@pytest.mark.parametrize('num_simulations', [1, 2, 3, 10, 30, 39, 40])
+def test_small_runs_are_analyzed(num_simulations):
+    simulations = run_monte_carlo_simulation(80.0, 0.0003, 0.015, 20, num_simulations, rng=0, as_dataframe=False)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        analysis = analyze_simulation_results(simulations, 80.0)
+    standard_errors = analysis['standard_errors']
+    assert np.isfinite(analysis['risk_metrics']['VaR_95'])
+    if num_simulations < 4:
+        assert all(np.isnan(value) for value in standard_errors.values())
+    else:
+        assert all(np.isfinite(value) for value in standard_errors.values())
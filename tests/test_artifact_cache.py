@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from artifact_cache import ArtifactCache, artifact_key
+
+
+def test_artifact_key_separates_element_boundaries():
+    modules = ['monte_carlo_simulator']
+    assert artifact_key('simulate', modules, {'checkpoints': [21, 42]}) != \
+        artifact_key('simulate', modules, {'checkpoints': [2, 142]})
+    assert artifact_key('simulate', modules, 2000000, 120) != artifact_key('simulate', modules, 20000001, 20)
+    assert artifact_key('simulate', modules, {'ab': 'c'}) != artifact_key('simulate', modules, {'a': 'bc'})
+
+
+def test_artifact_key_distinguishes_types():
+    modules = ['analyzer']
+    assert artifact_key('analyze', modules, 1) != artifact_key('analyze', modules, '1')
+    assert artifact_key('analyze', modules, (1, 2)) != artifact_key('analyze', modules, [1, 2])
+    assert artifact_key('analyze', modules, np.arange(3)) != artifact_key('analyze', modules, np.arange(3.0))
+
+
+def test_artifact_key_is_stable():
+    modules = ['analyzer']
+    inputs = {'seed': '7', 'checkpoints': 'monthly', 'paths': 10000}
+    assert artifact_key('analyze', modules, inputs) == artifact_key('analyze', modules, dict(inputs))
+
+
+def test_cache_round_trip_and_lru_eviction(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=10 ** 9)
+    assert cache.get_or_compute('simulate', 'a', lambda: np.arange(5)).tolist() == [0, 1, 2, 3, 4]
+    assert cache.get_or_compute('simulate', 'a', lambda: None).tolist() == [0, 1, 2, 3, 4]
+    assert cache.stats()['stages']['simulate']['hits'] == 1
+
+    entry_size = cache.size()
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    time.sleep(0.02)  # Last use is the file modification time
+    cache.put('simulate', 'b', np.arange(5))
+    time.sleep(0.02)
+    cache.get('simulate', 'a')  # 'a' is now the most recently used
+    time.sleep(0.02)
+    cache.put('simulate', 'c', np.arange(5))
+    assert cache.contains('simulate', 'a') and cache.contains('simulate', 'c')
+    assert not cache.contains('simulate', 'b')
+
+
+def test_uncacheable_values_are_computed_but_not_stored(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    assert cache.get_or_compute('simulate', 'a', lambda: 1, cacheable=False) == 1
+    assert cache.get_or_compute('simulate', 'a', lambda: 2, cacheable=False) == 2
+    assert cache.entries() == []
+    counts = cache.stats()['stages']['simulate']
+    assert (counts['hits'], counts['misses'], counts['uncacheable']) == (0, 0, 2)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from benchmark_suite import find_regressions, load_baseline, measure, save_baseline, synthetic_market_data
+
+
+def test_synthetic_data_is_reproducible_with_mismatched_calendars():
+    silver, inr = synthetic_market_data(2, seed=1)
+    again, _ = synthetic_market_data(2, seed=1)
+    assert silver.equals(again)
+    assert not silver.index.equals(inr.index)
+
+
+def test_measure_reports_time_and_peak_memory():
+    measurement = measure(lambda: np.ones(2 ** 20), repeats=2)
+    assert measurement['seconds'] > 0
+    assert measurement['peak_memory_mb'] >= 8
+    assert measure(lambda: None, track_memory=False)['peak_memory_mb'] is None
+
+
+def test_only_cases_beyond_the_thresholds_regress(tmp_path):
+    path = str(tmp_path / 'benchmarks' / 'baseline.json')
+    assert load_baseline(path) is None
+    save_baseline({'fast': {'seconds': 1.0, 'peak_memory_mb': 100.0},
+                   'slow': {'seconds': 1.0, 'peak_memory_mb': 100.0},
+                   'removed': {'seconds': 1.0, 'peak_memory_mb': None}}, path, profile='quick')
+    baseline = load_baseline(path)
+
+    results = {'fast': {'seconds': 1.2, 'peak_memory_mb': 110.0},
+               'slow': {'seconds': 1.5, 'peak_memory_mb': 200.0},
+               'added': {'seconds': 9.0, 'peak_memory_mb': None}}
+    regressions = find_regressions(results, baseline, threshold=0.25)
+    assert len(regressions) == 2 and all(message.startswith('slow:') for message in regressions)
+    assert find_regressions(results, baseline, threshold=0.25, memory_threshold=2.0) == [regressions[0]]
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from bootstrap_simulator import BlockBootstrapModel, run_bootstrap_simulation
+
+HISTORY = np.random.default_rng(0).normal(0.0002, 0.012, 500)
+
+
+def test_moving_blocks_are_consecutive_runs_of_history():
+    model = BlockBootstrapModel(HISTORY, block_length=10, method='moving')
+    indices = model.sample_indices(45, 200, np.random.default_rng(1))
+    assert indices.min() >= 0 and indices.max() < HISTORY.size
+    steps = np.diff(indices, axis=0)
+    within_block = (np.arange(1, 45) % 10 != 0)
+    assert (steps[within_block] == 1).all()
+
+
+def test_stationary_blocks_wrap_and_have_the_mean_length():
+    model = BlockBootstrapModel(HISTORY, block_length=20)
+    indices = model.sample_indices(252, 2000, np.random.default_rng(2))
+    assert indices.min() >= 0 and indices.max() < HISTORY.size
+    continues = np.diff(indices, axis=0) % HISTORY.size == 1
+    # A new block starts with probability 1/20 (plus rare random starts that happen to continue)
+    assert 1 - continues.mean() == pytest.approx(1 / 20, rel=0.05)
+
+
+def test_simulated_returns_are_drawn_from_the_history():
+    with_gaps = np.concatenate([HISTORY, [np.nan]])
+    result = run_bootstrap_simulation(with_gaps, 80.0, forecast_period=30, num_simulations=300, rng=4)
+    daily = np.diff(np.log(result.paths), axis=0)
+    assert np.isin(np.round(daily, 12), np.round(HISTORY, 12)).all()
+
+
+def test_seeded_runs_are_reproducible():
+    first, second, other = (run_bootstrap_simulation(HISTORY, 80.0, 30, 300, rng=seed) for seed in (5, 5, 6))
+    np.testing.assert_array_equal(first.paths, second.paths)
+    assert not np.array_equal(first.paths, other.paths)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        BlockBootstrapModel(HISTORY, method='circular')
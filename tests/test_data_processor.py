@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import IncrementalCalibrator, max_stats_difference, process_data
+
+
+def _market_data():
+    """Silver and USD/INR closes on different calendars, each with its own holidays."""
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2018-01-01", "2022-12-30")
+    silver_days = days.delete(rng.choice(len(days), 60, replace=False))
+    inr_days = days.delete(rng.choice(len(days), 80, replace=False)).union(
+        pd.date_range("2018-01-06", "2022-12-31", freq="W-SAT")[::5])
+    silver = 15 * np.exp(np.cumsum(rng.normal(0, 0.015, len(silver_days))))
+    inr = 70 * np.exp(np.cumsum(rng.normal(0, 0.003, len(inr_days))))
+    return (pd.DataFrame({"Close": silver}, index=silver_days),
+            pd.DataFrame({"Close": inr}, index=inr_days))
+
+
+def _batches(silver_data, inr_data, num_batches):
+    """Splits both frames at the same dates, so every batch covers one period of the combined calendar."""
+    dates = silver_data.index.union(inr_data.index)
+    for chunk in np.array_split(dates, num_batches):
+        yield (silver_data.loc[chunk[0]:chunk[-1]], inr_data.loc[chunk[0]:chunk[-1]])
+
+
+@pytest.mark.parametrize("num_batches", [1, 7, 40])
+def test_incremental_stats_match_full_recompute(num_batches):
+    silver_data, inr_data = _market_data()
+    processed, stats = process_data(silver_data, inr_data)
+
+    calibrator = IncrementalCalibrator(window=60)
+    rows = [calibrator.update(silver, inr) for silver, inr in _batches(silver_data, inr_data, num_batches)]
+    incremental = pd.concat(rows)
+
+    assert max_stats_difference(stats, calibrator.stats) < 1e-12
+    pd.testing.assert_index_equal(incremental.index, processed.index)
+    np.testing.assert_allclose(incremental['Log_Returns'], processed['Log_Returns'], rtol=1e-12)
+    expected_volatility = processed['Log_Returns'].iloc[-60:].std() * np.sqrt(252)
+    assert calibrator.rolling_volatility() == pytest.approx(expected_volatility, rel=1e-12)
+
+
+def test_bars_already_processed_are_ignored():
+    silver_data, inr_data = _market_data()
+    _, stats = process_data(silver_data, inr_data)
+    calibrator = IncrementalCalibrator()
+    calibrator.update(silver_data, inr_data)
+    assert calibrator.update(silver_data.iloc[-50:], inr_data.iloc[-50:]).empty
+    assert max_stats_difference(stats, calibrator.stats) < 1e-12
+
+
+def test_json_round_trip_continues_identically(tmp_path):
+    silver_data, inr_data = _market_data()
+    first, second = list(_batches(silver_data, inr_data, 2))
+    calibrator = IncrementalCalibrator(window=60)
+    calibrator.update(*first)
+
+    path = tmp_path / "calibrator.json"
+    calibrator.save(str(path))
+    restored = IncrementalCalibrator.load(str(path))
+    assert restored.to_dict() == calibrator.to_dict()
+
+    calibrator.update(*second)
+    restored.update(*second)
+    assert restored.stats == calibrator.stats
+    assert restored.rolling_volatility() == calibrator.rolling_volatility()
+
+
+def test_empty_calibrator_round_trips():
+    restored = IncrementalCalibrator.from_dict(IncrementalCalibrator(window=5).to_dict())
+    assert restored.count == 0 and restored.last_date is None and np.isnan(restored.last_price)
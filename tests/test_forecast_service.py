@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmark_suite import synthetic_market_data
+from forecast_service import ForecastService
+
+
+@pytest.fixture(scope='module')
+def service():
+    service = ForecastService(*synthetic_market_data(3, seed=0), max_workers=1)
+    yield service
+    service.close()
+
+
+async def _request(port, request):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    writer.close()
+    return int(status_line.split(b' ', 2)[1]), json.loads(body)
+
+
+def _post(service, body):
+    async def run():
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await _request(port, (f"POST /forecast HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                                         f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('body', [b'{"paths": 100', b'[1, 2]', b'\xff\xfe'])
+def test_malformed_post_body_is_a_bad_request(service, body):
+    status, payload = _post(service, body)
+    assert status == 400
+    assert 'Malformed request body' in payload['error']
+
+
+@pytest.mark.parametrize('query', [{'variance_reduction': 'antithetic,sobol'},
+                                   {'variance_reduction': 'moment_matching,sobol'},
+                                   {'variance_reduction': 'antithetic', 'model': 'student_t'},
+                                   {'variance_reduction': 'lhs'}])
+def test_unsupported_variance_reduction_is_a_bad_request(service, query):
+    status, payload = _post(service, json.dumps(dict(query, paths=100, days=10, seed=1)).encode())
+    assert status == 400, payload
+
+
+def test_concurrent_waiters_receive_the_complete_result(service):
+    params = service.parse_forecast_query({'paths': '200', 'days': '10', 'seed': '5'})
+
+    async def run():
+        return await asyncio.gather(*(service.forecast(params) for _ in range(3)))
+
+    first, *waiters = asyncio.run(run())
+    assert not first['cached'] and all(waiter['cached'] for waiter in waiters)
+    for result in (first, *waiters):
+        assert result['calibration_hash'] == service.calibration_hash
+        assert result['parameters'] == params
+        assert result['risk_metrics'] == first['risk_metrics']
+    assert not service._in_flight
+
+
+def test_every_model_is_calibrated_at_startup(service):
+    assert set(service._models) == {'gbm', 'student_t', 'garch', 'merton', 'bootstrap'}
+    assert service.model('gbm') is None
+    assert all(service.model(name) is not None for name in ('student_t', 'garch', 'merton', 'bootstrap'))
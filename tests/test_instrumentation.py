@@ -0,0 +1,39 @@
+import tracemalloc
+
+from instrumentation import RunInstrumentation
+
+
+def test_close_only_stops_tracing_it_started():
+    assert not tracemalloc.is_tracing()
+    outer = RunInstrumentation()
+    inner = RunInstrumentation()
+    inner.close()
+    assert tracemalloc.is_tracing()
+    outer.close()
+    assert not tracemalloc.is_tracing()
+
+
+def test_close_leaves_the_callers_tracing_running():
+    tracemalloc.start()
+    try:
+        RunInstrumentation().close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_nested_stage_peaks():
+    instrumentation = RunInstrumentation()
+    try:
+        with instrumentation.stage('outer'):
+            buffer = bytearray(8 * 2 ** 20)
+            del buffer
+            with instrumentation.stage('inner'):
+                small = bytearray(2 ** 20)
+                del small
+    finally:
+        instrumentation.close()
+    peaks = {record.name: record.peak_memory_mb for record in instrumentation.stages}
+    assert 1 <= peaks['inner'] < 4
+    assert peaks['outer'] >= 8
+    assert instrumentation.manifest()['stages'][0]['parent'] == 'outer'
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data_store import InMemorySource, MarketDataStore
+
+
+def _source():
+    dates = pd.bdate_range("2015-01-01", "2024-12-31")
+    prices = 15 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.015, len(dates))))
+    return InMemorySource({"SI=F": pd.DataFrame({"Close": prices}, index=dates)})
+
+
+def test_later_historical_end_is_fetched_while_cache_is_fresh(tmp_path):
+    source = _source()
+    store = MarketDataStore(str(tmp_path), source=source, max_age=timedelta(hours=12))
+    first = store.get("SI=F", "2015-01-01", "2020-01-01")
+    assert first.index[-1] == pd.Timestamp("2019-12-31")
+
+    second = store.get("SI=F", "2015-01-01", "2024-01-01")
+    assert second.index[-1] == pd.Timestamp("2023-12-29")
+    assert len(source.calls) == 2
+    assert source.calls[1] == ("SI=F", "2019-12-29", "2024-01-01")
+
+    # The extended range is now covered, so no further fetch is needed
+    store.get("SI=F", "2018-01-01", "2024-01-01")
+    assert len(source.calls) == 2
+
+
+def test_fresh_cache_up_to_today_is_not_topped_up(tmp_path):
+    source = _source()
+    store = MarketDataStore(str(tmp_path), source=source, max_age=timedelta(hours=12))
+    store.get("SI=F", "2015-01-01")
+    store.get("SI=F", "2015-01-01")
+    assert len(source.calls) == 1
+
+
+def test_files_without_a_stored_ticker_fall_back_to_the_file_name(tmp_path):
+    store = MarketDataStore(str(tmp_path), source=_source())
+    frame = store.get("SI=F", "2015-01-01", "2016-01-01")
+    path = store._path("SI=F")
+    # Rewrite the file in the original format, which did not store the ticker
+    with np.load(path, allow_pickle=False) as stored:
+        arrays = {name: stored[name] for name in stored.files if name != 'ticker'}
+    np.savez(path, **arrays)
+
+    loaded, metadata = store.load_file(path)
+    assert metadata['ticker'] == "SI_F"
+    np.testing.assert_array_equal(loaded['Close'].to_numpy(), frame['Close'].to_numpy())
+    assert set(InMemorySource.from_store(str(tmp_path)).frames) == {"SI_F"}
+
+
+def test_replayed_store_serves_cached_tickers_and_simulated_failures(tmp_path):
+    MarketDataStore(str(tmp_path), source=_source()).get("SI=F", "2015-01-01", "2016-01-01")
+    replay = InMemorySource.from_store(str(tmp_path), failures={"SI=F": 1})
+    with pytest.raises(ConnectionError):
+        replay.fetch("SI=F", "2015-01-01", "2016-01-01")
+    assert len(replay.fetch("SI=F", "2015-06-01", "2016-01-01")) > 100
+    assert replay.max_in_flight == 1 and len(replay.timings) == 2
+
+
+def test_request_after_the_cached_range_fills_the_gap(tmp_path):
+    source = _source()
+    store = MarketDataStore(str(tmp_path), source=source, max_age=timedelta(hours=12))
+    store.get("SI=F", "2015-01-01", "2016-01-01")
+    store.get("SI=F", "2018-01-01", "2019-01-01")
+    assert source.calls[1] == ("SI=F", "2015-12-29", "2019-01-01")
+
+    merged = store.get("SI=F", "2015-01-01", "2019-01-01")
+    expected = source.frames["SI=F"].loc["2015-01-01":"2018-12-31"]
+    assert len(source.calls) == 2
+    assert len(merged) == len(expected)
+    np.testing.assert_array_equal(merged['Close'].to_numpy(), expected['Close'].to_numpy())
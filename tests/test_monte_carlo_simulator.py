@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from monte_carlo_simulator import calibrate_model, run_monte_carlo_simulation, simulate_model_paths
+
+
+def _log_returns():
+    return np.random.default_rng(0).standard_t(5, 2000) * 0.01
+
+
+@pytest.mark.parametrize('name', ['student_t', 'garch', 'merton'])
+def test_model_checkpoints_keep_only_the_stored_days(name):
+    model = calibrate_model(name, _log_returns())
+    full = simulate_model_paths(model, 80.0, 64, 500, rng=3)
+    monthly = run_monte_carlo_simulation(80.0, 0.0, 0.0, 64, 500, rng=3, as_dataframe=False, model=model,
+                                         checkpoints='monthly')
+    assert list(monthly.days) == [0, 21, 42, 63]
+    # A single block of paths draws the same stream as the full matrix
+    np.testing.assert_array_equal(monthly.paths, full.paths[monthly.days])
+
+
+def test_model_checkpoints_are_simulated_in_blocks():
+    model = calibrate_model('student_t', _log_returns())
+    terminal = simulate_model_paths(model, 80.0, 64, 1000, rng=3, checkpoints='terminal', max_chunk_elements=64 * 64)
+    assert terminal.paths.shape == (2, 1000)
+    assert np.all(terminal.paths[0] == 80.0)
+    assert np.unique(terminal.final_prices).size == 1000
+
+
+def test_variance_reduction_with_a_model_is_rejected():
+    model = calibrate_model('student_t', _log_returns())
+    with pytest.raises(ValueError, match='only supported for GBM'):
+        run_monte_carlo_simulation(80.0, 0.0, 0.0, 64, 100, model=model, variance_reduction='antithetic')
+
+
+@pytest.mark.parametrize('num_simulations', [1, 2, 3, 17, 31])
+def test_moment_matching_with_tiny_replicate_blocks_stays_finite(num_simulations):
+    result = run_monte_carlo_simulation(80.0, 0.0, 0.01, 30, num_simulations, rng=3, as_dataframe=False,
+                                        variance_reduction='moment_matching', num_replicates=16)
+    assert np.isfinite(result.paths).all()
+
+
+def test_moment_matching_blocks_have_unit_variance():
+    result = run_monte_carlo_simulation(80.0, 0.0, 0.01, 30, 64, rng=3, as_dataframe=False,
+                                        variance_reduction='moment_matching', num_replicates=4)
+    shocks = np.diff(np.log(result.paths), axis=0)[:, :16] / 0.01
+    np.testing.assert_allclose(shocks.mean(axis=1), 0.0, atol=1e-12)
+    np.testing.assert_allclose(shocks.std(axis=1), 1.0, rtol=1e-9)
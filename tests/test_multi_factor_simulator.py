@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from multi_factor_simulator import (DEFAULT_FACTOR_COLUMNS, FactorCalibration, calibrate_factors,
+                                    factor_risk_breakdown, run_multi_factor_simulation)
+
+COVARIANCE = np.array([[0.018 ** 2, -0.3 * 0.018 * 0.004],
+                       [-0.3 * 0.018 * 0.004, 0.004 ** 2]])
+CALIBRATION = FactorCalibration(DEFAULT_FACTOR_COLUMNS, [0.0002, 0.0001], COVARIANCE, [25.0, 83.0])
+
+
+def test_calibration_recovers_the_return_moments():
+    shocks = np.random.default_rng(0).multivariate_normal([0.0002, 0.0001], COVARIANCE, size=5000)
+    prices = pd.DataFrame(np.exp(np.cumsum(shocks, axis=0)) * [25.0, 83.0], columns=list(DEFAULT_FACTOR_COLUMNS))
+    calibration = calibrate_factors(prices)
+    np.testing.assert_allclose(calibration.covariance, np.cov(shocks[1:], rowvar=False), rtol=1e-8)
+    np.testing.assert_allclose(calibration.start_prices, prices.iloc[-1])
+    assert calibration.correlation.iloc[0, 1] == pytest.approx(-0.3, abs=0.03)
+
+
+def test_simulated_shocks_have_the_calibrated_correlation():
+    result = run_multi_factor_simulation(CALIBRATION, 100.0, forecast_period=11, num_simulations=50000, rng=1)
+    daily = np.diff(result.factor_log_returns, axis=1).reshape(2, -1)
+    assert np.corrcoef(daily)[0, 1] == pytest.approx(-0.3, abs=0.01)
+    np.testing.assert_allclose(daily.std(axis=1), CALIBRATION.volatility, rtol=0.01)
+
+
+def test_asset_is_the_exposure_weighted_product_of_the_factors():
+    result = run_multi_factor_simulation(CALIBRATION, 100.0, exposures=[1.0, 1.0], forecast_period=20,
+                                         num_simulations=500, rng=2)
+    silver, fx = (result.factor_paths(name) for name in DEFAULT_FACTOR_COLUMNS)
+    np.testing.assert_allclose(result.asset.paths, 100.0 * silver / silver[0] * fx / fx[0], rtol=1e-10)
+
+
+def test_risk_breakdown_shares_add_up():
+    result = run_multi_factor_simulation(CALIBRATION, 100.0, forecast_period=60, num_simulations=20000, rng=3)
+    breakdown = factor_risk_breakdown(result)
+    factors = breakdown.drop(index='total')
+    assert factors['variance_share'].sum() == pytest.approx(1.0)
+    assert factors['CVaR_share'].sum() == pytest.approx(1.0)
+    assert factors['component_CVaR'].sum() == pytest.approx(breakdown.loc['total', 'component_CVaR'])
+    assert factors['variance_share'].idxmax() == 'Silver_USD_Ounce'
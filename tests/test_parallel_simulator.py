@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from analyzer import analyze_simulation_results
+from parallel_simulator import run_parallel_simulation, split_into_blocks
+
+
+def _metrics(analysis):
+    return {section: analysis[section] for section in ('price_predictions', 'risk_metrics', 'statistical_summary')}
+
+
+def test_blocks_depend_only_on_the_path_count():
+    assert split_into_blocks(25, 10) == [10, 10, 5]
+    assert split_into_blocks(20, 10) == [10, 10]
+
+
+def test_paths_are_identical_for_any_worker_count():
+    runs = [run_parallel_simulation(80.0, 0.0003, 0.015, 30, 5000, seed=9, num_workers=workers, block_size=700,
+                                    output='paths') for workers in (1, 3)]
+    np.testing.assert_array_equal(runs[0].final_prices, runs[1].final_prices)
+    np.testing.assert_array_equal(runs[0].paths, runs[1].paths)
+    assert _metrics(analyze_simulation_results(runs[0], 80.0)) == _metrics(analyze_simulation_results(runs[1], 80.0))
+
+
+def test_summaries_are_identical_for_any_worker_count():
+    runs = [run_parallel_simulation(80.0, 0.0003, 0.015, 30, 5000, seed=9, num_workers=workers, block_size=700,
+                                    terminal_bins=4096, daily_bins=256) for workers in (1, 3)]
+    np.testing.assert_array_equal(runs[0].terminal.bin_counts, runs[1].terminal.bin_counts)
+    np.testing.assert_array_equal(runs[0].daily.bin_counts, runs[1].daily.bin_counts)
+    assert _metrics(analyze_simulation_results(runs[0], 80.0)) == _metrics(analyze_simulation_results(runs[1], 80.0))
+
+
+def test_other_seeds_give_other_paths():
+    first, second = (run_parallel_simulation(80.0, 0.0003, 0.015, 10, 100, seed=seed, num_workers=1,
+                                             output='paths') for seed in (1, 2))
+    assert not np.array_equal(first.final_prices, second.final_prices)
+
+
+def test_unknown_output_is_rejected():
+    with pytest.raises(ValueError):
+        run_parallel_simulation(80.0, 0.0003, 0.015, 10, 100, seed=1, num_workers=1, output='csv')
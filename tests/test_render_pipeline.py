@@ -0,0 +1,36 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+
+import render_pipeline
+from render_pipeline import render_charts
+
+
+def _jobs(scale=1.0):
+    dates = pd.bdate_range("2020-01-01", periods=300)
+    data = pd.DataFrame({'Silver_INR_Gram': scale * np.linspace(50, 80, 300),
+                         'Log_Returns': np.random.default_rng(0).normal(0, 0.01, 300)}, index=dates)
+    return [('plot_historical_prices', (data,))]
+
+
+def test_in_process_render_keeps_the_callers_backend(tmp_path):
+    previous = matplotlib.get_backend()
+    matplotlib.use('svg')
+    try:
+        timings = render_charts(_jobs(), save_path=str(tmp_path), max_workers=1)
+        assert matplotlib.get_backend() == 'svg'
+    finally:
+        matplotlib.use(previous)
+    assert timings['plot_historical_prices'] is not None
+    assert (tmp_path / 'historical_prices.png').exists()
+
+
+def test_unchanged_charts_are_skipped_until_inputs_or_code_change(tmp_path, monkeypatch):
+    save_path = str(tmp_path)
+    assert render_charts(_jobs(), save_path=save_path, max_workers=1)['plot_historical_prices'] is not None
+    assert render_charts(_jobs(), save_path=save_path, max_workers=1)['plot_historical_prices'] is None
+    assert render_charts(_jobs(2.0), save_path=save_path, max_workers=1)['plot_historical_prices'] is not None
+
+    # A changed visualizer invalidates every chart rendered with the old code
+    monkeypatch.setattr(render_pipeline, 'code_version', lambda *modules: 'changed')
+    assert render_charts(_jobs(2.0), save_path=save_path, max_workers=1)['plot_historical_prices'] is not None
@@ -0,0 +1,31 @@
+from analyzer import analyze_simulation_results, compute_path_metrics, summarize_path_metrics
+from monte_carlo_simulator import run_monte_carlo_simulation
+from reporting import generate_executive_summary
+
+STATS = {'annualized_volatility': 0.24, 'mean_daily_return': 0.0004, 'max_drawdown': -0.35,
+         'sharpe_ratio': 0.42, 'latest_price': 80.0}
+
+
+def _analysis(**options):
+    simulations = run_monte_carlo_simulation(80.0, 0.0003, 0.015, 30, 2000, rng=0, as_dataframe=False)
+    return simulations, analyze_simulation_results(simulations, 80.0, **options)
+
+
+def test_summary_includes_default_path_metrics():
+    _, analysis = _analysis(path_metrics=True)
+    summary = generate_executive_summary(STATS, analysis, num_simulations=2000, forecast_period=30)
+    assert 'Based on 2000 simulations over 30 trading days' in summary
+    assert '**Intra-Year Fall:**' in summary and '**Maximum Drawdown:** The median' in summary
+
+
+def test_custom_barriers_skip_the_missing_line():
+    simulations, analysis = _analysis()
+    analysis['path_metrics'] = summarize_path_metrics(compute_path_metrics(simulations, 80.0, barriers=(0.8, 1.25)))
+    summary = generate_executive_summary(STATS, analysis)
+    assert '**Intra-Year Fall:**' not in summary
+    assert '**Maximum Drawdown:** The median' in summary
+
+
+def test_summary_without_path_metrics():
+    _, analysis = _analysis()
+    assert 'Intra-Year Fall' not in generate_executive_summary(STATS, analysis)
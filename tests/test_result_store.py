@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monte_carlo_simulator import simulate_gbm_paths
+from result_store import SimulationStore, save_simulation_result
+
+
+def test_round_trip_is_exact_and_memory_mapped(tmp_path):
+    result = simulate_gbm_paths(80.0, 0.0003, 0.015, 20, 1000, rng=4, dtype=np.float32)
+    directory = save_simulation_result(result, str(tmp_path / 'store'), metadata={'seed': 4}, block_size=300)
+
+    store = SimulationStore(directory)
+    assert isinstance(store.paths, np.memmap)
+    assert store.shape == result.shape
+    assert store.metadata['dtype'] == 'float32' and store.metadata['seed'] == 4
+    np.testing.assert_array_equal(store.paths, result.paths)
+    np.testing.assert_array_equal(store.day(7), result.paths[7])
+    np.testing.assert_array_equal(store.path_range(10, 20), result.paths[:, 10:20])
+    np.testing.assert_array_equal(store.final_prices, result.final_prices)
+    assert store.to_result().start_price == result.start_price
+
+
+def test_checkpoint_days_are_row_labels(tmp_path):
+    result = simulate_gbm_paths(80.0, 0.0003, 0.015, 60, 200, rng=1, checkpoints=[20, 40])
+    store = SimulationStore(save_simulation_result(result, str(tmp_path / 'store')))
+    np.testing.assert_array_equal(store.days, [0, 20, 40, 59])
+    np.testing.assert_array_equal(store.day(40), result.paths[2])
+    with pytest.raises(KeyError):
+        store.day(30)
+
+
+def test_csv_export_matches_the_stored_paths(tmp_path):
+    result = simulate_gbm_paths(80.0, 0.0003, 0.015, 20, 50, rng=2)
+    store = SimulationStore(save_simulation_result(result, str(tmp_path / 'store')))
+    csv_path = str(tmp_path / 'paths.csv')
+    store.export_csv(csv_path, rows_per_chunk=6)
+    np.testing.assert_allclose(pd.read_csv(csv_path, index_col=0).to_numpy(), result.paths, rtol=1e-15)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from analyzer import analyze_simulation_results
+from monte_carlo_simulator import SimulationResult
+from scenario_grid import build_scenario_grid, run_scenario_grid
+
+
+def test_grid_is_the_cartesian_product():
+    grid = build_scenario_grid([70.0, 80.0], [0.0, 0.0003], 0.015, [21, 63])
+    assert len(grid) == 8
+    assert set(grid['forecast_period']) == {21, 63}
+
+
+def test_each_scenario_matches_the_analyzer_on_the_same_draws():
+    grid = build_scenario_grid(80.0, [-0.0005, 0.0003], [0.01, 0.02], 30)
+    surface = run_scenario_grid(grid, num_simulations=5000, rng=3, max_chunk_elements=5000)
+
+    shocks = np.sort(np.random.default_rng(3).standard_normal(5000))
+    for _, row in surface.iterrows():
+        steps = row['forecast_period'] - 1
+        final_prices = row['start_price'] * np.exp(row['drift'] * steps + row['volatility'] * np.sqrt(steps) * shocks)
+        paths = np.vstack([np.full(5000, row['start_price']), final_prices])
+        analysis = analyze_simulation_results(SimulationResult(paths, row['start_price']), row['start_price'])
+        expected = {**analysis['price_predictions'], **analysis['risk_metrics'], **analysis['statistical_summary']}
+        for name, value in expected.items():
+            if name in surface.columns:
+                assert row[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_common_random_numbers_keep_the_surface_monotone():
+    grid = build_scenario_grid(80.0, 0.0002, np.linspace(0.005, 0.03, 12), 60)
+    surface = run_scenario_grid(grid, num_simulations=2000, rng=0)
+    # With shared draws, more volatility always widens the 5%-95% band and deepens VaR
+    width = surface['95th_percentile'] - surface['5th_percentile']
+    assert (np.diff(width) > 0).all()
+    assert (np.diff(surface['VaR_99']) < 0).all()
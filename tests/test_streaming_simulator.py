@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from analyzer import analyze_simulation_results
+from monte_carlo_simulator import SimulationResult, simulate_gbm_paths
+from streaming_simulator import TerminalAccumulator, gbm_log_bounds, run_streaming_simulation
+
+START_PRICE, DRIFT, VOLATILITY, DAYS = 80.0, 0.0003, 0.015, 64
+
+
+def _in_memory(num_simulations, batch_size, seed):
+    """The same batches run_streaming_simulation draws, kept in one path matrix."""
+    rng = np.random.default_rng(seed)
+    batches = []
+    for first in range(0, num_simulations, batch_size):
+        batches.append(simulate_gbm_paths(START_PRICE, DRIFT, VOLATILITY, DAYS,
+                                          min(batch_size, num_simulations - first), rng=rng).paths)
+    return SimulationResult(np.concatenate(batches, axis=1), START_PRICE)
+
+
+def test_streaming_analysis_matches_in_memory_analysis():
+    summary = run_streaming_simulation(START_PRICE, DRIFT, VOLATILITY, DAYS, 50000, batch_size=12000, rng=11)
+    streamed = analyze_simulation_results(summary, START_PRICE)
+    expected = analyze_simulation_results(_in_memory(50000, 12000, 11), START_PRICE)
+
+    # Quantiles and tail means are exact to within one histogram bin (a relative price error)
+    terminal = summary.terminal
+    bin_error = terminal.bin_width
+    for name, value in streamed['price_predictions'].items():
+        assert value == pytest.approx(expected['price_predictions'][name], rel=bin_error + 1e-12), name
+    for name in ('VaR_95', 'VaR_99', 'CVaR_95', 'CVaR_99'):
+        assert streamed['risk_metrics'][name] + 1 == pytest.approx(expected['risk_metrics'][name] + 1,
+                                                                  rel=bin_error + 1e-12), name
+    # Counters and moments are exact up to rounding
+    for name in ('prob_loss', 'prob_increase_10', 'prob_increase_20', 'prob_increase_30'):
+        assert streamed['risk_metrics'][name] == expected['risk_metrics'][name]
+    for name, value in streamed['statistical_summary'].items():
+        assert value == pytest.approx(expected['statistical_summary'][name], rel=1e-9), name
+    assert terminal.clipped == 0
+
+
+def test_daily_bands_match_in_memory_percentiles():
+    summary = run_streaming_simulation(START_PRICE, DRIFT, VOLATILITY, DAYS, 20000, batch_size=20000, rng=5)
+    paths = _in_memory(20000, 20000, 5).paths
+    daily = summary.daily
+    bin_error = daily.bin_widths.max()
+    for p in (5, 50, 95):
+        np.testing.assert_allclose(daily.percentile(p)[1:], np.percentile(paths, p, axis=1)[1:],
+                                   rtol=bin_error + 1e-12)
+    np.testing.assert_allclose(daily.mean(), paths.mean(axis=1), rtol=1e-12)
+
+
+def test_prices_outside_the_grid_are_capped():
+    low, high = gbm_log_bounds(DRIFT, VOLATILITY, DAYS, num_sigmas=0.5)
+    accumulator = TerminalAccumulator(START_PRICE, low[-1], high[-1], num_bins=256, max_outside=100)
+    prices = simulate_gbm_paths(START_PRICE, DRIFT, VOLATILITY, DAYS, 10000, rng=2).final_prices
+    for batch in np.array_split(prices, 7):
+        accumulator.update(batch)
+
+    assert accumulator.below.size <= 100 and accumulator.above.size <= 100
+    assert accumulator.clipped > 0
+    kept = accumulator.below.size + accumulator.above.size + accumulator.bin_counts.sum()
+    assert kept == accumulator.count == prices.size
+    assert accumulator.mean() == pytest.approx(prices.mean(), rel=1e-12)
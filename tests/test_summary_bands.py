@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monte_carlo_simulator import simulate_gbm_paths
+from streaming_simulator import run_streaming_simulation
+from summary_bands import as_summary_bands, compute_summary_bands
+
+
+def test_chunked_bands_match_numpy_percentiles():
+    result = simulate_gbm_paths(80.0, 0.0003, 0.015, 40, 3000, rng=6)
+    # A tiny chunk bound forces one day per chunk
+    bands = compute_summary_bands(result, num_sample_paths=10, max_chunk_elements=100)
+    for p in bands.percentiles:
+        np.testing.assert_allclose(bands.band(p).to_numpy(), np.percentile(result.paths, p, axis=1), rtol=1e-12)
+    np.testing.assert_allclose(bands.mean, result.paths.mean(axis=1), rtol=1e-12)
+    np.testing.assert_array_equal(bands.sample_paths, result.paths[:, :10])
+    with pytest.raises(KeyError):
+        bands.band(42)
+
+
+def test_dataframe_index_becomes_the_band_index():
+    frame = pd.DataFrame(simulate_gbm_paths(80.0, 0.0003, 0.015, 10, 100, rng=1).paths,
+                         index=np.arange(100, 110))
+    assert list(compute_summary_bands(frame).median.index) == list(range(100, 110))
+
+
+def test_inputs_are_dispatched_to_the_matching_builder():
+    bands = compute_summary_bands(simulate_gbm_paths(80.0, 0.0003, 0.015, 10, 100, rng=1))
+    assert as_summary_bands(bands) is bands
+
+    streamed = as_summary_bands(run_streaming_simulation(80.0, 0.0003, 0.015, 10, 1000, rng=1))
+    assert streamed.bands.shape == (len(streamed.percentiles), 10)
+    assert (np.diff(streamed.bands, axis=0) >= 0).all()
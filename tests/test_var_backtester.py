@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark_suite import synthetic_market_data
+from data_processor import process_data
+from var_backtester import coverage_tests, kupiec_test, rolling_moments, run_var_backtest
+
+
+@pytest.fixture(scope='module')
+def processed_data():
+    return process_data(*synthetic_market_data(3, seed=2))[0]
+
+
+def test_rolling_moments_match_pandas():
+    values = np.random.default_rng(0).normal(0.001, 0.02, 400)
+    mean, std = rolling_moments(values, 50)
+    rolling = pd.Series(values).rolling(50)
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy()[49:], rtol=1e-10)
+    np.testing.assert_allclose(std, rolling.std().to_numpy()[49:], rtol=1e-8)
+
+
+def test_kupiec_accepts_the_expected_rate_and_rejects_a_wrong_one():
+    breaches = np.zeros(1000, dtype=bool)
+    breaches[::100] = True
+    assert kupiec_test(breaches, 0.99)['p_value'] > 0.9
+    assert kupiec_test(breaches, 0.999)['p_value'] < 1e-3
+
+
+def test_clustered_breaches_fail_the_independence_test():
+    clustered = np.zeros(1000, dtype=bool)
+    clustered[500:510] = True
+    spread = np.zeros(1000, dtype=bool)
+    spread[::100] = True
+    assert coverage_tests(clustered, 0.99)['christoffersen_p_value'] < 1e-3
+    assert coverage_tests(spread, 0.99)['christoffersen_p_value'] > 0.05
+
+
+@pytest.mark.parametrize('model', [None, 'student_t'])
+def test_seeded_backtest_does_not_depend_on_workers_or_task_size(processed_data, model):
+    options = dict(window=250, step=5, num_simulations=2000, model=model, seed=3)
+    serial = run_var_backtest(processed_data, num_workers=1, windows_per_task=64, **options)
+    parallel = run_var_backtest(processed_data, num_workers=2, windows_per_task=7, **options)
+    pd.testing.assert_frame_equal(serial.frame, parallel.frame)
+    assert serial.coverage == parallel.coverage
+
+
+def test_breaches_compare_realized_returns_with_the_forecast(processed_data):
+    backtest = run_var_backtest(processed_data, window=250, horizon=5, step=5, num_simulations=2000, seed=1,
+                                num_workers=1)
+    frame = backtest.frame
+    prices = processed_data['Silver_INR_Gram']
+    first = processed_data.index.get_loc(frame.index[0])
+    assert frame['realized_return'].iloc[0] == pytest.approx(prices.iloc[first + 5] / prices.iloc[first] - 1)
+    assert (frame['breach_99'] == (frame['realized_return'] < frame['VaR_99'])).all()
+    assert (frame['VaR_99'] < frame['VaR_95']).all()
+    assert backtest.coverage['VaR_95']['observations'] == len(frame) == backtest.settings['rebalance_dates']
+
+
+def test_too_short_history_is_rejected(processed_data):
+    with pytest.raises(ValueError):
+        run_var_backtest(processed_data.iloc[:100], window=250)